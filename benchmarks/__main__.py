@@ -0,0 +1,290 @@
+import asyncio
+import json
+import platform
+import statistics
+import sys
+from argparse import ArgumentParser, Namespace
+from itertools import count
+from pathlib import Path
+from time import perf_counter, strftime
+from types import ModuleType
+from typing import Awaitable, Callable, Optional
+
+# outmsg locates the outdefs file relative to the working directory when it's
+# imported, so it must be imported before moving into the synthetic store.
+from botofspades import outmsg
+from botofspades.pagination import pack_lines
+
+from benchmarks.fakes import FakeInteraction
+from benchmarks.synthetic import (
+    get_field_name,
+    get_sheet_name,
+    get_template_name,
+    load_charsheets,
+)
+
+
+Body = Callable[[], Awaitable[None]]
+
+# Fast cases are run this many times per sample, to be measurable at all.
+MICRO_LOOPS: int = 1000
+
+# Every command runs in a channel of its own, so the timings never include
+# waits for the dispatcher's per-channel rate limit.
+channel_ids = count(1)
+
+
+def parse_args() -> Namespace:
+    parser: ArgumentParser = ArgumentParser(
+        prog="benchmarks",
+        description="Times charsheets and outmsg hot paths offline.",
+    )
+    parser.add_argument("--templates", type=int, default=3)
+    parser.add_argument(
+        "--sheets", type=int, default=200, help="Sheets per template."
+    )
+    parser.add_argument("--fields", type=int, default=20)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Samples per case."
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        help="Reuses (or generates once) the synthetic store at this path.",
+    )
+    parser.add_argument("--output", type=Path, help="Writes results as JSON.")
+    parser.add_argument(
+        "--compare", type=Path, help="Compares against a previous --output."
+    )
+    parser.add_argument("--only", help="Only runs cases containing this.")
+
+    return parser.parse_args()
+
+
+class Bench:
+    def __init__(self, repeat: int, only: Optional[str]) -> None:
+        self.repeat: int = repeat
+        self.only: Optional[str] = only
+        self.samples: dict[str, list[float]] = {}
+
+    async def measure(
+        self,
+        case: str,
+        body: Body,
+        before: Optional[Body] = None,
+        after: Optional[Body] = None,
+        loops: int = 1,
+    ) -> None:
+        if self.only and self.only not in case:
+            return
+
+        print(f"{case}...", file=sys.stderr)
+        samples: list[float] = self.samples.setdefault(case, [])
+
+        for _ in range(self.repeat):
+            if before:
+                await before()
+
+            started: float = perf_counter()
+            for _ in range(loops):
+                await body()
+            samples.append((perf_counter() - started) / loops)
+
+            if after:
+                await after()
+
+
+def command(charsheets_group: object, name: str, *args: str) -> Body:
+    callback = getattr(type(charsheets_group), name).callback
+
+    async def body() -> None:
+        await callback(
+            charsheets_group,
+            FakeInteraction(channel_id=next(channel_ids)),
+            *args,
+        )
+
+    return body
+
+
+async def run_cases(bench: Bench, cs: ModuleType) -> None:
+    template_group = cs.Template()
+    sheet_group = cs.Sheet()
+
+    def template(name: str, *args: str) -> Body:
+        return command(template_group, name, *args)
+
+    def sheet(name: str, *args: str) -> Body:
+        return command(sheet_group, name, *args)
+
+    async def clear_render_cache() -> None:
+        cs.render_cache.clear()
+
+    t0: str = get_template_name(0)
+    s0: str = get_sheet_name(0, 0)
+    f0: str = get_field_name(0)
+
+    await bench.measure(
+        "template add",
+        template("add", "benchtemplate"),
+        after=template("remove", "benchtemplate"),
+    )
+    await bench.measure("template list", template("list"))
+    await bench.measure(
+        "template rename",
+        template("rename", t0, "benchrenamed"),
+        after=template("rename", "benchrenamed", t0),
+    )
+    await bench.measure(
+        "template remove",
+        template("remove", "benchremoved"),
+        before=template("add", "benchremoved"),
+    )
+    await bench.measure(
+        "template field_add",
+        template("field_add", t0, "benchfield", "abacus", "1"),
+        after=template("field_remove", t0, "benchfield"),
+    )
+    await bench.measure(
+        "template field_remove",
+        template("field_remove", t0, "benchfield"),
+        before=template("field_add", t0, "benchfield", "abacus", "1"),
+    )
+    await bench.measure(
+        "template field_rename",
+        template("field_rename", t0, f0, "benchfield"),
+        after=template("field_rename", t0, "benchfield", f0),
+    )
+    await bench.measure("template field_list", template("field_list", t0))
+    await bench.measure(
+        "template field_edit",
+        template("field_edit", t0, f0, "abacus", "11"),
+        after=template("field_edit", t0, f0, "abacus", "10"),
+    )
+
+    await bench.measure(
+        "sheet add",
+        sheet("add", "benchsheet", t0),
+        after=sheet("remove", "benchsheet"),
+    )
+    await bench.measure(
+        "sheet remove",
+        sheet("remove", "benchsheet"),
+        before=sheet("add", "benchsheet", t0),
+    )
+    await bench.measure(
+        "sheet rename",
+        sheet("rename", s0, "benchsheet"),
+        after=sheet("rename", "benchsheet", s0),
+    )
+    await bench.measure("sheet list", sheet("list"))
+    await bench.measure("sheet list (by template)", sheet("list", t0))
+    await bench.measure(
+        "sheet totext (cold)", sheet("totext", s0), before=clear_render_cache
+    )
+    await bench.measure("sheet totext (warm)", sheet("totext", s0))
+    await bench.measure(
+        "sheet get (cold)", sheet("get", s0), before=clear_render_cache
+    )
+    await bench.measure("sheet get (warm)", sheet("get", s0))
+    await bench.measure("sheet field", sheet("field", s0, f0))
+    await bench.measure("sheet field (set)", sheet("field", s0, f0, "12"))
+    await bench.measure("sheet do", sheet("do", s0, f0, "add", "1"))
+
+
+async def run_outmsg_cases(bench: Bench) -> None:
+    async def render() -> None:
+        outmsg.out(
+            "SHEET_FIELD_UPDATED", field="Bob :: Hp", old="5/10", new="3/10"
+        )
+
+    async def update_defbank() -> None:
+        outmsg.update_defbank()
+
+    lines: list[str] = [
+        f"- **Sheet {n}** (from **Template**)\n" for n in range(10_000)
+    ]
+
+    async def pack() -> None:
+        for _ in pack_lines(lines):
+            pass
+
+    await bench.measure("out", render, loops=MICRO_LOOPS)
+    await bench.measure("update_defbank", update_defbank)
+    await bench.measure("pack_lines (10k lines)", pack)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    ordered: list[float] = sorted(samples)
+
+    return {
+        "min_ms": ordered[0] * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p95_ms": ordered[round(0.95 * (len(ordered) - 1))] * 1000,
+        "samples": len(ordered),
+    }
+
+
+def print_results(
+    results: dict[str, dict[str, float]],
+    baseline: Optional[dict[str, dict[str, float]]],
+) -> None:
+    for case, summary in results.items():
+        line: str = (
+            f"{case:<28} median {summary['median_ms']:>10.3f} ms"
+            f"  min {summary['min_ms']:>10.3f} ms"
+        )
+
+        if baseline and case in baseline:
+            before: float = baseline[case]["median_ms"]
+            line += f"  ({(summary['median_ms'] / before - 1) * 100:+.1f}%)"
+
+        print(line)
+
+
+async def main() -> None:
+    args: Namespace = parse_args()
+
+    outmsg.update_defbank()
+    cs: ModuleType = load_charsheets(
+        args.store, args.templates, args.sheets, args.fields
+    )
+
+    bench: Bench = Bench(args.repeat, args.only)
+    await run_cases(bench, cs)
+    await run_outmsg_cases(bench)
+
+    results: dict[str, dict[str, float]] = {
+        case: summarize(samples) for case, samples in bench.samples.items()
+    }
+
+    baseline: Optional[dict] = (
+        json.loads(args.compare.read_text())["results"]
+        if args.compare
+        else None
+    )
+
+    print_results(results, baseline)
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "meta": {
+                        "time": strftime("%Y-%m-%dT%H:%M:%S%z"),
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "templates": args.templates,
+                        "sheets": args.sheets,
+                        "fields": args.fields,
+                        "repeat": args.repeat,
+                    },
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+
+asyncio.run(main())
@@ -0,0 +1,297 @@
+import asyncio
+import gc
+import json
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+from discord import Client, ClientUser, Intents
+
+from botofspades import constants
+from botofspades.bot import (
+    get_bot_intents,
+    get_cache_options,
+    get_extension_intents,
+    get_extension_name,
+)
+
+
+BOT_ID: int = 1
+# Snowflakes are handed out from here, so they look like real ones.
+FIRST_ID: int = 10**17
+
+
+def parse_args() -> Namespace:
+    parser: ArgumentParser = ArgumentParser(
+        prog="benchmarks.client",
+        description=(
+            "Compares the memory the Discord client's caches use by default"
+            " and in lean mode."
+        ),
+    )
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--roles", type=int, default=20)
+    parser.add_argument("--emojis", type=int, default=20)
+    parser.add_argument(
+        "--voice-members",
+        type=int,
+        default=5,
+        help="Members in voice channels per guild.",
+    )
+    parser.add_argument(
+        "--messages",
+        type=int,
+        default=20,
+        help="Messages received per guild.",
+    )
+    parser.add_argument("--output", type=Path, help="Writes results as JSON.")
+    return parser.parse_args()
+
+
+class Snowflakes:
+    def __init__(self) -> None:
+        self.next: int = FIRST_ID
+
+    def __call__(self) -> str:
+        self.next += 1
+        return str(self.next)
+
+
+def get_user(user_id: str) -> dict[str, Any]:
+    return {
+        "id": user_id,
+        "username": f"user{user_id[-6:]}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+    }
+
+
+def get_member(user_id: str) -> dict[str, Any]:
+    return {
+        "user": get_user(user_id),
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def get_guild(
+    args: Namespace, intents: Intents, snowflake: Snowflakes
+) -> dict[str, Any]:
+    """A GUILD_CREATE payload as Discord sends it for the given intents.
+
+    Without the members intent, only the bot's own member and the members in
+    voice channels (with the voice states intent) are sent.
+    """
+    guild_id: str = snowflake()
+    channels: list[dict[str, Any]] = [
+        {
+            "id": snowflake(),
+            "type": 0,
+            "name": f"channel{n}",
+            "position": n,
+            "permission_overwrites": [],
+            "nsfw": False,
+            "parent_id": None,
+            "topic": None,
+            "rate_limit_per_user": 0,
+            "last_message_id": None,
+        }
+        for n in range(args.channels)
+    ]
+    voice_channel: str = snowflake()
+    channels.append(
+        {
+            "id": voice_channel,
+            "type": 2,
+            "name": "voice",
+            "position": args.channels,
+            "permission_overwrites": [],
+            "bitrate": 64000,
+            "user_limit": 0,
+            "parent_id": None,
+        }
+    )
+
+    voice_members: list[str] = (
+        [snowflake() for _ in range(args.voice_members)]
+        if intents.voice_states
+        else []
+    )
+
+    return {
+        "id": guild_id,
+        "name": f"guild{guild_id}",
+        "owner_id": str(BOT_ID),
+        "member_count": 1000,
+        "features": [],
+        "roles": [
+            {
+                "id": guild_id if n == 0 else snowflake(),
+                "name": f"role{n}",
+                "permissions": "0",
+                "position": n,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+            for n in range(args.roles)
+        ],
+        "emojis": [
+            {
+                "id": snowflake(),
+                "name": f"emoji{n}",
+                "animated": False,
+                "managed": False,
+                "require_colons": True,
+                "available": True,
+            }
+            for n in range(args.emojis)
+        ],
+        "stickers": [],
+        "channels": channels,
+        "threads": [],
+        "members": [
+            get_member(str(BOT_ID)),
+            *map(get_member, voice_members),
+        ],
+        "voice_states": [
+            {
+                "user_id": user_id,
+                "channel_id": voice_channel,
+                "session_id": user_id,
+                "deaf": False,
+                "mute": False,
+                "self_deaf": False,
+                "self_mute": False,
+                "self_video": False,
+                "suppress": False,
+            }
+            for user_id in voice_members
+        ],
+        "presences": [],
+    }
+
+
+def get_message(
+    guild: dict[str, Any], number: int, snowflake: Snowflakes
+) -> dict[str, Any]:
+    author: str = snowflake()
+
+    return {
+        "id": snowflake(),
+        "channel_id": guild["channels"][number % len(guild["channels"])][
+            "id"
+        ],
+        "guild_id": guild["id"],
+        "author": get_user(author),
+        "member": {
+            key: value
+            for key, value in get_member(author).items()
+            if key != "user"
+        },
+        "content": f"spades.ito roll {'x' * 40}",
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+async def measure(args: Namespace, lean: bool) -> dict[str, Any]:
+    constants.LEAN_MODE = lean
+    intents: Intents = get_bot_intents()
+
+    if lean:
+        intents = get_extension_intents(
+            import_module(get_extension_name(ext))
+            for ext in constants.DEFAULT_EXTENSIONS
+        )
+
+    snowflake: Snowflakes = Snowflakes()
+    gc.collect()
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+
+    client: Client = Client(intents=intents, **get_cache_options())
+    state = client._connection
+    state.user = ClientUser(state=state, data=get_user(str(BOT_ID)))
+    messages: int = 0
+
+    for _ in range(args.guilds):
+        guild: dict[str, Any] = get_guild(args, intents, snowflake)
+        state._add_guild_from_data(guild)
+
+        # Only received with the guild messages intent.
+        if intents.guild_messages:
+            for number in range(args.messages):
+                state.parse_message_create(
+                    get_message(guild, number, snowflake)
+                )
+                messages += 1
+
+    # Lets the (listener-less) events dispatched above run.
+    await asyncio.sleep(0)
+    gc.collect()
+    size: int = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    result: dict[str, Any] = {
+        "intents": [name for name, on in intents if on],
+        "bytes": size,
+        "guilds": len(client.guilds),
+        "members": sum(len(guild.members) for guild in client.guilds),
+        "cached_messages": len(client.cached_messages),
+        "messages": messages,
+    }
+
+    await client.close()
+    return result
+
+
+async def main() -> None:
+    args: Namespace = parse_args()
+    results: dict[str, dict[str, Any]] = {
+        "default": await measure(args, False),
+        "lean": await measure(args, True),
+    }
+
+    for name, result in results.items():
+        print(
+            f"{name:<8} {result['bytes'] / 1e6:>8.1f} MB  "
+            f"{result['members']:>6} members  "
+            f"{result['cached_messages']:>5} cached messages  "
+            f"intents: {', '.join(result['intents'])}"
+        )
+
+    saved: int = results["default"]["bytes"] - results["lean"]["bytes"]
+    print(
+        f"Lean mode saves {saved / 1e6:.1f} MB "
+        f"({saved / results['default']['bytes']:.0%})"
+    )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {"meta": vars(args) | {"output": str(args.output)}}
+                | results,
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
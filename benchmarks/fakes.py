@@ -0,0 +1,98 @@
+import asyncio
+from itertools import count
+from typing import Any, Optional
+
+from discord import InteractionType
+
+
+# Stand-ins for the discord.py objects commands receive, recording what's sent
+# instead of reaching Discord. Sending can take a simulated round trip.
+
+ids = count(1)
+
+
+class FakeUser:
+    def __init__(self, user_id: int) -> None:
+        self.id: int = user_id
+        self.mention: str = f"<@{user_id}>"
+
+
+class FakeResponse:
+    def __init__(self, messages: list[Any], latency: float) -> None:
+        self._done: bool = False
+        self._messages: list[Any] = messages
+        self._latency: float = latency
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, content: Optional[str] = None, **_) -> None:
+        self._done = True
+        await asyncio.sleep(self._latency)
+        self._messages.append(content)
+
+    async def edit_message(self, content: Optional[str] = None, **_) -> None:
+        await asyncio.sleep(self._latency)
+        self._messages.append(content)
+
+    async def defer(self, **_) -> None:
+        self._done = True
+        await asyncio.sleep(self._latency)
+
+
+class FakeFollowup:
+    def __init__(self, messages: list[Any], latency: float) -> None:
+        self._messages: list[Any] = messages
+        self._latency: float = latency
+
+    async def send(self, content: Optional[str] = None, **_) -> None:
+        await asyncio.sleep(self._latency)
+        self._messages.append(content)
+
+
+class FakeInteraction:
+    def __init__(
+        self,
+        channel_id: int = 1,
+        guild_id: int = 1,
+        user_id: int = 1,
+        latency: float = 0.0,
+    ) -> None:
+        self.id: int = next(ids)
+        self.type: InteractionType = InteractionType.application_command
+        self.command: Any = None
+        self.channel_id: int = channel_id
+        self.guild_id: int = guild_id
+        self.user: FakeUser = FakeUser(user_id)
+        self.messages: list[Any] = []
+        self.response: FakeResponse = FakeResponse(self.messages, latency)
+        self.followup: FakeFollowup = FakeFollowup(self.messages, latency)
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int) -> None:
+        self.id: int = channel_id
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int) -> None:
+        self.id: int = guild_id
+
+
+class FakeContext:
+    def __init__(
+        self,
+        channel_id: int = 1,
+        guild_id: int = 1,
+        user_id: int = 1,
+        latency: float = 0.0,
+    ) -> None:
+        self.channel: FakeChannel = FakeChannel(channel_id)
+        self.guild: FakeGuild = FakeGuild(guild_id)
+        self.author: FakeUser = FakeUser(user_id)
+        self.messages: list[Any] = []
+        self._latency: float = latency
+
+    async def send(self, content: Optional[str] = None, **_) -> None:
+        await asyncio.sleep(self._latency)
+        self.messages.append(content)
@@ -0,0 +1,388 @@
+import asyncio
+import json
+import random
+import sys
+import traceback
+from argparse import ArgumentParser, Namespace
+from collections import Counter
+from dataclasses import dataclass
+from math import ceil
+from pathlib import Path
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Awaitable, Callable
+
+from discord import app_commands as apc
+
+# Must be imported before moving into the synthetic store (see
+# load_charsheets).
+from botofspades import outmsg
+from botofspades import deferral, dispatch, metrics
+from botofspades.extensions.intotheodd import IntoTheOdd
+
+from benchmarks.fakes import FakeInteraction
+from benchmarks.synthetic import (
+    get_field_name,
+    get_sheet_name,
+    get_template_name,
+    load_charsheets,
+)
+
+
+GUILD_ID: int = 1
+
+DEFAULT_MIX: str = (
+    "sheet.do=30,sheet.get=25,sheet.field=15,sheet.totext=5,sheet.list=2,"
+    "template.list=5,template.field_list=8,intotheodd.roll=7,"
+    "intotheodd.rollattributes=3"
+)
+
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+# Field incremented by sheet.do, an abacus in every synthetic template.
+COUNTER_FIELD: str = get_field_name(0)
+
+
+@dataclass
+class Player:
+    user_id: int
+    channel_id: int
+    sheet: str
+
+
+@dataclass
+class Result:
+    command: str
+    latency: float
+    failed: bool
+
+
+# Runs a command for a player, returning whether it failed.
+Runner = Callable[[Player], Awaitable[bool]]
+
+
+def parse_args() -> Namespace:
+    parser: ArgumentParser = ArgumentParser(
+        prog="benchmarks.load",
+        description="Replays commands from many simulated players at once.",
+    )
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument(
+        "--channels",
+        type=int,
+        default=20,
+        help="Channels the players are spread across.",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=50.0, help="Commands per second."
+    )
+    parser.add_argument(
+        "--commands", type=int, default=2000, help="Commands to replay."
+    )
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help="Relative weights of each command, as name=weight pairs.",
+    )
+    parser.add_argument(
+        "--api-latency",
+        type=float,
+        default=0.1,
+        help="Simulated seconds each message takes to reach Discord.",
+    )
+    parser.add_argument(
+        "--hot-sheets",
+        type=int,
+        default=10,
+        help="Sheets shared by every player, which sheet.do updates.",
+    )
+    parser.add_argument("--templates", type=int, default=3)
+    parser.add_argument(
+        "--sheets", type=int, default=100, help="Sheets per template."
+    )
+    parser.add_argument("--fields", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--store",
+        type=Path,
+        help="Reuses (or generates once) the synthetic store at this path.",
+    )
+    parser.add_argument("--output", type=Path, help="Writes results as JSON.")
+
+    return parser.parse_args()
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights: dict[str, float] = {}
+
+    for pair in mix.split(","):
+        name, weight = pair.split("=")
+        weights[name.strip()] = float(weight)
+
+    return weights
+
+
+async def run_app_command(
+    command: apc.Command, player: Player, latency: float, *args: str
+) -> bool:
+    # Mirrors what the bot's command tree does around every app command.
+    itr: FakeInteraction = FakeInteraction(
+        player.channel_id, GUILD_ID, player.user_id, latency
+    )
+    itr.command = command
+
+    deferral.start(itr)
+    metrics.start_command(
+        ("app", itr.id), command.qualified_name, "app", GUILD_ID
+    )
+
+    failed: bool = False
+
+    try:
+        await command.callback(command.binding, itr, *args)
+    except Exception:
+        traceback.print_exc()
+        failed = True
+
+    deferral.finish(itr, failed)
+    metrics.finish_command(("app", itr.id), failed)
+
+    return failed
+
+
+def get_runners(
+    cs: ModuleType,
+    args: Namespace,
+    rng: random.Random,
+    increments: Counter,
+) -> dict[str, Runner]:
+    charsheets = cs.Charsheets()
+    charsheets.add_command(cs.Template())
+    charsheets.add_command(cs.Sheet())
+
+    intotheodd: IntoTheOdd = IntoTheOdd()
+
+    def run(command: Any, *get_args: Callable[[Player], str]) -> Runner:
+        return lambda player: run_app_command(
+            command,
+            player,
+            args.api_latency,
+            *(get_arg(player) for get_arg in get_args),
+        )
+
+    def app(
+        group: str, name: str, *get_args: Callable[[Player], str]
+    ) -> Runner:
+        return run(charsheets.get_command(group).get_command(name), *get_args)
+
+    def ito(name: str) -> Runner:
+        return run(intotheodd.get_command(name))
+
+    def get_sheet(player: Player) -> str:
+        return player.sheet
+
+    def get_template(player: Player) -> str:
+        return get_template_name(player.user_id % args.templates)
+
+    def get_counter_field(_: Player) -> str:
+        return COUNTER_FIELD
+
+    sheet_do = charsheets.get_command("sheet").get_command("do")
+
+    async def count_sheet_do(player: Player) -> bool:
+        sheet: str = get_sheet_name(0, rng.randrange(args.hot_sheets))
+        failed: bool = await run_app_command(
+            sheet_do,
+            player,
+            args.api_latency,
+            sheet,
+            COUNTER_FIELD,
+            "add",
+            "1",
+        )
+
+        if not failed:
+            increments[sheet] += 1
+
+        return failed
+
+    return {
+        "sheet.do": count_sheet_do,
+        "sheet.get": app("sheet", "get", get_sheet),
+        "sheet.field": app("sheet", "field", get_sheet, get_counter_field),
+        "sheet.totext": app("sheet", "totext", get_sheet),
+        "sheet.list": app("sheet", "list", get_template),
+        "template.list": app("template", "list"),
+        "template.field_list": app("template", "field_list", get_template),
+        "intotheodd.roll": ito("roll"),
+        "intotheodd.rollattributes": ito("rollattributes"),
+    }
+
+
+def get_players(args: Namespace) -> list[Player]:
+    return [
+        Player(
+            user_id,
+            user_id % args.channels,
+            get_sheet_name(
+                user_id % args.templates,
+                user_id // args.templates % args.sheets,
+            ),
+        )
+        for user_id in range(args.players)
+    ]
+
+
+def read_counters(cs: ModuleType, args: Namespace) -> dict[str, int]:
+    counters: dict[str, int] = {}
+
+    for sheet in range(args.hot_sheets):
+        name: str = get_sheet_name(0, sheet)
+        counters[name] = json.loads(cs.get_sheet_path(name).read_text())[
+            "fields"
+        ][COUNTER_FIELD]
+
+    return counters
+
+
+async def timed(
+    command: str, runner: Runner, player: Player, scheduled: float
+) -> Result:
+    failed: bool = await runner(player)
+
+    # Measured from when the command was due, not when it started, so a
+    # backed up loop shows up as latency instead of a lower request rate.
+    return Result(command, perf_counter() - scheduled, failed)
+
+
+async def replay(
+    args: Namespace,
+    runners: dict[str, Runner],
+    weights: dict[str, float],
+    rng: random.Random,
+) -> list[Result]:
+    players: list[Player] = get_players(args)
+    names: list[str] = list(weights)
+    tasks: list[asyncio.Task] = []
+    started: float = perf_counter()
+
+    for n in range(args.commands):
+        scheduled: float = started + n / args.rate
+        delay: float = scheduled - perf_counter()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        command: str = rng.choices(names, list(weights.values()))[0]
+        player: Player = rng.choice(players)
+
+        tasks.append(
+            asyncio.create_task(
+                timed(command, runners[command], player, scheduled)
+            )
+        )
+
+    return await asyncio.gather(*tasks)
+
+
+def get_quantile(ordered: list[float], q: float) -> float:
+    return ordered[max(0, ceil(q * len(ordered)) - 1)]
+
+
+def summarize(results: list[Result]) -> dict[str, float]:
+    ordered: list[float] = sorted(result.latency for result in results)
+
+    return {
+        "count": len(results),
+        "failed": sum(result.failed for result in results),
+        **{
+            f"p{round(q * 100)}_ms": get_quantile(ordered, q) * 1000
+            for q in QUANTILES
+        },
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def format_summary(name: str, summary: dict[str, float]) -> str:
+    return (
+        f"{name:<28} {summary['count']:>6} calls {summary['failed']:>4} "
+        f"failed  p50 {summary['p50_ms']:>8.1f} ms  "
+        f"p95 {summary['p95_ms']:>8.1f} ms  "
+        f"p99 {summary['p99_ms']:>8.1f} ms  max {summary['max_ms']:>8.1f} ms"
+    )
+
+
+async def main() -> None:
+    args: Namespace = parse_args()
+    rng: random.Random = random.Random(args.seed)
+
+    outmsg.update_defbank()
+    cs: ModuleType = load_charsheets(
+        args.store, args.templates, args.sheets, args.fields
+    )
+
+    increments: Counter = Counter()
+    runners: dict[str, Runner] = get_runners(cs, args, rng, increments)
+    weights: dict[str, float] = parse_mix(args.mix)
+
+    for name in weights:
+        if name not in runners:
+            sys.exit(
+                f"Unknown command {name!r}, pick from: {', '.join(runners)}"
+            )
+
+    initial: dict[str, int] = read_counters(cs, args)
+
+    started: float = perf_counter()
+    results: list[Result] = await replay(args, runners, weights, rng)
+    elapsed: float = perf_counter() - started
+
+    final: dict[str, int] = read_counters(cs, args)
+    lost_updates: int = sum(
+        initial[sheet] + increments[sheet] - final[sheet] for sheet in initial
+    )
+
+    overall: dict[str, float] = summarize(results)
+    commands: dict[str, dict[str, float]] = {
+        name: summarize(
+            [result for result in results if result.command == name]
+        )
+        for name in weights
+        if any(result.command == name for result in results)
+    }
+
+    print(
+        f"{len(results)} commands in {elapsed:.1f} s "
+        f"({len(results) / elapsed:.1f}/s, target {args.rate:.1f}/s)"
+    )
+    print(format_summary("all", overall))
+    for name, summary in commands.items():
+        print(format_summary(name, summary))
+    print(
+        f"Lost updates: {lost_updates} of {sum(increments.values())} "
+        "sheet.do increments"
+    )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "meta": {
+                        key: str(value) if isinstance(value, Path) else value
+                        for key, value in vars(args).items()
+                    },
+                    "elapsed_s": elapsed,
+                    "throughput": len(results) / elapsed,
+                    "lost_updates": lost_updates,
+                    "increments": sum(increments.values()),
+                    "all": overall,
+                    "commands": commands,
+                    "dispatch": dispatch.get_gauges(),
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
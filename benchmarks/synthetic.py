@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional
+
+from botofspades import constants, jsoncodec
+
+
+# A valid value (as stored in JSON) for each field type.
+SAMPLE_VALUES: dict[str, Any] = {
+    "abacus": 10,
+    "rational": 1.5,
+    "lever": True,
+    "scroll": "A rather long note about the character's past.",
+    "gauge": [5, 10],
+}
+
+
+def get_template_name(template: int) -> str:
+    return f"template{template}"
+
+
+def get_sheet_name(template: int, sheet: int) -> str:
+    return f"t{template}sheet{sheet}"
+
+
+def get_field_name(field: int) -> str:
+    return f"field{field}"
+
+
+def get_field_type(field: int) -> str:
+    return list(SAMPLE_VALUES)[field % len(SAMPLE_VALUES)]
+
+
+def write_json(path: Path, value: dict) -> None:
+    path.write_bytes(jsoncodec.dumps(value, constants.PRETTY_JSON))
+
+
+def generate_store(
+    base_dir: Path, templates: int, sheets: int, fields: int
+) -> None:
+    """Writes templates (with sheets per template) as charsheets would."""
+    templates_dir: Path = base_dir / "templates"
+    sheets_dir: Path = base_dir / "sheets"
+
+    templates_dir.mkdir(parents=True, exist_ok=True)
+    sheets_dir.mkdir(parents=True, exist_ok=True)
+
+    template_fields: dict[str, dict] = {
+        get_field_name(field): {
+            "type": get_field_type(field),
+            "default": SAMPLE_VALUES[get_field_type(field)],
+        }
+        for field in range(fields)
+    }
+
+    sheet_fields: dict[str, Any] = {
+        name: field["default"] for name, field in template_fields.items()
+    }
+
+    for template in range(templates):
+        write_json(
+            templates_dir / f"{get_template_name(template)}.json",
+            {"fields": template_fields},
+        )
+
+        for sheet in range(sheets):
+            write_json(
+                sheets_dir / f"{get_sheet_name(template, sheet)}.json",
+                {
+                    "template": get_template_name(template),
+                    "fields": sheet_fields,
+                },
+            )
+
+
+def load_charsheets(
+    store_dir: Optional[Path], templates: int, sheets: int, fields: int
+) -> ModuleType:
+    """Imports charsheets over a synthetic store, generating it if needed.
+
+    charsheets keeps its store under the working directory it's imported from,
+    so this moves into the store's directory for good. Anything that locates
+    files relative to the repository (like outmsg) must be imported first.
+    """
+    store_dir = store_dir or Path(tempfile.mkdtemp())
+    sheets_dir: Path = store_dir / "charsheets"
+
+    if not sheets_dir.exists():
+        print("Generating synthetic store...", file=sys.stderr)
+        generate_store(sheets_dir, templates, sheets, fields)
+
+    os.chdir(store_dir)
+
+    import botofspades.extensions.charsheets as charsheets
+
+    return charsheets
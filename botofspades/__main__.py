@@ -1,12 +1,120 @@
-import asyncio
+from time import perf_counter
+
+started: float = perf_counter()
+
+import sys
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
 
 from discord import Object
 
-from botofspades import constants
+from botofspades import constants, memory, shards, startup
 from botofspades.log import setup_logging
 from botofspades.outmsg import update_defbank
+
+
+parser: ArgumentParser = ArgumentParser(prog="botofspades")
+parser.add_argument(
+    "--shard-count", type=int, help="Total amount of shards in the bot."
+)
+parser.add_argument(
+    "--shards",
+    type=shards.parse_shard_ids,
+    help="Shard IDs run by this process (for example, 0-3).",
+)
+parser.add_argument(
+    "--processes",
+    type=int,
+    help="Splits the shards evenly across this amount of processes.",
+)
+parser.add_argument(
+    "--loop-watchdog",
+    action="store_true",
+    help="Reports commands blocking the event loop.",
+)
+parser.add_argument(
+    "--trace-memory",
+    action="store_true",
+    help="Traces memory use per subsystem, reporting its growth.",
+)
+parser.add_argument(
+    "--lean",
+    action="store_true",
+    help="Only requests the intents and caches the extensions need.",
+)
+parser.add_argument(
+    "--pretty-json",
+    action="store_true",
+    help="Writes templates and sheets indented, for humans to read.",
+)
+parser.add_argument(
+    "--api-port",
+    type=int,
+    help="Serves templates and sheets as JSON on this local port.",
+)
+parser.add_argument(
+    "--api-socket",
+    type=Path,
+    help="Serves templates and sheets as JSON on this Unix socket.",
+)
+parser.add_argument(
+    "--log-json", action="store_true", help="Logs records as JSON lines."
+)
+parser.add_argument(
+    "--log-file", type=Path, help="Also logs to this (rotated) file."
+)
+
+args: Namespace = parser.parse_args()
+
+if (args.shards or args.processes) and not args.shard_count:
+    parser.error("--shards and --processes require --shard-count")
+
+if args.processes:
+    setup_logging(args.log_json)
+    sys.exit(
+        shards.launch(
+            args.shard_count,
+            args.processes,
+            *(["--loop-watchdog"] if args.loop_watchdog else []),
+            *(["--trace-memory"] if args.trace_memory else []),
+            *(["--lean"] if args.lean else []),
+            *(["--pretty-json"] if args.pretty_json else []),
+            *(["--api-port", str(args.api_port)] if args.api_port else []),
+            *(
+                ["--api-socket", str(args.api_socket)]
+                if args.api_socket
+                else []
+            ),
+            *(["--log-json"] if args.log_json else []),
+            *(["--log-file", str(args.log_file)] if args.log_file else []),
+        )
+    )
+
+# Each shard process logs to its own file.
+if args.log_file and args.shards:
+    args.log_file = args.log_file.with_stem(
+        f"{args.log_file.stem}-{shards.format_shard_ids(args.shards)}"
+    )
+
+constants.LOOP_WATCHDOG = args.loop_watchdog
+constants.TRACE_MEMORY = args.trace_memory
+constants.LEAN_MODE = args.lean
+constants.PRETTY_JSON = args.pretty_json
+constants.API_PORT = args.api_port
+constants.API_SOCKET = args.api_socket
+
+# Started before the bot is built so its caches are traced from the start.
+if args.trace_memory:
+    memory.start()
+constants.SHARD_COUNT = args.shard_count
+constants.SHARD_IDS = args.shards
+
+# The bot is built on import, so the shard and lean settings must be set
+# beforehand.
 from botofspades.bot import bot
 
+startup.record("import", perf_counter() - started)
+
 
 try:
     with open(".SERVER_ID") as id_file:
@@ -14,11 +122,27 @@ try:
 except OSError:
     constants.TARGET_GUILD = None
 
-update_defbank()
-setup_logging()
+try:
+    with open(".METRICS_FILE") as metrics_file:
+        constants.METRICS_FILE = Path(metrics_file.read().strip())
+
+    # Each shard process writes its own file.
+    if constants.METRICS_FILE and constants.SHARD_IDS:
+        constants.METRICS_FILE = constants.METRICS_FILE.with_stem(
+            f"{constants.METRICS_FILE.stem}-"
+            f"{shards.format_shard_ids(constants.SHARD_IDS)}"
+        )
+except OSError:
+    constants.METRICS_FILE = None
+
+with startup.timed("defbank parse"):
+    update_defbank()
+
+setup_logging(args.log_json, args.log_file)
 
 with open(".BOT_TOKEN") as token_file:
     TOKEN: str = token_file.read()
 
-asyncio.run(bot.load_default_exts())
-bot.run(TOKEN)
+# Logging is already set up (through a queue), so discord.py mustn't add its
+# own handler.
+bot.run(TOKEN, log_handler=None)
@@ -0,0 +1,291 @@
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+from aiohttp import web
+from discord.ext import commands
+
+from botofspades import changes, constants, jsoncodec
+from botofspades.jsonwrappers import JSONFileWrapperReadOnly
+from botofspades.log import logger
+
+
+# A read-only JSON view of templates and sheets for local tools (overlays,
+# widgets and such), served from inside the bot so reads are locked against
+# its writes.
+
+CHARSHEETS_EXTENSION: str = "botofspades.extensions.charsheets"
+
+# Longest a long-poll waits for changes, and how often the event stream sends
+# a comment so proxies (and the client) know it's alive.
+MAX_POLL_SECONDS: float = 60.0
+DEFAULT_POLL_SECONDS: float = 30.0
+STREAM_HEARTBEAT: float = 15.0
+
+# Overlays are usually pages (or browser sources) from another origin.
+HEADERS: dict[str, str] = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Expose-Headers": "ETag",
+    "Cache-Control": "no-cache",
+}
+
+BOT: web.AppKey[commands.Bot] = web.AppKey("bot", commands.Bot)
+
+runner: Optional[web.AppRunner] = None
+
+
+def get_etag(*parts: int) -> str:
+    return '"' + "-".join(map(str, parts)) + '"'
+
+
+def matches_etag(header: str, etag: str) -> bool:
+    # Weak comparison, as If-None-Match calls for.
+    return any(
+        tag.strip().removeprefix("W/") in (etag, "*")
+        for tag in header.split(",")
+    )
+
+
+def get_charsheets(request: web.Request) -> ModuleType:
+    charsheets: Optional[ModuleType] = request.app[BOT].extensions.get(
+        CHARSHEETS_EXTENSION
+    )
+
+    if not charsheets:
+        raise web.HTTPServiceUnavailable(
+            text="Charsheets isn't loaded", headers=HEADERS
+        )
+
+    return charsheets
+
+
+def json_response(
+    request: web.Request, etag: str, get_value: Callable[[], Any]
+) -> web.Response:
+    if matches_etag(request.headers.get("If-None-Match", ""), etag):
+        return web.Response(status=304, headers=HEADERS | {"ETag": etag})
+
+    return web.Response(
+        body=jsoncodec.dumps(get_value()),
+        content_type="application/json",
+        headers=HEADERS | {"ETag": etag},
+    )
+
+
+def get_names(directory: Path) -> list[str]:
+    return sorted(path.stem for path in directory.glob("*.json"))
+
+
+def read_document(path: Path) -> dict:
+    try:
+        with JSONFileWrapperReadOnly(path) as document:
+            return document
+    except FileNotFoundError:
+        raise web.HTTPNotFound(headers=HEADERS)
+
+
+def get_list(request: web.Request, directory: Path, key: str) -> web.Response:
+    # Creating, removing or renaming a file changes its directory's time.
+    stat = directory.stat()
+
+    return json_response(
+        request,
+        get_etag(stat.st_mtime_ns),
+        lambda: {key: get_names(directory)},
+    )
+
+
+def is_inside(path: Path, directory: Path) -> bool:
+    try:
+        return path.resolve().parent == directory.resolve()
+    except (OSError, ValueError):
+        # Unresolvable, like names with null bytes.
+        return False
+
+
+def get_document(
+    request: web.Request,
+    directory: Path,
+    get_version: Callable[[str], Optional[tuple[int, ...]]],
+    get_path: Callable[[str], Path],
+) -> web.Response:
+    name: str = request.match_info["name"].lower()
+
+    # Names arrive decoded (%2F being a slash), so they could reach outside
+    # the directory otherwise.
+    if not is_inside(get_path(name), directory):
+        raise web.HTTPNotFound(headers=HEADERS)
+
+    # Taken before reading, so a write in between makes the ETag older than
+    # the data, never newer (the next request just fetches it again).
+    version: Optional[tuple[int, ...]] = get_version(name)
+
+    if version is None:
+        raise web.HTTPNotFound(headers=HEADERS)
+
+    return json_response(
+        request,
+        get_etag(*version),
+        lambda: {"name": name} | read_document(get_path(name)),
+    )
+
+
+async def get_templates(request: web.Request) -> web.Response:
+    return get_list(
+        request, get_charsheets(request).templates_dir, "templates"
+    )
+
+
+async def get_template(request: web.Request) -> web.Response:
+    charsheets: ModuleType = get_charsheets(request)
+
+    return get_document(
+        request,
+        charsheets.templates_dir,
+        charsheets.get_template_version,
+        charsheets.get_template_path,
+    )
+
+
+async def get_sheets(request: web.Request) -> web.Response:
+    return get_list(request, get_charsheets(request).charsheets_dir, "sheets")
+
+
+async def get_sheet(request: web.Request) -> web.Response:
+    charsheets: ModuleType = get_charsheets(request)
+
+    return get_document(
+        request,
+        charsheets.charsheets_dir,
+        charsheets.get_sheet_version,
+        charsheets.get_sheet_path,
+    )
+
+
+def get_change_dict(change: changes.Change) -> dict[str, Any]:
+    return {"seq": change.seq, "kind": change.kind, "name": change.name}
+
+
+def get_seq(text: Optional[str]) -> int:
+    if text is None:
+        return changes.feed.seq
+
+    try:
+        return int(text)
+    except ValueError:
+        raise web.HTTPBadRequest(text="Invalid sequence", headers=HEADERS)
+
+
+async def poll_changes(request: web.Request) -> web.Response:
+    """Waits for changes after since (or now), returning them as soon as any
+    come. Changes are null if some were missed, so everything must be fetched
+    again.
+    """
+    seq: int = get_seq(request.query.get("since"))
+
+    try:
+        timeout: float = min(
+            float(request.query.get("timeout", DEFAULT_POLL_SECONDS)),
+            MAX_POLL_SECONDS,
+        )
+    except ValueError:
+        raise web.HTTPBadRequest(text="Invalid timeout", headers=HEADERS)
+
+    found: Optional[list[changes.Change]] = await changes.feed.wait(
+        seq, timeout
+    )
+
+    return web.Response(
+        body=jsoncodec.dumps(
+            {
+                "seq": changes.feed.seq,
+                "changes": (
+                    list(map(get_change_dict, found))
+                    if found is not None
+                    else None
+                ),
+            }
+        ),
+        content_type="application/json",
+        headers=HEADERS,
+    )
+
+
+async def stream_changes(request: web.Request) -> web.StreamResponse:
+    """Sends changes as server-sent events, resuming after Last-Event-ID.
+    A reset event means some were missed, so everything must be fetched
+    again.
+    """
+    seq: int = get_seq(request.headers.get("Last-Event-ID"))
+
+    response: web.StreamResponse = web.StreamResponse(
+        headers=HEADERS | {"Content-Type": "text/event-stream"}
+    )
+    await response.prepare(request)
+
+    try:
+        while True:
+            found: Optional[list[changes.Change]] = await changes.feed.wait(
+                seq, STREAM_HEARTBEAT
+            )
+
+            if found is None:
+                seq = changes.feed.seq
+                await response.write(
+                    f"id: {seq}\nevent: reset\ndata: {{}}\n\n".encode()
+                )
+            elif not found:
+                await response.write(b": heartbeat\n\n")
+            else:
+                seq = found[-1].seq
+                await response.write(
+                    b"".join(
+                        f"id: {change.seq}\nevent: {change.kind}\n".encode()
+                        + b"data: "
+                        + jsoncodec.dumps(get_change_dict(change))
+                        + b"\n\n"
+                        for change in found
+                    )
+                )
+    except ConnectionResetError:
+        # The client went away.
+        pass
+
+    return response
+
+
+def create_app(bot: commands.Bot) -> web.Application:
+    app: web.Application = web.Application()
+    app[BOT] = bot
+    app.router.add_get("/templates", get_templates)
+    app.router.add_get("/templates/{name}", get_template)
+    app.router.add_get("/sheets", get_sheets)
+    app.router.add_get("/sheets/{name}", get_sheet)
+    app.router.add_get("/changes", poll_changes)
+    app.router.add_get("/changes/stream", stream_changes)
+
+    return app
+
+
+async def start(bot: commands.Bot) -> None:
+    global runner
+
+    runner = web.AppRunner(create_app(bot), handle_signals=False)
+    await runner.setup()
+
+    site: web.BaseSite = (
+        web.UnixSite(runner, str(constants.API_SOCKET))
+        if constants.API_SOCKET
+        else web.TCPSite(runner, constants.API_HOST, constants.API_PORT)
+    )
+    await site.start()
+
+    logger.info(f"Serving the sheet API on {site.name}")
+
+
+async def stop() -> None:
+    global runner
+
+    if runner:
+        await runner.cleanup()
+        runner = None
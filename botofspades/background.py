@@ -0,0 +1,30 @@
+import asyncio
+from contextvars import Context
+from typing import Any, Coroutine
+
+from botofspades.log import task_failed
+
+
+# The event loop only keeps weak references to tasks, so tasks nothing awaits
+# are kept here until they finish (or they may be collected mid-flight).
+tasks: set[asyncio.Task] = set()
+
+
+def _finished(task: asyncio.Task) -> None:
+    tasks.discard(task)
+
+    if not task.cancelled() and task.exception():
+        task_failed(task.get_name(), task.exception())
+
+
+def spawn(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Runs coro in a task kept until it finishes, logging its failure."""
+    # Run in a context of their own, or tasks spawned during a command (such
+    # as the dispatcher's worker) would be counted as part of it for good.
+    task: asyncio.Task = asyncio.create_task(
+        coro, name=coro.__qualname__, context=Context()
+    )
+    tasks.add(task)
+    task.add_done_callback(_finished)
+
+    return task
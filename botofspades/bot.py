@@ -1,27 +1,248 @@
-from discord.ext import commands
-from discord import Intents
+import asyncio
+from hashlib import sha256
+from importlib import import_module
+from importlib.util import find_spec
+from pathlib import Path
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Iterable
 
-from botofspades import constants
-from botofspades.log import logger
+from discord.ext import commands, tasks
+from discord import app_commands as apc
+from discord import Intents, Interaction, InteractionType, MemberCacheFlags
 
+from botofspades import (
+    api,
+    constants,
+    deferral,
+    dispatch,
+    memory,
+    metrics,
+    profiling,
+    registry,
+    startup,
+    watchdog,
+)
+from botofspades.log import logger, memory_reported
+from botofspades.shards import is_primary_process
+from botofspades.slash import sync_tree
 
-def get_bot_intents() -> Intents:
-    intents: Intents = Intents.default()
-    intents.message_content = True
+
+def drop_message_intents(intents: Intents) -> Intents:
+    # Every command is an app command, so messages are of no use to the bot.
+    intents.guild_messages = False
+    intents.dm_messages = False
+    intents.message_content = False
     return intents
 
 
-class BotOfSpades(commands.Bot):
+def get_bot_intents() -> Intents:
+    # A client's intents are fixed once it's built, so in lean mode the
+    # extensions are imported beforehand to read theirs. Loading them runs
+    # them again, which they're written for as they're reloaded anyway.
+    if constants.LEAN_MODE:
+        return get_extension_intents(
+            import_module(get_extension_name(ext))
+            for ext in constants.DEFAULT_EXTENSIONS
+        )
+
+    return drop_message_intents(Intents.default())
+
+
+def get_extension_intents(extensions: Iterable[ModuleType]) -> Intents:
+    """The intents the given extensions declare they need, plus guilds (which
+    app commands and the guild cache rely on).
+    """
+    intents: Intents = Intents(guilds=True)
+
+    for extension in extensions:
+        intents |= getattr(extension, "INTENTS", Intents.none())
+
+    return drop_message_intents(intents)
+
+
+def get_cache_options() -> dict[str, Any]:
+    if not constants.LEAN_MODE:
+        return {}
+
+    return {
+        "max_messages": constants.LEAN_MAX_MESSAGES,
+        "member_cache_flags": MemberCacheFlags.none(),
+        "chunk_guilds_at_startup": False,
+    }
+
+
+def get_extension_name(ext: str) -> str:
+    return f"botofspades.extensions.{ext}"
+
+
+def get_source_hash(name: str) -> str:
+    """Hashes a module's source (every file in it, for packages)."""
+    spec = find_spec(name)
+    assert spec and spec.origin
+
+    origin: Path = Path(spec.origin)
+    paths: list[Path] = (
+        sorted(origin.parent.rglob("*.py"))
+        if spec.submodule_search_locations
+        else [origin]
+    )
+
+    digest = sha256()
+    for path in paths:
+        digest.update(path.relative_to(origin.parent).as_posix().encode())
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+class BotOfSpadesTree(apc.CommandTree):
+    async def interaction_check(self, itr: Interaction) -> bool:
+        if itr.type is InteractionType.application_command:
+            deferral.start(itr)
+            metrics.start_command(
+                ("app", itr.id),
+                deferral.get_command_name(itr),
+                "app",
+                itr.guild_id,
+            )
+
+        return True
+
+    async def on_error(
+        self, itr: Interaction, error: apc.AppCommandError
+    ) -> None:
+        deferral.finish(itr, failed=True)
+        metrics.finish_command(("app", itr.id), failed=True)
+        profiling.command_finished()
+        await super().on_error(itr, error)
+
+
+class BotOfSpades(commands.AutoShardedBot):
+    # Source hashes of the extensions as they were last (re)loaded.
+    source_hashes: dict[str, str] = registry.get_state(
+        "bot.source_hashes", dict
+    )
+
+    async def _load_timed_ext(self, ext: str) -> None:
+        started: float = perf_counter()
+        self.source_hashes[ext] = get_source_hash(get_extension_name(ext))
+        await self.load_extension(get_extension_name(ext))
+        logger.debug(
+            f"Extension {ext} took {(perf_counter() - started) * 1000:.0f} ms"
+        )
+
     async def load_default_exts(self) -> None:
+        # Extensions don't depend on each other, so they're loaded together.
+        await asyncio.gather(
+            *(
+                self._load_timed_ext(ext)
+                for ext in constants.DEFAULT_EXTENSIONS
+            )
+        )
+
+    async def reload_changed_exts(self, force: bool = False) -> list[str]:
+        """Reloads the extensions whose source changed since last loaded."""
+        reloaded: list[str] = []
+
         for ext in constants.DEFAULT_EXTENSIONS:
-            await self.load_extension(f"botofspades.extensions.{ext}")
+            source_hash: str = get_source_hash(get_extension_name(ext))
+
+            if not force and self.source_hashes.get(ext) == source_hash:
+                continue
+
+            registry.flush(f"{ext}.")
+            await self.reload_extension(get_extension_name(ext))
+
+            self.source_hashes[ext] = source_hash
+            reloaded.append(ext)
+
+        return reloaded
+
+    async def setup_hook(self) -> None:
+        with startup.timed("setup"):
+            await self.load_default_exts()
+
+        # Extensions reloaded later keep the intents read when the bot was
+        # built.
+        if constants.LEAN_MODE:
+            logger.info(
+                "Lean mode intents: "
+                + ", ".join(name for name, on in self.intents if on)
+            )
+
+        if constants.METRICS_FILE:
+            write_metrics.start()
+
+        if constants.LOOP_WATCHDOG:
+            watchdog.start()
+
+        if constants.TRACE_MEMORY:
+            report_memory.start()
+
+        # Only the primary process serves the API, so shard processes don't
+        # fight over its port.
+        if (
+            constants.API_PORT or constants.API_SOCKET
+        ) and is_primary_process(constants.SHARD_IDS):
+            await api.start(self)
+
+    async def close(self) -> None:
+        await api.stop()
+        await super().close()
 
     async def on_ready(self) -> None:
-        await self.tree.sync(guild=constants.TARGET_GUILD)
+        # Commands are global to the application, one process syncs them.
+        if is_primary_process(constants.SHARD_IDS):
+            with startup.timed("tree sync"):
+                await sync_tree(self)
+
+        startup.report()
         logger.info("Bot ready to receive commands")
 
+    async def on_app_command_completion(
+        self, itr: Interaction, command: apc.Command | apc.ContextMenu
+    ) -> None:
+        deferral.finish(itr)
+        metrics.finish_command(("app", itr.id))
+        profiling.command_finished()
+
 
+# Without message intents, no message ever reaches the prefix command
+# pipeline, so there are no prefixes (nor a help command) to look for.
 bot: BotOfSpades = BotOfSpades(
-    command_prefix=constants.PREFIXES,
-    intents=get_bot_intents()
+    command_prefix=(),
+    help_command=None,
+    intents=get_bot_intents(),
+    tree_cls=BotOfSpadesTree,
+    shard_count=constants.SHARD_COUNT,
+    shard_ids=constants.SHARD_IDS,
+    **get_cache_options(),
 )
+
+
+@tasks.loop(seconds=constants.METRICS_INTERVAL)
+async def write_metrics() -> None:
+    if constants.METRICS_FILE:
+        metrics.write_prometheus_file(
+            constants.METRICS_FILE,
+            dispatch.get_gauges()
+            | watchdog.get_gauges()
+            | memory.get_gauges(),
+        )
+
+
+@tasks.loop(seconds=constants.MEMORY_INTERVAL)
+async def report_memory() -> None:
+    report: memory.MemoryReport = await memory.take_report("periodic")
+
+    # The first report is only a baseline to compare against.
+    if report.subsystem_growth:
+        memory_reported(
+            report.total,
+            report.subsystem_growth,
+            [
+                f"{growth.location}: {growth.size_diff / 1000:+.0f} kB"
+                for growth in report.top_growth
+            ],
+        )
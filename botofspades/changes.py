@@ -0,0 +1,97 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Optional
+
+
+# Changes kept for clients catching up (through their last seen sequence).
+CHANGE_HISTORY: int = 1000
+
+
+@dataclass(frozen=True)
+class Change:
+    seq: int
+    # "sheet" or "template". Template changes may also change its sheets.
+    kind: str
+    name: str
+
+
+class ChangeFeed:
+    """Numbered changes to templates and sheets made through this process,
+    for clients to wait on rather than polling the files.
+    """
+
+    def __init__(self, history: int = CHANGE_HISTORY) -> None:
+        self.seq: int = 0
+        self.history: deque[Change] = deque(maxlen=history)
+
+        # Set (and replaced) on every change, waking everyone waiting.
+        self._published: Optional[asyncio.Event] = None
+        # Called on every change, so they must be quick (scheduling any real
+        # work for later).
+        self._subscribers: list[Callable[[Change], None]] = []
+
+    def subscribe(self, callback: Callable[[Change], None]) -> None:
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Change], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def publish(self, kind: str, name: str) -> Change:
+        self.seq += 1
+        change: Change = Change(self.seq, kind, name)
+        self.history.append(change)
+
+        if self._published:
+            self._published.set()
+            self._published = None
+
+        for callback in self._subscribers:
+            callback(change)
+
+        return change
+
+    def since(self, seq: int) -> Optional[list[Change]]:
+        """The changes after seq, or None if some were already dropped from
+        the history (or seq is from before a restart), so everything must be
+        fetched again.
+        """
+        if seq == self.seq:
+            return []
+
+        if seq > self.seq or not self.history:
+            return None
+
+        # Sequence numbers are consecutive, so the history is indexed by them.
+        start: int = seq - self.history[0].seq + 1
+
+        if start < 0:
+            return None
+
+        return list(islice(self.history, start, None))
+
+    async def wait(
+        self, seq: int, timeout: float
+    ) -> Optional[list[Change]]:
+        """Like since, but waits up to timeout seconds for a change if there
+        are none yet (returning an empty list if none came).
+        """
+        changes: Optional[list[Change]] = self.since(seq)
+
+        if changes is None or changes:
+            return changes
+
+        if not self._published:
+            self._published = asyncio.Event()
+
+        try:
+            await asyncio.wait_for(self._published.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        return self.since(seq)
+
+
+feed: ChangeFeed = ChangeFeed()
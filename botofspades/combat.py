@@ -0,0 +1,279 @@
+import asyncio
+import multiprocessing
+import random
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Optional
+
+from botofspades import constants, dicestats
+
+
+# Sheet fields combatants are read from, and defaults for the optional ones.
+HP_FIELD: str = "hp"
+STRENGTH_FIELD: str = "strength"
+ARMOR_FIELD: str = "armor"
+DAMAGE_FIELD: str = "damage"
+DEFAULT_STRENGTH: int = 10
+DEFAULT_ARMOR: int = 0
+DEFAULT_DAMAGE: str = "d6"
+
+# Fights still going after this many rounds are draws.
+MAX_ROUNDS: int = 100
+
+
+@dataclass(frozen=True)
+class Combatant:
+    name: str
+    hp: int
+    strength: int
+    armor: int
+    damage: str
+
+
+@dataclass
+class SimulationResult:
+    fights: int = 0
+    party_wins: int = 0
+    mob_wins: int = 0
+    draws: int = 0
+    # How many fights each side won after each amount of rounds.
+    party_rounds: Counter = field(default_factory=Counter)
+    mob_rounds: Counter = field(default_factory=Counter)
+
+    def add(self, other: "SimulationResult") -> None:
+        self.fights += other.fights
+        self.party_wins += other.party_wins
+        self.mob_wins += other.mob_wins
+        self.draws += other.draws
+        self.party_rounds.update(other.party_rounds)
+        self.mob_rounds.update(other.mob_rounds)
+
+
+def get_rounds_percentile(rounds: Counter, percent: int) -> int:
+    """The least rounds within which percent% of the fights were won."""
+    total: int = sum(rounds.values())
+    cumulative: int = 0
+
+    for amount in sorted(rounds):
+        cumulative += rounds[amount]
+
+        if cumulative * 100 >= percent * total:
+            return amount
+
+    return MAX_ROUNDS
+
+
+def get_mean_rounds(rounds: Counter) -> float:
+    return sum(amount * fights for amount, fights in rounds.items()) / sum(
+        rounds.values()
+    )
+
+
+def get_value(value: Any) -> int:
+    # Gauges count as their current value.
+    return int(value[0] if isinstance(value, (list, tuple)) else value)
+
+
+def get_combatant(name: str, fields: dict[str, Any]) -> Combatant:
+    """Reads a combatant from a sheet's fields.
+
+    Raises KeyError if it has no HP field and ValueError if a field's value
+    can't be used (with the field's name).
+    """
+    if HP_FIELD not in fields:
+        raise KeyError(HP_FIELD)
+
+    values: dict[str, Any] = {
+        STRENGTH_FIELD: DEFAULT_STRENGTH,
+        ARMOR_FIELD: DEFAULT_ARMOR,
+        DAMAGE_FIELD: DEFAULT_DAMAGE,
+    } | fields
+
+    for field_name in (HP_FIELD, STRENGTH_FIELD, ARMOR_FIELD):
+        try:
+            values[field_name] = get_value(values[field_name])
+        except (TypeError, ValueError):
+            raise ValueError(field_name)
+
+    try:
+        dicestats.parse(str(values[DAMAGE_FIELD]).lower())
+    except ValueError:
+        raise ValueError(DAMAGE_FIELD)
+
+    return Combatant(
+        name,
+        values[HP_FIELD],
+        values[STRENGTH_FIELD],
+        values[ARMOR_FIELD],
+        str(values[DAMAGE_FIELD]).lower(),
+    )
+
+
+@lru_cache(maxsize=64)
+def get_sampler(expression: str) -> tuple[list[int], list[int]]:
+    """The totals of a roll and their cumulative weights, for sampling."""
+    distribution: dicestats.Distribution = dicestats.parse(expression)
+
+    return (
+        list(range(distribution.minimum, distribution.maximum + 1)),
+        list(accumulate(distribution.counts)),
+    )
+
+
+def roll(expression: str, rng: random.Random) -> int:
+    totals, cumulative = get_sampler(expression)
+
+    # Drawn as an integer, as the weights can be too large for floats.
+    return totals[bisect_left(cumulative, rng.randrange(cumulative[-1]) + 1)]
+
+
+def run_fight(
+    party: tuple[Combatant, ...],
+    mob: tuple[Combatant, ...],
+    rng: random.Random,
+) -> tuple[Optional[str], int]:
+    """Fights until a side is taken out, returning it ("party" or "mob", None
+    for a draw) and the rounds it took.
+
+    Attacks always hit, dealing their damage minus the target's armor. Damage
+    past a combatant's HP reduces their strength, and they're taken out if it
+    runs out or they fail a strength save (a d20 over it).
+    """
+    fighters: tuple[Combatant, ...] = (*party, *mob)
+    hp: list[int] = [fighter.hp for fighter in fighters]
+    strength: list[int] = [fighter.strength for fighter in fighters]
+
+    # Indices (into fighters) of the combatants still standing on each side.
+    standing: dict[str, list[int]] = {
+        "party": list(range(len(party))),
+        "mob": list(range(len(party), len(fighters))),
+    }
+
+    for round_number in range(1, MAX_ROUNDS + 1):
+        # The party acts first, as they usually do in Into the Odd.
+        for side, other_side in (("party", "mob"), ("mob", "party")):
+            for attacker in list(standing[side]):
+                # Taken out earlier this round.
+                if attacker not in standing[side]:
+                    continue
+
+                targets: list[int] = standing[other_side]
+                target: int = rng.choice(targets)
+                damage: int = max(
+                    0,
+                    roll(fighters[attacker].damage, rng)
+                    - fighters[target].armor,
+                )
+
+                if damage <= hp[target]:
+                    hp[target] -= damage
+                    continue
+
+                strength[target] -= damage - hp[target]
+                hp[target] = 0
+                remaining: int = strength[target]
+
+                if remaining > 0 and rng.randint(1, 20) <= remaining:
+                    continue
+
+                targets.remove(target)
+
+                if not targets:
+                    return side, round_number
+
+    return None, MAX_ROUNDS
+
+
+def run_fights(
+    party: tuple[Combatant, ...],
+    mob: tuple[Combatant, ...],
+    fights: int,
+    seed: int,
+) -> SimulationResult:
+    """Runs fights in a worker process, with its own seeded generator."""
+    rng: random.Random = random.Random(seed)
+    result: SimulationResult = SimulationResult(fights)
+
+    for _ in range(fights):
+        winner, rounds = run_fight(party, mob, rng)
+
+        if winner == "party":
+            result.party_wins += 1
+            result.party_rounds[rounds] += 1
+        elif winner == "mob":
+            result.mob_wins += 1
+            result.mob_rounds[rounds] += 1
+        else:
+            result.draws += 1
+
+    return result
+
+
+executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global executor
+
+    # Workers are spawned rather than forked, as the bot's process has other
+    # threads (and locks) running.
+    if not executor:
+        executor = ProcessPoolExecutor(
+            constants.COMBAT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    return executor
+
+
+def shutdown_executor() -> None:
+    """Stops the worker processes (if started), dropping queued fights."""
+    global executor
+
+    # Not waited for, so running fights don't hold up the event loop.
+    if executor:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
+
+
+async def simulate(
+    party: tuple[Combatant, ...],
+    mob: tuple[Combatant, ...],
+    fights: int,
+    seed: Optional[int] = None,
+) -> SimulationResult:
+    """Runs fights split across the worker processes, without blocking."""
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    seeds: random.Random = random.Random(seed)
+    workers: int = constants.COMBAT_WORKERS
+
+    # Each worker gets an even share of the fights and a seed of its own.
+    shares: list[int] = [
+        fights // workers + (worker < fights % workers)
+        for worker in range(workers)
+    ]
+
+    results: list[SimulationResult] = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                get_executor(),
+                run_fights,
+                party,
+                mob,
+                share,
+                seeds.getrandbits(64),
+            )
+            for share in shares
+            if share
+        )
+    )
+
+    total: SimulationResult = SimulationResult()
+    for result in results:
+        total.add(result)
+
+    return total
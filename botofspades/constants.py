@@ -1,11 +1,74 @@
+import os
+from pathlib import Path
+
 from discord import Object
 
 
 TARGET_GUILD: Object | None
 
-PREFIXES: list[str] = ["spades.", "bos.", "&"]
+# Sharding (see botofspades.shards). With no shard IDs, this process runs
+# every shard (just one, for most bots) and is the primary process.
+SHARD_COUNT: int | None = None
+SHARD_IDS: list[int] | None = None
+
 DEFAULT_EXTENSIONS: tuple[str, ...] = (
     "botcontrol",
     "intotheodd",
     "charsheets",
+    "dice",
+    "encounter",
 )
+
+# Seconds after which an app command still running is deferred (Discord only
+# waits 3 seconds for the initial response).
+DEFER_THRESHOLD: float = 2.0
+
+# Where to periodically write metrics in the Prometheus text format (read
+# from .METRICS_FILE), and how often in seconds.
+METRICS_FILE: Path | None = None
+METRICS_INTERVAL: float = 15.0
+
+# Event loop watchdog (see botofspades.watchdog): how often in seconds to
+# check the loop, and after how many seconds a blocked loop is reported.
+LOOP_WATCHDOG: bool = False
+WATCHDOG_INTERVAL: float = 0.1
+WATCHDOG_THRESHOLD: float = 0.5
+
+# On-demand profiling (see botofspades.profiling): where profiles are written,
+# how many functions replies show, and the longest a session can run (replies
+# must arrive before the interaction expires, after 15 minutes).
+PROFILE_DIR: Path = Path("profiles")
+PROFILE_TOP_ENTRIES: int = 15
+MAX_PROFILE_SECONDS: float = 600.0
+
+# Memory accounting (see botofspades.memory): whether to trace allocations
+# from startup and report them periodically, how often in seconds, how many
+# frames to keep per allocation (enough to reach the bot's own code), and how
+# many of the fastest growing lines reports show.
+TRACE_MEMORY: bool = False
+MEMORY_INTERVAL: float = 600.0
+MEMORY_TRACE_FRAMES: int = 16
+MEMORY_TOP_GROWTH: int = 10
+
+# Lean mode: intents trimmed to what the loaded extensions declare (as their
+# INTENTS), no member cache or chunking, and at most this many messages cached
+# (None disables the message cache).
+LEAN_MODE: bool = False
+LEAN_MAX_MESSAGES: int | None = None
+
+# Whether templates and sheets are written indented for humans to read,
+# rather than compactly.
+PRETTY_JSON: bool = False
+
+# Local read-only sheet API (see botofspades.api), served on API_HOST at
+# API_PORT or on the Unix socket at API_SOCKET, if either is set.
+API_HOST: str = "127.0.0.1"
+API_PORT: int | None = None
+API_SOCKET: Path | None = None
+
+# Worker processes combat simulations (see botofspades.combat) run on.
+COMBAT_WORKERS: int = min(4, os.cpu_count() or 1)
+
+# Discord's length limits.
+MESSAGE_LIMIT: int = 2000
+EMBED_DESCRIPTION_LIMIT: int = 4096
@@ -0,0 +1,112 @@
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Optional
+
+from discord import Interaction
+
+from botofspades import constants
+from botofspades.log import command_completed, command_deferred
+
+
+@dataclass
+class CommandTimer:
+    started: float
+    handle: Optional[asyncio.TimerHandle] = None
+    deferring: Optional[asyncio.Task] = None
+    responded: bool = False
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+
+timers: dict[int, CommandTimer] = {}
+
+
+def get_command_name(itr: Interaction) -> str:
+    return itr.command.qualified_name if itr.command else "unknown"
+
+
+def start(itr: Interaction) -> None:
+    """Starts timing an app command, deferring it if it takes too long."""
+    timer: CommandTimer = CommandTimer(perf_counter())
+    timer.handle = asyncio.get_running_loop().call_later(
+        constants.DEFER_THRESHOLD, _schedule_defer, itr
+    )
+
+    timers[itr.id] = timer
+
+
+def _schedule_defer(itr: Interaction) -> None:
+    timer: Optional[CommandTimer] = timers.get(itr.id)
+
+    if timer and not timer.responded and not timer.deferring:
+        timer.deferring = asyncio.create_task(_defer(itr, timer))
+
+
+async def _defer(itr: Interaction, timer: CommandTimer) -> None:
+    if itr.response.is_done():
+        return
+
+    command_deferred(get_command_name(itr), itr.guild_id, timer.elapsed)
+    await itr.response.defer(thinking=True)
+
+
+async def checkpoint(itr: Interaction) -> None:
+    """Defers the command if it's past the threshold.
+
+    The timer can't fire while a command does synchronous work, so long loops
+    should call this once per iteration.
+    """
+    timer: Optional[CommandTimer] = timers.get(itr.id)
+
+    if timer and timer.elapsed >= constants.DEFER_THRESHOLD:
+        _schedule_defer(itr)
+
+        if timer.deferring:
+            await timer.deferring
+
+
+async def claim_response(itr: Interaction) -> bool:
+    """Whether the next message should be the interaction's response.
+
+    Returns False once the command has been deferred, in which case messages
+    must be sent as follow-ups instead.
+    """
+    timer: Optional[CommandTimer] = timers.get(itr.id)
+
+    if not timer:
+        return not itr.response.is_done()
+
+    if timer.deferring:
+        await timer.deferring
+        return False
+
+    if timer.responded:
+        return not itr.response.is_done()
+
+    timer.responded = True
+
+    if timer.handle:
+        timer.handle.cancel()
+
+    return True
+
+
+def finish(itr: Interaction, failed: bool = False) -> None:
+    timer: Optional[CommandTimer] = timers.pop(itr.id, None)
+
+    if not timer:
+        return
+
+    if timer.handle:
+        timer.handle.cancel()
+
+    command_completed(
+        get_command_name(itr),
+        itr.guild_id,
+        timer.elapsed,
+        bool(timer.deferring),
+        failed,
+    )
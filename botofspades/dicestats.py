@@ -0,0 +1,241 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import comb, factorial, prod
+
+
+# Bounds keeping every computation (which runs on the event loop) under
+# 50 ms or so.
+MAX_DICE: int = 100
+MAX_SIDES: int = 1000
+MAX_OUTCOMES: int = 1000
+# Keeping dice enumerates every multiset of rolls, so it's bounded separately,
+# by the multisets times the dice in each (plus the work each takes anyway).
+MAX_KEEP_WORK: int = 120_000
+KEEP_WORK_PER_ROLLS: int = 8
+
+term_re = re.compile(
+    r"\s*([+-])\s*(?:(\d*)d(\d+)(?:(kh|kl)(\d+))?|(\d+))\s*", re.IGNORECASE
+)
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """The exact distribution of a roll, as how many of its equally likely
+    outcomes give each total, from the lowest total up.
+    """
+
+    minimum: int
+    counts: tuple[int, ...]
+
+    @property
+    def maximum(self) -> int:
+        return self.minimum + len(self.counts) - 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def items(self):
+        return enumerate(self.counts, self.minimum)
+
+    def __add__(self, other: "Distribution") -> "Distribution":
+        return convolve(self, other)
+
+    def __neg__(self) -> "Distribution":
+        return Distribution(-self.maximum, self.counts[::-1])
+
+    def mean(self) -> Fraction:
+        return Fraction(
+            sum(value * count for value, count in self.items()), self.total
+        )
+
+    def variance(self) -> Fraction:
+        mean: Fraction = self.mean()
+
+        return Fraction(
+            sum((value - mean) ** 2 * count for value, count in self.items()),
+            self.total,
+        )
+
+    def chance_at_least(self, target: int) -> Fraction:
+        return Fraction(
+            sum(count for value, count in self.items() if value >= target),
+            self.total,
+        )
+
+    def chance_at_most(self, target: int) -> Fraction:
+        return Fraction(
+            sum(count for value, count in self.items() if value <= target),
+            self.total,
+        )
+
+    def percentile(self, percent: int) -> int:
+        """The lowest total rolled at least percent% of the time or less."""
+        cumulative: int = 0
+
+        for value, count in self.items():
+            cumulative += count
+
+            if cumulative * 100 >= percent * self.total:
+                return value
+
+        return self.maximum
+
+
+def convolve(a: Distribution, b: Distribution) -> Distribution:
+    """The distribution of the sum of two independent rolls."""
+    counts: list[int] = [0] * (len(a.counts) + len(b.counts) - 1)
+
+    for i, a_count in enumerate(a.counts):
+        if not a_count:
+            continue
+
+        for j, b_count in enumerate(b.counts):
+            counts[i + j] += a_count * b_count
+
+    return Distribution(a.minimum + b.minimum, tuple(counts))
+
+
+def constant(value: int) -> Distribution:
+    return Distribution(value, (1,))
+
+
+@lru_cache(maxsize=1024)
+def dice(amount: int, sides: int) -> Distribution:
+    """The distribution of the sum of amount dice with the given sides.
+
+    Dice are added one at a time, so the results for fewer dice (which
+    composite expressions tend to share) are cached too.
+    """
+    if amount == 1:
+        return Distribution(1, (1,) * sides)
+
+    rest: Distribution = dice(amount - 1, sides)
+    counts: list[int] = []
+    window: int = 0
+
+    # Adding a die makes each count the sum of the sides counts of the rest
+    # ending at it, which is a window sliding along them (much cheaper than
+    # convolving, with counts this large).
+    for index in range(len(rest.counts) + sides - 1):
+        if index < len(rest.counts):
+            window += rest.counts[index]
+
+        if index >= sides:
+            window -= rest.counts[index - sides]
+
+        counts.append(window)
+
+    return Distribution(rest.minimum + 1, tuple(counts))
+
+
+@lru_cache(maxsize=256)
+def kept_dice(
+    amount: int, sides: int, keep: int, highest: bool
+) -> Distribution:
+    """The distribution of the sum of the highest (or lowest) keep dice out
+    of amount dice with the given sides.
+    """
+    counts: Counter = Counter()
+
+    # Each sorted multiset of rolls stands for as many ordered rolls as its
+    # permutations.
+    for rolls in combinations_with_replacement(range(1, sides + 1), amount):
+        kept: tuple[int, ...] = rolls[-keep:] if highest else rolls[:keep]
+        counts[sum(kept)] += factorial(amount) // prod(
+            factorial(repeats) for repeats in Counter(rolls).values()
+        )
+
+    return Distribution(
+        min(counts),
+        tuple(counts[value] for value in range(min(counts), max(counts) + 1)),
+    )
+
+
+def get_keep_work(amount: int, sides: int) -> int:
+    return comb(amount + sides - 1, amount) * (amount + KEEP_WORK_PER_ROLLS)
+
+
+def get_term_keep_work(match: re.Match) -> int:
+    _, amount, sides, keep_mode, _, _ = match.groups()
+
+    return get_keep_work(int(amount or 1), int(sides)) if keep_mode else 0
+
+
+def parse_term(
+    match: re.Match, keep_work_left: int = MAX_KEEP_WORK
+) -> Distribution:
+    sign, amount, sides, keep_mode, keep, value = match.groups()
+
+    if value is not None:
+        term: Distribution = constant(int(value))
+    else:
+        amount = int(amount or 1)
+        sides = int(sides)
+
+        if not 1 <= amount <= MAX_DICE or not 1 <= sides <= MAX_SIDES:
+            raise ValueError(match.group().strip(" +"))
+
+        if keep_mode:
+            keep = int(keep)
+
+            if (
+                not 1 <= keep <= amount
+                or get_keep_work(amount, sides) > keep_work_left
+            ):
+                raise ValueError(match.group().strip(" +"))
+
+            term = kept_dice(amount, sides, keep, keep_mode.lower() == "kh")
+        else:
+            if amount * (sides - 1) + 1 > MAX_OUTCOMES:
+                raise ValueError(match.group().strip(" +"))
+
+            term = dice(amount, sides)
+
+    return -term if sign == "-" else term
+
+
+@lru_cache(maxsize=256)
+def parse(expression: str) -> Distribution:
+    """Computes the distribution of an expression like 3d6, d20+2 or 4d6kh3.
+
+    Raises ValueError (with the offending part of the expression) if it's
+    invalid or too large to compute.
+    """
+    # A sign is required between terms, so the first one gets one too.
+    expression = expression.strip()
+
+    if not expression:
+        raise ValueError(expression)
+
+    if not expression.startswith(("+", "-")):
+        expression = f"+{expression}"
+
+    result: Distribution = constant(0)
+    position: int = 0
+    # Bounded for the whole expression, or several terms could add up to
+    # more.
+    keep_work: int = 0
+
+    while position < len(expression):
+        match = term_re.match(expression, position)
+
+        if not match:
+            raise ValueError(expression[position:].strip())
+
+        term: Distribution = parse_term(match, MAX_KEEP_WORK - keep_work)
+        keep_work += get_term_keep_work(match)
+        position = match.end()
+
+        # Checked before convolving, as convolving too wide a pair of terms
+        # is what the bound is there to avoid.
+        if len(result.counts) + len(term.counts) - 1 > MAX_OUTCOMES:
+            raise ValueError(expression.lstrip("+"))
+
+        result = result + term
+
+    return result
@@ -0,0 +1,304 @@
+import asyncio
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from discord import Interaction, PartialMessage
+
+from botofspades import background, deferral
+from botofspades.constants import MESSAGE_LIMIT
+
+
+# Discord allows bursts of 5 messages per 5 seconds in a single channel.
+CHANNEL_BURST: int = 5
+CHANNEL_PERIOD: float = 5.0
+COALESCE_WINDOW: float = 0.5
+
+# Lower values are sent first.
+PRIORITY_RESPONSE: int = 0
+PRIORITY_FOLLOWUP: int = 1
+PRIORITY_EDIT: int = 2
+
+
+Sender = Callable[..., Awaitable[Any]]
+
+
+class TokenBucket:
+    def __init__(
+        self, capacity: int, period: float, now: float
+    ) -> None:
+        self.capacity: int = capacity
+        self.tokens: float = capacity
+        self.rate: float = capacity / period
+        self.updated: float = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """How long until a token is available (zero if one already is)."""
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+
+@dataclass(order=True)
+class Job:
+    priority: int
+    seq: int
+    channel_id: int = field(compare=False)
+    send: Sender = field(compare=False)
+    kwargs: dict = field(compare=False)
+    enqueued: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    destination: Optional[Hashable] = field(compare=False, default=None)
+
+
+@dataclass
+class DispatchMetrics:
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    dequeued: int = 0
+    sent: int = 0
+    coalesced: int = 0
+    failed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        self.dequeued += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.dequeued if self.dequeued else 0.0
+
+
+class Dispatcher:
+    """Sends outbound messages respecting per-channel rate limits.
+
+    Senders are the awaitable methods that perform the actual HTTP request
+    (such as ``Interaction.response.send_message``), so any object exposing
+    them, fakes included, can be dispatched through.
+    """
+
+    def __init__(
+        self,
+        burst: int = CHANNEL_BURST,
+        period: float = CHANNEL_PERIOD,
+        coalesce_window: float = COALESCE_WINDOW,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.burst: int = burst
+        self.period: float = period
+        self.coalesce_window: float = coalesce_window
+        self.clock: Callable[[], float] = clock
+        self.metrics: DispatchMetrics = DispatchMetrics()
+
+        self._buckets: dict[int, TokenBucket] = {}
+        self._queues: dict[int, list[Job]] = {}
+        self._last: dict[int, Job] = {}
+        self._seq = count()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    def _get_bucket(self, channel_id: int, now: float) -> TokenBucket:
+        if channel_id not in self._buckets:
+            self._buckets[channel_id] = TokenBucket(
+                self.burst, self.period, now
+            )
+
+        return self._buckets[channel_id]
+
+    def _coalesce(
+        self, channel_id: int, destination: Hashable, content: str, now: float
+    ) -> Optional[Job]:
+        job: Optional[Job] = self._last.get(channel_id)
+
+        if (
+            not job
+            or job.destination != destination
+            or job.future.done()
+            or now - job.enqueued > self.coalesce_window
+            or set(job.kwargs) != {"content"}
+            or len(job.kwargs["content"]) + len(content) + 1 > MESSAGE_LIMIT
+        ):
+            return None
+
+        job.kwargs["content"] += f"\n{content}"
+        self.metrics.coalesced += 1
+
+        return job
+
+    async def submit(
+        self,
+        priority: int,
+        channel_id: int,
+        send: Sender,
+        destination: Optional[Hashable] = None,
+        **kwargs,
+    ) -> Any:
+        """Queues a message and waits until it's been sent.
+
+        Consecutive messages to the same ``destination`` (``None`` disables
+        this) are merged into a single one while they're still queued.
+        """
+        now: float = self.clock()
+
+        if destination is not None and set(kwargs) == {"content"}:
+            job: Optional[Job] = self._coalesce(
+                channel_id, destination, kwargs["content"], now
+            )
+
+            if job:
+                return await asyncio.shield(job.future)
+
+        job = Job(
+            priority,
+            next(self._seq),
+            channel_id,
+            send,
+            kwargs,
+            now,
+            asyncio.get_running_loop().create_future(),
+            destination,
+        )
+
+        heappush(self._queues.setdefault(channel_id, []), job)
+        self._last[channel_id] = job
+
+        self.metrics.queue_depth += 1
+        self.metrics.max_queue_depth = max(
+            self.metrics.max_queue_depth, self.metrics.queue_depth
+        )
+
+        if not self._worker or self._worker.done():
+            self._worker = background.spawn(self._run())
+
+        self._wakeup.set()
+
+        return await asyncio.shield(job.future)
+
+    def _next_job(self, now: float) -> tuple[Optional[Job], Optional[float]]:
+        best: Optional[Job] = None
+        wait: Optional[float] = None
+
+        for channel_id, queue in self._queues.items():
+            # Interaction responses must beat the acknowledgement deadline,
+            # so they never wait on the bucket (they still drain it).
+            delay: float = (
+                0.0
+                if queue[0].priority == PRIORITY_RESPONSE
+                else self._get_bucket(channel_id, now).delay(now)
+            )
+
+            if delay:
+                wait = delay if wait is None else min(wait, delay)
+            elif best is None or queue[0] < best:
+                best = queue[0]
+
+        return best, wait
+
+    async def _run(self) -> None:
+        while True:
+            now: float = self.clock()
+            job, wait = self._next_job(now)
+
+            if not job:
+                self._wakeup.clear()
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            queue: list[Job] = self._queues[job.channel_id]
+            heappop(queue)
+
+            if not queue:
+                del self._queues[job.channel_id]
+
+            if self._last.get(job.channel_id) is job:
+                del self._last[job.channel_id]
+
+            self._get_bucket(job.channel_id, now).take(now)
+
+            self.metrics.queue_depth -= 1
+            self.metrics.record_wait(now - job.enqueued)
+
+            background.spawn(self._deliver(job))
+
+    async def _deliver(self, job: Job) -> None:
+        try:
+            result: Any = await job.send(**job.kwargs)
+        except Exception as e:
+            self.metrics.failed += 1
+            job.future.set_exception(e)
+        else:
+            self.metrics.sent += 1
+            job.future.set_result(result)
+
+
+dispatcher: Dispatcher = Dispatcher()
+
+
+def get_gauges() -> dict[str, float]:
+    return {
+        "dispatch_queue_depth": dispatcher.metrics.queue_depth,
+        "dispatch_max_queue_depth": dispatcher.metrics.max_queue_depth,
+        "dispatch_sent": dispatcher.metrics.sent,
+        "dispatch_coalesced": dispatcher.metrics.coalesced,
+        "dispatch_failed": dispatcher.metrics.failed,
+        "dispatch_mean_wait_seconds": dispatcher.metrics.mean_wait,
+        "dispatch_max_wait_seconds": dispatcher.metrics.max_wait,
+    }
+
+
+async def respond(itr: Interaction, **kwargs) -> Any:
+    if not await deferral.claim_response(itr):
+        return await followup(itr, **kwargs)
+
+    return await dispatcher.submit(
+        PRIORITY_RESPONSE,
+        itr.channel_id or 0,
+        itr.response.send_message,
+        **kwargs,
+    )
+
+
+async def edit_response(itr: Interaction, **kwargs) -> Any:
+    return await dispatcher.submit(
+        PRIORITY_RESPONSE,
+        itr.channel_id or 0,
+        itr.response.edit_message,
+        **kwargs,
+    )
+
+
+async def followup(itr: Interaction, **kwargs) -> Any:
+    # Follow-ups go through the interaction's own webhook, so they can only be
+    # merged with other follow-ups from the same interaction.
+    return await dispatcher.submit(
+        PRIORITY_FOLLOWUP,
+        itr.channel_id or 0,
+        itr.followup.send,
+        destination=("followup", itr.id),
+        **kwargs,
+    )
+
+
+async def message_edit(message: PartialMessage, **kwargs) -> Any:
+    return await dispatcher.submit(
+        PRIORITY_EDIT, message.channel.id, message.edit, **kwargs
+    )
@@ -0,0 +1,155 @@
+from bisect import insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from botofspades.timerwheel import Timer, TimerWheel
+
+
+@dataclass
+class Participant:
+    sheet: str
+    initiative: int
+
+
+@dataclass
+class Effect:
+    id: int
+    name: str
+    sheet: str
+    # Performed on the sheet every interval rounds (effects without a method
+    # only last a while, like a stun).
+    field: str
+    method: str
+    args: tuple[str, ...]
+    interval: int
+    started: int
+    # The round it expires on, or None if it lasts until the encounter ends.
+    expires: Optional[int]
+    timer: Optional[Timer[int]] = None
+
+    def is_due(self, round_number: int) -> bool:
+        return bool(self.method) and not (
+            (round_number - self.started) % self.interval
+        )
+
+    def get_next_round(self, round_number: int) -> int:
+        """The next round it comes up on, to be performed or to expire."""
+        if not self.method:
+            assert self.expires is not None
+            return self.expires
+
+        if self.expires is None:
+            return round_number + self.interval
+
+        return min(round_number + self.interval, self.expires)
+
+
+@dataclass
+class RoundResult:
+    round: int
+    # Effects due this round, by sheet, so each sheet is updated once.
+    due: dict[str, list[Effect]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    expired: list[Effect] = field(default_factory=list)
+
+
+class Encounter:
+    """Initiative order and the effects on combatants, kept in memory.
+
+    Effects are scheduled in a timer wheel ticking once per round, so moving
+    to the next round only touches the effects that come up on it.
+    """
+
+    def __init__(self) -> None:
+        self.order: list[Participant] = []
+        self.effects: dict[int, Effect] = {}
+        self.wheel: TimerWheel[int] = TimerWheel()
+        self.next_effect_id: int = 1
+
+    @property
+    def round(self) -> int:
+        return self.wheel.now
+
+    def join(self, sheet: str, initiative: int) -> None:
+        self.leave(sheet)
+
+        # Ties keep the order combatants joined in.
+        insort(
+            self.order,
+            Participant(sheet, initiative),
+            key=lambda participant: -participant.initiative,
+        )
+
+    def leave(self, sheet: str) -> bool:
+        for participant in self.order:
+            if participant.sheet == sheet:
+                self.order.remove(participant)
+                return True
+
+        return False
+
+    def add_effect(
+        self,
+        name: str,
+        sheet: str,
+        field: str,
+        method: str,
+        args: tuple[str, ...],
+        interval: int,
+        rounds: int,
+    ) -> Effect:
+        """Adds an effect coming up every interval rounds for rounds rounds
+        (or until the encounter ends, if 0).
+
+        Raises ValueError if it would come up further ahead than the wheel
+        reaches.
+        """
+        effect: Effect = Effect(
+            self.next_effect_id,
+            name,
+            sheet,
+            field,
+            method,
+            args,
+            interval,
+            self.round,
+            self.round + rounds if rounds else None,
+        )
+        effect.timer = self.wheel.schedule(
+            effect.get_next_round(self.round) - self.round, effect.id
+        )
+
+        self.effects[effect.id] = effect
+        self.next_effect_id += 1
+
+        return effect
+
+    def remove_effect(self, effect_id: int) -> Optional[Effect]:
+        effect: Optional[Effect] = self.effects.pop(effect_id, None)
+
+        if effect and effect.timer:
+            effect.timer.cancel()
+
+        return effect
+
+    def next_round(self) -> RoundResult:
+        result: RoundResult = RoundResult(self.round + 1)
+
+        for effect_id in self.wheel.advance():
+            effect: Effect = self.effects[effect_id]
+
+            if effect.is_due(result.round):
+                result.due[effect.sheet].append(effect)
+
+            if effect.expires == result.round:
+                del self.effects[effect_id]
+                result.expired.append(effect)
+            else:
+                effect.timer = self.wheel.schedule(
+                    effect.get_next_round(result.round) - result.round,
+                    effect_id,
+                )
+
+        return result
@@ -1,34 +1,178 @@
-from discord import Interaction
+from discord import Intents, Interaction
 from discord.ext import commands
 from discord import app_commands as apc
 
-from botofspades import constants
-from botofspades.bot import bot
+from botofspades import (
+    constants,
+    dispatch,
+    memory,
+    metrics,
+    profiling,
+    watchdog,
+)
 from botofspades.log import extension_loaded, extension_unloaded
-from botofspades.outmsg import botsend, update_defbank
-from botofspades.slash import add_slash_command, remove_slash_command
+from botofspades.outmsg import botsend, botsend_lines, out, update_defbank
+from botofspades.slash import (
+    add_slash_command,
+    remove_slash_command,
+    sync_tree,
+)
 
 
 EXTENSION_NAME: str = "Bot Control"
+INTENTS: Intents = Intents.none()
 
 
 @apc.command()
-async def reload(itr: Interaction) -> None:
-    for ext in constants.DEFAULT_EXTENSIONS:
-        await bot.reload_extension(f"botofspades.extensions.{ext}")
+@apc.describe(
+    force="Reloads everything and syncs the command tree, changed or not."
+)
+async def reload(itr: Interaction, force: bool = False) -> None:
+    # Taken from the interaction rather than imported, so extensions can be
+    # imported before the bot is built (see bot.get_bot_intents).
+    bot: commands.Bot = itr.client  # type: ignore
+    reloaded: list[str] = await bot.reload_changed_exts(force)  # type: ignore
 
-    await bot.tree.sync(guild=constants.TARGET_GUILD)
+    await sync_tree(bot, force)
 
-    update_defbank()
+    update_defbank(force)
 
-    await botsend(itr, "Bot reloaded.")
+    await botsend(
+        itr,
+        "".join(out("EXTENSION_RELOADED", name=ext) for ext in reloaded)
+        if reloaded
+        else out("NO_EXTENSIONS_CHANGED"),
+    )
+
+
+@apc.command(description="Shows command latency and storage metrics.")
+@apc.default_permissions(administrator=True)
+async def stats(itr: Interaction) -> None:
+    lines: list[str] = [
+        out("COMMAND_STATS"),
+        *(metrics.get_stats_lines() or [out("NO_COMMAND_STATS")]),
+        out(
+            "DISPATCH_STATS",
+            **{
+                name.removeprefix("dispatch_"): round(value, 3)
+                for name, value in dispatch.get_gauges().items()
+            },
+        ),
+    ]
+
+    if constants.LOOP_WATCHDOG:
+        lines.append(
+            out(
+                "LOOP_STATS",
+                lag=round(watchdog.stats.lag * 1000),
+                max_lag=round(watchdog.stats.max_lag * 1000),
+                stalls=watchdog.stats.stalls,
+                last_stall=(
+                    watchdog.recent_stalls[-1].culprit
+                    if watchdog.recent_stalls
+                    else "none"
+                ),
+            )
+        )
+
+    await botsend_lines(itr, lines)
+
+
+@apc.command(description="Profiles the bot and shows where time is spent.")
+@apc.describe(
+    max_commands="Stops after this many commands (0 to only use seconds).",
+    seconds="Stops after this many seconds at most.",
+)
+@apc.default_permissions(administrator=True)
+async def profile(
+    itr: Interaction,
+    max_commands: apc.Range[int, 0] = 0,
+    seconds: apc.Range[float, 1.0, constants.MAX_PROFILE_SECONDS] = 30.0,
+) -> None:
+    if profiling.is_running():
+        await botsend(itr, out("PROFILE_RUNNING"))
+        return
+
+    finished: profiling.ProfileSession = await profiling.profile(
+        max_commands, seconds
+    )
+
+    lines: list[str] = [
+        out(
+            "PROFILE_RESULTS",
+            commands=finished.commands,
+            seconds=round(finished.elapsed, 1),
+            path=profiling.write_profile(finished),
+        ),
+        *(
+            out(
+                "PROFILE_ENTRY",
+                function=entry.function,
+                cumulative=round(entry.cumulative * 1000),
+                own=round(entry.own * 1000),
+                calls=entry.calls,
+            )
+            for entry in profiling.get_top_entries(
+                finished, constants.PROFILE_TOP_ENTRIES
+            )
+        ),
+    ]
+
+    await botsend_lines(itr, lines)
+
+
+@apc.command(
+    name="memory", description="Shows memory use and growth by subsystem."
+)
+@apc.default_permissions(administrator=True)
+async def memory_command(itr: Interaction) -> None:
+    report: memory.MemoryReport = await memory.take_report("command")
+
+    lines: list[str] = [
+        out("MEMORY_TOTAL", total=round(report.total / 1_000_000, 1)),
+        *(
+            out(
+                "MEMORY_SUBSYSTEM",
+                name=name,
+                size=round(size / 1000),
+                growth=(
+                    f"{report.subsystem_growth[name] / 1000:+.0f}"
+                    if report.subsystem_growth
+                    else "?"
+                ),
+            )
+            for name, size in report.subsystems.items()
+        ),
+    ]
+
+    if not report.subsystem_growth:
+        lines.append(out("MEMORY_BASELINE"))
+    else:
+        lines.append(out("MEMORY_TOP_GROWTH"))
+        lines.extend(
+            out(
+                "MEMORY_GROWTH",
+                location=growth.location,
+                growth=round(growth.size_diff / 1000),
+                size=round(growth.size / 1000),
+            )
+            for growth in report.top_growth
+        )
+
+    await botsend_lines(itr, lines)
 
 
 async def setup(bot: commands.Bot) -> None:
     add_slash_command(bot, reload)
+    add_slash_command(bot, stats)
+    add_slash_command(bot, profile)
+    add_slash_command(bot, memory_command)
     extension_loaded(EXTENSION_NAME)
 
 
 async def teardown(bot: commands.Bot) -> None:
     remove_slash_command(bot, "reload")
+    remove_slash_command(bot, "stats")
+    remove_slash_command(bot, "profile")
+    remove_slash_command(bot, "memory")
     extension_unloaded(EXTENSION_NAME)
@@ -1,15 +1,24 @@
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator, Optional
 
 from discord.ext import commands
 from discord import app_commands as apc
-from discord import Interaction
+from discord import Intents, Interaction
 
 from utils import get_str_varargs
-from botofspades import unicode
+from botofspades import constants, metrics, unicode
 from botofspades.extensions.charsheets import types
-from botofspades.log import extension_loaded, extension_unloaded
-from botofspades.outmsg import out, botsend, send, Emoji
+from botofspades.extensions.charsheets.cache import (
+    Version,
+    get_version,
+    render_cache,
+)
+from botofspades.extensions.charsheets.live import live_views
+from botofspades.deferral import checkpoint
+from botofspades.log import extension_loaded, extension_unloaded, logger
+from botofspades.outmsg import out, botsend, botsend_lines, send, Emoji
+from botofspades.pagination import pack_code_block, send_pages
 from botofspades.jsonwrappers import (
     JSONFileWrapperReadOnly,
     JSONFileWrapperUpdate
@@ -18,6 +27,7 @@ from botofspades.slash import add_slash_command, remove_slash_command
 
 
 EXTENSION_NAME: str = "Charsheets"
+INTENTS: Intents = Intents.none()
 
 base_dir: Path = Path.cwd() / "charsheets"
 templates_dir: Path = base_dir / "templates"
@@ -30,6 +40,7 @@ FIELD_TYPES: dict[str, type[types.Field]] = {
     "lever": types.Lever,
     "scroll": types.Scroll,
     "gauge": types.Gauge,
+    "ledger": types.Ledger,
 }
 
 
@@ -46,7 +57,9 @@ def get_all_template_paths():
 
 
 def get_all_sheet_paths():
-    return charsheets_dir.glob("*.json")
+    for path in charsheets_dir.glob("*.json"):
+        metrics.count_storage("sheets_scanned")
+        yield path
 
 
 def get_template_sheet_str(template: str, sheet: str) -> str:
@@ -77,6 +90,194 @@ def get_sheet_str(name: str, template: str) -> str:
     return f"**{name.title()}** (from **{template.title()}**)"
 
 
+def get_template_version(name: str) -> Optional[Version]:
+    return get_version("template", name, get_template_path(name))
+
+
+def get_sheet_version(name: str) -> Optional[Version]:
+    return get_version("sheet", name, get_sheet_path(name))
+
+
+def get_sheet_list_lines(template: str = "") -> Iterator[str]:
+    # Lines may be pulled long after the first (as pages are turned), so the
+    # sheets are listed up front and those gone since are skipped.
+    sheet_paths: list[Path] = list(get_all_sheet_paths())
+
+    for sheet_path in sheet_paths:
+        try:
+            with JSONFileWrapperReadOnly(sheet_path) as sheet:
+                sheet_template: str = sheet["template"]
+        except FileNotFoundError:
+            continue
+
+        if not template or sheet_template == template:
+            yield f"- {get_sheet_str(sheet_path.stem, sheet_template)}\n"
+
+
+async def create_sheet(
+    sheet_name: str,
+    template_name: str,
+    values: Optional[dict[str, Any]] = None,
+) -> None:
+    """Creates a sheet from a template, with values replacing the defaults of
+    the fields they name (others are ignored). Values are read from their
+    text, as if they had been typed in.
+
+    Raises FileNotFoundError if the template doesn't exist, FileExistsError if
+    the sheet does, and ValueError (with the field's name) if a value isn't
+    valid for its field's type.
+    """
+    sheet_path: Path = get_sheet_path(sheet_name)
+
+    with JSONFileWrapperReadOnly(get_template_path(template_name)) as template:
+        fields: dict[str, Any] = {
+            name: field["default"]
+            for name, field in template["fields"].items()
+        }
+
+        for name, value in (values or {}).items():
+            if name not in fields:
+                continue
+
+            field_type: type[types.Field] = FIELD_TYPES[
+                template["fields"][name]["type"]
+            ]
+
+            if not field_type.validate(str(value)):
+                raise ValueError(name)
+
+            fields[name] = field_type.from_str(str(value))
+
+    sheet_path.touch(exist_ok=False)
+
+    async with JSONFileWrapperUpdate(sheet_path) as sheet:
+        sheet["template"] = template_name
+        sheet["fields"] = fields
+
+    render_cache.invalidate_sheet(sheet_name)
+
+
+def remove_sheet(sheet_name: str) -> None:
+    """Raises FileNotFoundError if the sheet doesn't exist."""
+    get_sheet_path(sheet_name).unlink()
+    render_cache.invalidate_sheet(sheet_name)
+
+
+def get_sheet_fields(sheet_name: str) -> dict[str, Any]:
+    """Raises FileNotFoundError if the sheet doesn't exist."""
+    with JSONFileWrapperReadOnly(get_sheet_path(sheet_name)) as sheet:
+        return sheet["fields"]
+
+
+def get_field_method(
+    sheet_name: str, field_name: str, method_name: str
+) -> tuple[Any, Callable[[Any, types.Args], Any]]:
+    """Returns a sheet field's value and one of its type's methods.
+
+    Raises FileNotFoundError if the sheet or its template doesn't exist,
+    KeyError if the field doesn't and AttributeError if the method doesn't.
+    """
+    with JSONFileWrapperReadOnly(get_sheet_path(sheet_name)) as sheet:
+        with JSONFileWrapperReadOnly(
+            get_template_path(sheet["template"])
+        ) as template:
+            if field_name not in sheet["fields"]:
+                raise KeyError(field_name)
+
+            return sheet["fields"][field_name], getattr(
+                FIELD_TYPES[template["fields"][field_name]["type"]],
+                f"method_{method_name}",
+            )
+
+
+async def do_field_methods(
+    sheet_name: str, methods: list[tuple[str, str, types.Args]]
+) -> list[Optional[tuple[str, str]]]:
+    """Performs methods (as field, method and args) on a sheet's fields in
+    order, in a single update. Returns the old and new values (as text) for
+    each, or None for those that couldn't be performed.
+
+    Raises FileNotFoundError if the sheet or its template doesn't exist.
+    """
+    results: list[Optional[tuple[str, str]]] = []
+
+    async with JSONFileWrapperUpdate(get_sheet_path(sheet_name)) as sheet:
+        with JSONFileWrapperReadOnly(
+            get_template_path(sheet["template"])
+        ) as template:
+            for field_name, method_name, args in methods:
+                field: Optional[dict] = template["fields"].get(field_name)
+                old_value: Any = sheet["fields"].get(field_name)
+                field_type: Optional[type[types.Field]] = (
+                    FIELD_TYPES[field["type"]] if field else None
+                )
+                method = getattr(field_type, f"method_{method_name}", None)
+
+                if not field_type or not method or old_value is None:
+                    results.append(None)
+                    continue
+
+                # Taken first, as some methods change the value in place.
+                old_str: str = field_type.to_str(old_value)
+
+                try:
+                    new_value: Any = method(old_value, args)
+                except (TypeError, ValueError, ArithmeticError):
+                    results.append(None)
+                    continue
+
+                sheet["fields"][field_name] = new_value
+                results.append((old_str, field_type.to_str(new_value)))
+
+    render_cache.invalidate_sheet(sheet_name)
+
+    return results
+
+
+def get_sheet_lines(sheet_name: str) -> tuple[str, ...]:
+    """Renders a sheet's fields, raising FileNotFoundError if it (or its
+    template) doesn't exist.
+    """
+    sheet_version: Optional[Version] = get_sheet_version(sheet_name)
+    lines: Optional[tuple[str, ...]] = render_cache.get(
+        "get", sheet_name, sheet_version, get_template_version
+    )
+
+    if lines:
+        return lines
+
+    with JSONFileWrapperReadOnly(get_sheet_path(sheet_name)) as sheet:
+        template_version: Optional[Version] = get_template_version(
+            sheet["template"]
+        )
+
+        with JSONFileWrapperReadOnly(
+            get_template_path(sheet["template"])
+        ) as template:
+            lines = (
+                f"{Emoji.CS_CHARACTER} *{sheet_name.title()}*\n",
+                "\n",
+            ) + tuple(
+                f"**{name.title()}** :  "
+                + FIELD_TYPES[
+                    template["fields"][name]["type"]
+                ].to_str(value)
+                + "\n"
+                for name, value in sheet["fields"].items()
+            )
+
+        render_cache.put(
+            "get",
+            sheet_name,
+            sheet["template"],
+            sheet_version,
+            template_version,
+            lines,
+        )
+
+    return lines
+
+
 async def _update_field(
     itr: Interaction,
     sheet_name: str,
@@ -84,35 +285,86 @@ async def _update_field(
     sheet_path: Path,
     value: str,
 ) -> None:
-    with JSONFileWrapperUpdate(sheet_path) as sheet:
+    # Sent once the update's done, so the sheet isn't locked meanwhile.
+    reply: str
+
+    async with JSONFileWrapperUpdate(sheet_path) as sheet:
         template_path: Path = get_template_path(sheet["template"])
 
         if not template_path.exists():
-            await send(
-                itr, "TEMPLATE_NOT_FOUND", name=sheet["template"].title()
-            )
-            return
+            reply = out("TEMPLATE_NOT_FOUND", name=sheet["template"].title())
+        else:
+            with JSONFileWrapperReadOnly(template_path) as template:
+                type_name: str = template["fields"][field_name]["type"]
 
-        with JSONFileWrapperReadOnly(template_path) as template:
-            type_name: str = template["fields"][field_name]["type"]
+                try:
+                    new_value: Any = FIELD_TYPES[type_name].from_str(value)
+                    sheet["fields"][field_name] = new_value
 
-            try:
-                new_value: Any = FIELD_TYPES[type_name].from_str(value)
-                sheet["fields"][field_name] = new_value
+                    reply = out(
+                        "FIELD_VALUE_SET",
+                        field=get_sheet_field_sig_str(sheet_name, field_name),
+                        value=FIELD_TYPES[type_name].to_str(new_value),
+                    )
+                except:
+                    reply = out(
+                        "INVALID_FIELD_VALUE",
+                        value=value,
+                        type=type_name.title(),
+                    )
 
-                await send(
-                    itr,
-                    "FIELD_VALUE_SET",
-                    field=get_sheet_field_sig_str(sheet_name, field_name),
-                    value=FIELD_TYPES[type_name].to_str(new_value),
-                )
-            except:
-                await send(
-                    itr,
-                    "INVALID_FIELD_VALUE",
-                    value=value,
-                    type=type_name.title(),
-                )
+    render_cache.invalidate_sheet(sheet_name)
+    await botsend(itr, reply)
+
+
+def _do_field_method(
+    sheet: dict,
+    sheet_name: str,
+    field_name: str,
+    method_name: str,
+    args: str,
+) -> str:
+    """Performs a method on a sheet's field, returning the reply."""
+    if field_name not in sheet["fields"]:
+        return out("FIELD_NOT_FOUND", name=field_name.title())
+
+    if sheet["fields"][field_name] is None:
+        return out("NULL_FIELD", name=field_name.title())
+
+    template_path: Path = get_template_path(sheet["template"])
+
+    if not template_path.exists():
+        return out("TEMPLATE_NOT_FOUND", name=sheet["template"].title())
+
+    with JSONFileWrapperReadOnly(template_path) as template:
+        method = getattr(
+            FIELD_TYPES[template["fields"][field_name]["type"]],
+            f"method_{method_name}",
+            None,
+        )
+
+        if not method:
+            return out("METHOD_NOT_FOUND", name=method_name.title())
+
+        field_type: type[types.Field] = FIELD_TYPES[
+            template["fields"][field_name]["type"]
+        ]
+
+        # Taken first, as some methods change the value in place.
+        old_str: str = field_type.to_str(sheet["fields"][field_name])
+
+        sheet["fields"][field_name] = method(
+            sheet["fields"][field_name], get_str_varargs(args))
+
+        return out(
+            "SHEET_FIELD_UPDATED",
+            field=get_sheet_field_sig_str(
+                sheet_name,
+                field_name,
+            ),
+            old=old_str,
+            new=field_type.to_str(sheet["fields"][field_name])
+        )
 
 
 class Charsheets(apc.Group): ...
@@ -127,9 +379,10 @@ class Template(apc.Group):
         try:
             template_path.touch(exist_ok=False)
 
-            with JSONFileWrapperUpdate(template_path) as template:
+            async with JSONFileWrapperUpdate(template_path) as template:
                 template["fields"] = {}
 
+            render_cache.invalidate_template(name)
             await send(itr, "TEMPLATE_CREATED", name=name.title())
         except FileExistsError:
             await send(itr, "TEMPLATE_ALREADY_EXISTS", name=name.title())
@@ -153,6 +406,8 @@ class Template(apc.Group):
 
         sheets_changed: int = 0
         for path in get_all_sheet_paths():
+            await checkpoint(itr)
+
             with JSONFileWrapperReadOnly(path) as sheet:
                 if sheet["template"] not in name_list:
                     continue
@@ -160,6 +415,9 @@ class Template(apc.Group):
             path.unlink()
             sheets_changed += 1
 
+        for name in name_list:
+            render_cache.invalidate_template(name)
+
         if sheets_changed:
             output_msg += out("SHEETS_REMOVED", amount=sheets_changed)
 
@@ -190,11 +448,15 @@ class Template(apc.Group):
 
         sheets_changed: int = 0
         for path in get_all_sheet_paths():
-            with JSONFileWrapperUpdate(path) as sheet:
+            await checkpoint(itr)
+
+            async with JSONFileWrapperUpdate(path) as sheet:
                 if sheet["template"] == old_name:
                     sheet["template"] = new_name
                     sheets_changed += 1
 
+        render_cache.invalidate_template(old_name)
+
         output_msg: str = out(
             "TEMPLATE_RENAMED", old=old_name.title(), new=new_name.title()
         ) + (
@@ -265,38 +527,45 @@ class Template(apc.Group):
 
             default_value = FIELD_TYPES[type_name].from_str(default)
 
+        # Sent once the update's done, so the template isn't locked meanwhile.
+        error: str = ""
         output_msg: str = ""
-        with JSONFileWrapperUpdate(template_path) as template:
+        async with JSONFileWrapperUpdate(template_path) as template:
             if field_name in template["fields"]:
-                await send(
-                    itr, "FIELD_ALREADY_EXISTS", name=field_name.title()
+                error = out("FIELD_ALREADY_EXISTS", name=field_name.title())
+            else:
+                template["fields"][field_name] = {
+                    "type": type_name,
+                    "default": default_value,
+                }
+
+                output_msg += out(
+                    "FIELD_ADDED",
+                    field=get_template_field_str(
+                        template_name,
+                        field_name,
+                        type_name,
+                        FIELD_TYPES[type_name].to_str(default_value)
+                        if default_value else ""
+                    ),
+                    template=template_name.title(),
                 )
-                return
 
-            template["fields"][field_name] = {
-                "type": type_name,
-                "default": default_value,
-            }
-
-            output_msg += out(
-                "FIELD_ADDED",
-                field=get_template_field_str(
-                    template_name,
-                    field_name,
-                    type_name,
-                    FIELD_TYPES[type_name].to_str(default_value)
-                    if default_value else ""
-                ),
-                template=template_name.title(),
-            )
+        if error:
+            await botsend(itr, error)
+            return
 
         sheets_changed: int = 0
         for path in get_all_sheet_paths():
-            with JSONFileWrapperUpdate(path) as sheet:
+            await checkpoint(itr)
+
+            async with JSONFileWrapperUpdate(path) as sheet:
                 if sheet["template"] == template_name:
                     sheet["fields"][field_name] = default_value
                     sheets_changed += 1
 
+        render_cache.invalidate_template(template_name)
+
         if sheets_changed:
             output_msg += out("SHEETS_UPDATED", amount=sheets_changed)
 
@@ -322,7 +591,7 @@ class Template(apc.Group):
         ]
 
         output_msg: str = ""
-        with JSONFileWrapperUpdate(template_path) as template:
+        async with JSONFileWrapperUpdate(template_path) as template:
             for field_name in field_list.copy():
                 if field_name not in template["fields"]:
                     output_msg += out(
@@ -350,13 +619,17 @@ class Template(apc.Group):
 
         sheets_changed: int = 0
         for path in get_all_sheet_paths():
-            with JSONFileWrapperUpdate(path) as sheet:
+            await checkpoint(itr)
+
+            async with JSONFileWrapperUpdate(path) as sheet:
                 if sheet["template"] == template_name:
                     for field_name in field_list:
                         del sheet["fields"][field_name]
 
                     sheets_changed += 1
 
+        render_cache.invalidate_template(template_name)
+
         if sheets_changed:
             output_msg += out("SHEETS_UPDATED", amount=sheets_changed)
 
@@ -380,36 +653,41 @@ class Template(apc.Group):
             await send(itr, "TEMPLATE_NOT_FOUND", name=template_name.title())
             return
 
+        # Sent once the update's done, so the template isn't locked meanwhile.
+        error: str = ""
         output_msg: str = ""
-        with JSONFileWrapperUpdate(template_path) as template:
+        async with JSONFileWrapperUpdate(template_path) as template:
             if not old_name in template["fields"]:
-                await send(itr, "FIELD_NOT_FOUND", name=old_name.title())
-                return
+                error = out("FIELD_NOT_FOUND", name=old_name.title())
+            elif new_name in template["fields"]:
+                error = out("FIELD_ALREADY_EXISTS", name=new_name.title())
+            else:
+                field: dict = template["fields"][old_name]
+                del template["fields"][old_name]
+                template["fields"][new_name] = field
 
-            if new_name in template["fields"]:
-                await send(itr, "FIELD_ALREADY_EXISTS", name=new_name.title())
-                return
+                output_msg += out(
+                    "FIELD_RENAMED",
+                    field=get_template_field_str(
+                        template_name,
+                        old_name,
+                        template["fields"][new_name]["type"],
+                        FIELD_TYPES[
+                            template["fields"][new_name]["type"]
+                        ].to_str(template["fields"][new_name]["default"])
+                    ),
+                    new=new_name.title(),
+                )
 
-            field: dict = template["fields"][old_name]
-            del template["fields"][old_name]
-            template[new_name] = field
-
-            output_msg += out(
-                "FIELD_RENAMED",
-                field=get_template_field_str(
-                    template_name,
-                    old_name,
-                    template["fields"][new_name]["type"],
-                    FIELD_TYPES[
-                        template["fields"][new_name]["type"]
-                    ].to_str(template["fields"][new_name]["default"])
-                ),
-                new=new_name.title(),
-            )
+        if error:
+            await botsend(itr, error)
+            return
 
         sheets_changed: int = 0
         for path in get_all_sheet_paths():
-            with JSONFileWrapperUpdate(path) as sheet:
+            await checkpoint(itr)
+
+            async with JSONFileWrapperUpdate(path) as sheet:
                 if sheet["template"] == template_name:
                     field: dict = sheet["fields"][old_name]
                     del sheet["fields"][old_name]
@@ -417,6 +695,8 @@ class Template(apc.Group):
 
                     sheets_changed += 1
 
+        render_cache.invalidate_template(template_name)
+
         if sheets_changed:
             output_msg += out("SHEETS_UPDATED", amount=sheets_changed)
 
@@ -432,9 +712,8 @@ class Template(apc.Group):
         template_name = template_name.lower()
         type_name = type_name.lower()
 
-        # TODO: Add this as an outdef.
         if type_name != "any" and type_name not in FIELD_TYPES:
-            await botsend(itr, f"Invalid type **{type_name}**.")
+            await send(itr, "INVALID_FIELD_TYPE", type=type_name.title())
             return
 
         template_path: Path = get_template_path(template_name)
@@ -508,40 +787,51 @@ class Template(apc.Group):
                     type=type_name.title(),
                 )
 
-                print(e)
+                logger.debug(
+                    f"Invalid {type_name} default {default!r}: {e!r}"
+                )
                 return
 
+        # Sent once the update's done, so the template isn't locked meanwhile.
+        error: str = ""
         output_msg: str = ""
-        with JSONFileWrapperUpdate(template_path) as template:
+        async with JSONFileWrapperUpdate(template_path) as template:
             if field_name not in template["fields"]:
-                await send(itr, "FIELD_NOT_FOUND", name=field_name.title())
-                return
+                error = out("FIELD_NOT_FOUND", name=field_name.title())
+            else:
+                template["fields"][field_name] = {
+                    "type": type_name,
+                    "default": default_value,
+                }
 
-            template["fields"][field_name] = {
-                "type": type_name,
-                "default": default_value,
-            }
-
-            output_msg += out(
-                "TEMPLATE_FIELD_UPDATED",
-                field=field_name.title(),
-                new=get_template_field_str(
-                    template_name,
-                    field_name,
-                    template["fields"][field_name]["type"],
-                    FIELD_TYPES[
-                        template["fields"][field_name]["type"]
-                    ].to_str(template["fields"][field_name]["default"])
-                ),
-            )
+                output_msg += out(
+                    "TEMPLATE_FIELD_UPDATED",
+                    field=field_name.title(),
+                    new=get_template_field_str(
+                        template_name,
+                        field_name,
+                        template["fields"][field_name]["type"],
+                        FIELD_TYPES[
+                            template["fields"][field_name]["type"]
+                        ].to_str(template["fields"][field_name]["default"])
+                    ),
+                )
+
+        if error:
+            await botsend(itr, error)
+            return
 
         sheets_changed: int = 0
         for path in get_all_sheet_paths():
-            with JSONFileWrapperUpdate(path) as sheet:
+            await checkpoint(itr)
+
+            async with JSONFileWrapperUpdate(path) as sheet:
                 if sheet["template"] == template_name:
                     sheet["fields"][field_name] = default_value
                     sheets_changed += 1
 
+        render_cache.invalidate_template(template_name)
+
         if sheets_changed:
             output_msg += out("SHEETS_UPDATED", amount=sheets_changed)
 
@@ -558,42 +848,25 @@ class Sheet(apc.Group):
         sheet_name = sheet_name.lower()
         template_name = template_name.lower()
 
-        template_path: Path = get_template_path(template_name)
-
-        if not template_path.exists():
-            await send(itr, "TEMPLATE_NOT_FOUND", name=template_name.title())
-            return
-
-        sheet_path: Path = get_sheet_path(sheet_name)
-
         try:
-            sheet_path.touch()
-            with (
-                JSONFileWrapperReadOnly(template_path) as template,
-                JSONFileWrapperUpdate(sheet_path) as sheet,
-            ):
-                sheet["template"] = template_name
-                sheet["fields"] = {
-                    field: template["fields"][field]["default"]
-                    for field in template["fields"]
-                }
-
+            await create_sheet(sheet_name, template_name)
+        except FileNotFoundError:
+            await send(itr, "TEMPLATE_NOT_FOUND", name=template_name.title())
+        except FileExistsError:
+            await send(itr, "SHEET_ALREADY_EXISTS", name=sheet_name.title())
+        else:
             await send(
                 itr,
                 "SHEET_CREATED",
                 name=get_template_sheet_str(template_name, sheet_name),
             )
-        except FileExistsError:
-            await send(itr, "SHEET_ALREADY_EXISTS", name=sheet_name.title())
 
     @apc.command(description="Deletes a sheet.")
     async def remove(self, itr: Interaction, names: str) -> None:
         output_msg: str = ""
         for name in [name.lower() for name in get_str_varargs(names)]:
-            sheet_path: Path = get_sheet_path(name)
-
             try:
-                sheet_path.unlink()
+                remove_sheet(name)
                 output_msg += out("SHEET_REMOVED", name=name.title())
             except FileNotFoundError:
                 output_msg += out("SHEET_NOT_FOUND", name=name.title())
@@ -623,6 +896,9 @@ class Sheet(apc.Group):
             return
 
         old_path.rename(new_path)
+        render_cache.invalidate_sheet(old_name)
+        render_cache.invalidate_sheet(new_name)
+
         await send(
             itr,
             "SHEET_RENAMED",
@@ -642,24 +918,27 @@ class Sheet(apc.Group):
             await send(itr, "TEMPLATE_NOT_FOUND", name=template.title())
             return
 
-        sheet_list: list[str] = []
-        for sheet_path in get_all_sheet_paths():
-            with JSONFileWrapperReadOnly(sheet_path) as sheet:
-                if not template or sheet["template"] == template:
-                    sheet_list.append(
-                        get_sheet_str(sheet_path.stem, sheet["template"])
-                    )
+        sheet_lines: Iterator[str] = get_sheet_list_lines(template)
+        first_line: Optional[str] = next(sheet_lines, None)
 
-        await botsend(
+        if first_line is None:
+            await send(itr, "NO_SHEETS_AVAILABLE")
+            return
+
+        await botsend_lines(
             itr,
-            out(
-                "AVAILABLE_SHEETS",
-                separator="",
-                templates="".join([f"\n- {sheet}" for sheet in sheet_list]),
-                finaldot="",
-            )
-            if sheet_list
-            else out("NO_SHEETS_AVAILABLE")
+            chain(
+                [
+                    out(
+                        "AVAILABLE_SHEETS",
+                        separator="",
+                        templates="",
+                        finaldot="",
+                    ),
+                    first_line,
+                ],
+                sheet_lines,
+            ),
         )
 
     @apc.command(description="Converts a sheet to text.")
@@ -672,27 +951,57 @@ class Sheet(apc.Group):
             await send(itr, "SHEET_NOT_FOUND", name=name.title())
             return
 
-        output_msg: str = f"```\n{name.upper()}\n"
+        sheet_version: Optional[Version] = get_sheet_version(name)
+        lines: Optional[tuple[str, ...]] = render_cache.get(
+            "totext", name, sheet_version, get_template_version
+        )
+
+        if lines:
+            await send_pages(itr, pack_code_block(lines))
+            return
+
+        # Replies are sent once the files are closed, so they aren't locked
+        # meanwhile.
+        missing_template: str = ""
+
         with JSONFileWrapperReadOnly(sheet_path) as sheet:
             template_path: Path = get_template_path(sheet["template"])
 
             if not template_path.exists():
-                await send(
-                    itr, "TEMPLATE_NOT_FOUND", name=sheet["template"].title()
+                missing_template = sheet["template"]
+            else:
+                template_version: Optional[Version] = get_template_version(
+                    sheet["template"]
                 )
-                return
 
-            with JSONFileWrapperReadOnly(template_path) as template:
-                for field in sheet["fields"]:
-                    type: str = template["fields"][field]["type"]
-                    output_msg += (
-                        f"{4 * ' '}{field.title()} ({type.title()}) is "
-                        f"{FIELD_TYPES[type].to_str(sheet['fields'][field])}\n"
-                    )
+                field_lines: list[str] = [f"{name.upper()}\n"]
+                with JSONFileWrapperReadOnly(template_path) as template:
+                    for field, value in sheet["fields"].items():
+                        type: str = template["fields"][field]["type"]
+                        field_lines.append(
+                            f"{4 * ' '}{field.title()} ({type.title()}) is "
+                            f"{FIELD_TYPES[type].to_str(value)}\n"
+                        )
+
+                lines = tuple(field_lines)
+
+                render_cache.put(
+                    "totext",
+                    name,
+                    sheet["template"],
+                    sheet_version,
+                    template_version,
+                    lines,
+                )
 
-        output_msg += "```"
+        if missing_template:
+            await send(
+                itr, "TEMPLATE_NOT_FOUND", name=missing_template.title()
+            )
+            return
 
-        await botsend(itr, output_msg)
+        assert lines
+        await send_pages(itr, pack_code_block(lines))
 
     @apc.command(description="Inspects a sheet field or changes its value.")
     async def field(
@@ -717,20 +1026,22 @@ class Sheet(apc.Group):
             )
             return
 
-        with JSONFileWrapperReadOnly(sheet_path) as sheet:
-            if field_name not in sheet["fields"]:
-                await send(itr, "FIELD_NOT_FOUND", name=field_name.title())
-                return
+        # Read first, so the sheet isn't locked while replying.
+        fields: dict[str, Any] = get_sheet_fields(sheet_name)
 
-            await send(
-                itr,
-                "FIELD_VALUE",
-                field_str=get_sheet_field_str(
-                    sheet_name,
-                    field_name,
-                    sheet["fields"][field_name]
-                ),
-            )
+        if field_name not in fields:
+            await send(itr, "FIELD_NOT_FOUND", name=field_name.title())
+            return
+
+        await send(
+            itr,
+            "FIELD_VALUE",
+            field_str=get_sheet_field_str(
+                sheet_name,
+                field_name,
+                fields[field_name]
+            ),
+        )
 
     @apc.command(description="Performs a method on a sheet field.")
     async def do(
@@ -751,80 +1062,30 @@ class Sheet(apc.Group):
             await send(itr, "SHEET_NOT_FOUND", name=sheet_name.title())
             return
 
-        with JSONFileWrapperUpdate(sheet_path) as sheet:
-            if field_name not in sheet["fields"]:
-                await send(itr, "FIELD_NOT_FOUND", name=field_name.title())
-                return
-
-            if sheet["fields"][field_name] is None:
-                await send(itr, "NULL_FIELD", name=field_name.title())
-                return
-
-            template_path: Path = get_template_path(sheet["template"])
-
-            if not template_path.exists():
-                await send(
-                    itr, "TEMPLATE_NOT_FOUND", name=sheet["template"].title()
-                )
-                return
-
-            with JSONFileWrapperReadOnly(template_path) as template:
-                method = getattr(
-                    FIELD_TYPES[template["fields"][field_name]["type"]],
-                    f"method_{method_name}",
-                    None,
-                )
-
-                if not method:
-                    await send(
-                        itr, "METHOD_NOT_FOUND", name=method_name.title()
-                    )
-                    return
-
-                old_value: Any = sheet["fields"][field_name]
-
-                sheet["fields"][field_name] = method(
-                    old_value, get_str_varargs(args))
+        # Sent once the update's done, so the sheet isn't locked meanwhile.
+        async with JSONFileWrapperUpdate(sheet_path) as sheet:
+            reply: str = _do_field_method(
+                sheet, sheet_name, field_name, method_name, args
+            )
 
-                await send(
-                    itr,
-                    "SHEET_FIELD_UPDATED",
-                    field=get_sheet_field_sig_str(
-                        sheet_name,
-                        field_name,
-                    ),
-                    old=FIELD_TYPES[
-                        template["fields"][field_name]["type"]
-                    ].to_str(old_value),
-                    new=FIELD_TYPES[
-                        template["fields"][field_name]["type"]
-                    ].to_str(sheet["fields"][field_name])
-                )
+        render_cache.invalidate_sheet(sheet_name)
+        await botsend(itr, reply)
 
     @apc.command(description="Shows the sheet's fields in an embed.")
-    async def get(self, itr: Interaction, sheet_name: str):
+    @apc.describe(live="Keeps the embed updated as the sheet changes.")
+    async def get(self, itr: Interaction, sheet_name: str, live: bool = False):
         sheet_name = sheet_name.lower()
 
-        sheet_path: Path = get_sheet_path(sheet_name)
-
-        if not sheet_path.exists():
-            await send(itr, "FIELD_NOT_FOUND", name=sheet_name.title())
+        if not get_sheet_path(sheet_name).exists():
+            await send(itr, "SHEET_NOT_FOUND", name=sheet_name.title())
+            return
 
-        output_msg: str = f"{Emoji.CS_CHARACTER} *{sheet_name.title()}*\n\n"
-        with JSONFileWrapperReadOnly(sheet_path) as sheet:
-            with JSONFileWrapperReadOnly(
-                get_template_path(sheet["template"])
-            ) as template:
-                for name, value in sheet["fields"].items():
-                    output_msg += (
-                        f"**{name.title()}** :  "
-                        + FIELD_TYPES[
-                            template["fields"][name]["type"]
-                        ].to_str(value)
-                        + "\n"
-                    )
+        lines: tuple[str, ...] = get_sheet_lines(sheet_name)
 
-        await botsend(itr, output_msg)
+        if live:
+            await live_views.pin(itr, sheet_name, lines)
+        else:
+            await botsend_lines(itr, lines)
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -833,11 +1094,17 @@ async def setup(bot: commands.Bot) -> None:
     charsheets.add_command(Sheet())
 
     add_slash_command(bot, charsheets)
+    # Shard processes also write the sheets, and their changes aren't
+    # published to this one.
+    live_views.start(
+        bot, get_sheet_lines, poll=constants.SHARD_IDS is not None
+    )
     extension_loaded(EXTENSION_NAME)
 
 
 async def teardown(bot: commands.Bot) -> None:
     remove_slash_command(bot, "charsheets")
+    live_views.stop()
     extension_unloaded(EXTENSION_NAME)
 
 
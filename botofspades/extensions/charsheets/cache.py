@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from botofspades import changes, registry
+
+
+# Characters of rendered output kept across all entries.
+RENDER_CACHE_BUDGET: int = 4_000_000
+
+
+# (generation, modification time in ns, size in bytes). The generation is
+# bumped on every write made through the bot (which is also published to the
+# change feed), the rest catches anything else.
+Version = tuple[int, int, int]
+
+generations: dict[tuple[str, str], int] = registry.get_state(
+    "charsheets.generations", dict
+)
+
+
+def get_version(kind: str, name: str, path: Path) -> Optional[Version]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    return (generations.get((kind, name), 0), stat.st_mtime_ns, stat.st_size)
+
+
+def bump(kind: str, name: str) -> None:
+    generations[(kind, name)] = generations.get((kind, name), 0) + 1
+    changes.feed.publish(kind, name)
+
+
+@dataclass
+class Render:
+    template: str
+    sheet_version: Version
+    template_version: Version
+    lines: tuple[str, ...]
+    size: int
+
+
+class RenderCache:
+    """LRU cache of rendered sheets, keyed by view and sheet name."""
+
+    def __init__(self, budget: int = RENDER_CACHE_BUDGET) -> None:
+        self.budget: int = budget
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._renders: OrderedDict[tuple[str, str], Render] = OrderedDict()
+        self._by_sheet: dict[str, set[tuple[str, str]]] = {}
+        self._by_template: dict[str, set[tuple[str, str]]] = {}
+
+    def get(
+        self,
+        view: str,
+        sheet: str,
+        sheet_version: Optional[Version],
+        template_version_of: Callable[[str], Optional[Version]],
+    ) -> Optional[tuple[str, ...]]:
+        """Returns the cached lines if both versions still match.
+
+        ``template_version_of`` maps a template name to its current version,
+        since which template a sheet uses is only known once it's cached.
+        """
+        render: Optional[Render] = self._renders.get((view, sheet))
+
+        if (
+            render
+            and render.sheet_version == sheet_version
+            and render.template_version == template_version_of(render.template)
+        ):
+            self._renders.move_to_end((view, sheet))
+            self.hits += 1
+            return render.lines
+
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        view: str,
+        sheet: str,
+        template: str,
+        sheet_version: Optional[Version],
+        template_version: Optional[Version],
+        lines: tuple[str, ...],
+    ) -> None:
+        if sheet_version is None or template_version is None:
+            return
+
+        self._discard((view, sheet))
+
+        render: Render = Render(
+            template,
+            sheet_version,
+            template_version,
+            lines,
+            sum(len(line) for line in lines),
+        )
+
+        if render.size > self.budget:
+            return
+
+        self._renders[(view, sheet)] = render
+        self._by_sheet.setdefault(sheet, set()).add((view, sheet))
+        self._by_template.setdefault(template, set()).add((view, sheet))
+        self.size += render.size
+
+        while self.size > self.budget:
+            self._discard(next(iter(self._renders)))
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        render: Optional[Render] = self._renders.pop(key, None)
+
+        if not render:
+            return
+
+        self.size -= render.size
+        self._by_sheet[key[1]].discard(key)
+        self._by_template[render.template].discard(key)
+
+        if not self._by_sheet[key[1]]:
+            del self._by_sheet[key[1]]
+
+        if not self._by_template[render.template]:
+            del self._by_template[render.template]
+
+    def invalidate_sheet(self, sheet: str) -> None:
+        bump("sheet", sheet)
+
+        for key in self._by_sheet.get(sheet, set()).copy():
+            self._discard(key)
+
+    def invalidate_template(self, template: str) -> None:
+        bump("template", template)
+
+        for key in self._by_template.get(template, set()).copy():
+            self._discard(key)
+
+    def clear(self) -> None:
+        self._renders.clear()
+        self._by_sheet.clear()
+        self._by_template.clear()
+        self.size = 0
+
+
+render_cache: RenderCache = registry.get_state(
+    "charsheets.render_cache", RenderCache
+)
@@ -0,0 +1,222 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from discord.ext import commands
+from discord import (
+    Embed,
+    HTTPException,
+    Interaction,
+    InteractionCallbackResponse,
+)
+
+from botofspades import background, changes, registry
+from botofspades.constants import EMBED_DESCRIPTION_LIMIT
+from botofspades.dispatch import message_edit, respond
+from botofspades.outmsg import out
+from botofspades.pagination import pack_lines
+
+
+# Most views kept live at once (the least recently changed are dropped past
+# it), the least seconds between edits of a view, and the seconds between
+# checks for changes made by other processes (which aren't published here).
+LIVE_VIEW_LIMIT: int = 100
+LIVE_VIEW_INTERVAL: float = 2.0
+LIVE_VIEW_POLL_INTERVAL: float = 10.0
+
+
+@dataclass
+class LiveView:
+    channel_id: int
+    message_id: int
+    sheet: str
+    # As last shown, so edits that wouldn't change anything are skipped.
+    lines: tuple[str, ...]
+    pending: Optional[asyncio.Task] = None
+
+
+def get_embed(lines: tuple[str, ...], footer: str) -> Embed:
+    # Views are a single message, so longer sheets are cut to a page.
+    return Embed(
+        description=next(pack_lines(lines, EMBED_DESCRIPTION_LIMIT), "")
+    ).set_footer(text=footer)
+
+
+def get_message_id(response: Any) -> int:
+    # Responses are follow-ups (messages) once the command was deferred.
+    if isinstance(response, InteractionCallbackResponse):
+        assert response.message_id
+        return response.message_id
+
+    return response.id
+
+
+class LiveViews:
+    """Sheet embeds edited as their sheets change, with the edits for bursts
+    of changes to a sheet made as one after an interval.
+    """
+
+    def __init__(
+        self,
+        limit: int = LIVE_VIEW_LIMIT,
+        interval: float = LIVE_VIEW_INTERVAL,
+        poll_interval: float = LIVE_VIEW_POLL_INTERVAL,
+    ) -> None:
+        self.limit: int = limit
+        self.interval: float = interval
+        self.poll_interval: float = poll_interval
+
+        self._views: OrderedDict[int, LiveView] = OrderedDict()
+        self._by_sheet: dict[str, set[int]] = {}
+        self._bot: Optional[commands.Bot] = None
+        self._render: Optional[Callable[[str], tuple[str, ...]]] = None
+        self._poller: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def start(
+        self,
+        bot: commands.Bot,
+        render: Callable[[str], tuple[str, ...]],
+        poll: bool = False,
+    ) -> None:
+        """Follows changes, rendering sheets with render (which raises
+        FileNotFoundError for sheets that no longer exist).
+
+        Only changes made through this process are published, so if others
+        write the sheets too, poll refreshes every view now and then.
+        """
+        self._bot = bot
+        self._render = render
+        changes.feed.subscribe(self.on_change)
+
+        if poll and not self._poller:
+            self._poller = background.spawn(self._poll())
+
+    def flush(self) -> None:
+        """Makes pending edits now, as stopping (to reload) drops them."""
+        for view in self._views.values():
+            if view.pending:
+                view.pending.cancel()
+                view.pending = None
+                background.spawn(self._refresh(view))
+
+    def stop(self) -> None:
+        changes.feed.unsubscribe(self.on_change)
+
+        if self._poller:
+            self._poller.cancel()
+            self._poller = None
+
+        for view in self._views.values():
+            if view.pending:
+                view.pending.cancel()
+                view.pending = None
+
+    async def pin(
+        self, itr: Interaction, sheet: str, lines: tuple[str, ...]
+    ) -> None:
+        response: Any = await respond(
+            itr, embed=get_embed(lines, out("LIVE_VIEW_FOOTER"))
+        )
+
+        self.add(
+            LiveView(
+                itr.channel_id or 0, get_message_id(response), sheet, lines
+            )
+        )
+
+    def add(self, view: LiveView) -> None:
+        self._views[view.message_id] = view
+        self._by_sheet.setdefault(view.sheet, set()).add(view.message_id)
+
+        while len(self._views) > self.limit:
+            evicted: LiveView = self.remove(next(iter(self._views)))
+            background.spawn(
+                self._edit(evicted, evicted.lines, out("LIVE_VIEW_STOPPED"))
+            )
+
+    def remove(self, message_id: int) -> LiveView:
+        view: LiveView = self._views.pop(message_id)
+
+        self._by_sheet[view.sheet].discard(message_id)
+        if not self._by_sheet[view.sheet]:
+            del self._by_sheet[view.sheet]
+
+        if view.pending:
+            view.pending.cancel()
+            view.pending = None
+
+        return view
+
+    def on_change(self, change: changes.Change) -> None:
+        if change.kind == "sheet":
+            for message_id in self._by_sheet.get(change.name, set()):
+                self._views.move_to_end(message_id)
+                self._schedule(self._views[message_id])
+        else:
+            # Which template a view's sheet uses isn't kept, but views whose
+            # render didn't change aren't edited.
+            for view in self._views.values():
+                self._schedule(view)
+
+    def _schedule(self, view: LiveView) -> None:
+        # Changes while an edit is pending are folded into it.
+        if not view.pending:
+            view.pending = background.spawn(self._refresh_later(view))
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+
+            # Renders are cached by the files' versions, so views of
+            # unchanged sheets cost little and aren't edited.
+            for view in list(self._views.values()):
+                self._schedule(view)
+
+    async def _refresh_later(self, view: LiveView) -> None:
+        await asyncio.sleep(self.interval)
+        view.pending = None
+
+        # A failure (logged as the task's) leaves the view as last shown, so
+        # the next change to its sheet tries again.
+        await self._refresh(view)
+
+    async def _refresh(self, view: LiveView) -> None:
+        assert self._render
+
+        try:
+            lines: tuple[str, ...] = self._render(view.sheet)
+            footer: str = out("LIVE_VIEW_FOOTER")
+        except FileNotFoundError:
+            self.remove(view.message_id)
+            lines = (out("LIVE_VIEW_SHEET_GONE", name=view.sheet.title()),)
+            footer = out("LIVE_VIEW_STOPPED")
+
+        if lines != view.lines:
+            await self._edit(view, lines, footer)
+
+    async def _edit(
+        self, view: LiveView, lines: tuple[str, ...], footer: str
+    ) -> None:
+        view.lines = lines
+
+        assert self._bot
+
+        try:
+            await message_edit(
+                self._bot.get_partial_messageable(
+                    view.channel_id
+                ).get_partial_message(view.message_id),
+                embed=get_embed(lines, footer),
+            )
+        except HTTPException:
+            # Deleted, or the bot lost access to its channel.
+            if view.message_id in self._views:
+                self.remove(view.message_id)
+
+
+live_views: LiveViews = registry.get_state("charsheets.live_views", LiveViews)
+registry.register_flush("charsheets.live_views", live_views.flush)
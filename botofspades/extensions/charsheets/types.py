@@ -13,6 +13,7 @@ from math import ceil, floor
 # Lever > "on"/"true"/"1"/"off"/"false"/"0" | boolean | bool
 # Scroll > "x" | "x" | "x"
 # Gauge > "x/y" | array[number("x"), number("y")] | list[int("x"), int("y")]
+# Ledger > "name:type,..." | object (see Ledger) | dict (as in JSON)
 
 
 Args = tuple[str, ...]
@@ -303,3 +304,143 @@ class Gauge(Field):
     @staticmethod
     def method_reset(value: list[int], args: Args) -> list[int]:
         return [value[1], value[1]]
+
+
+# Types a ledger's columns can have.
+COLUMN_TYPES: dict[str, type[Field]] = {
+    "abacus": Abacus,
+    "rational": Rational,
+    "lever": Lever,
+    "scroll": Scroll,
+}
+
+
+class Ledger(Field):
+    """A table with typed columns, such as an inventory.
+
+    Stored by column rather than by row, as
+    {"columns": {name: type, ...}, "values": [[column values], ...]}, so
+    column names aren't repeated for every row. Methods change the table in
+    place, and removing a row keeps the others in order (shifting the rows
+    after it, which is cheap at the sizes ledgers get to).
+    """
+
+    @staticmethod
+    def validate(value: Any) -> bool:
+        if isinstance(value, str):
+            try:
+                Ledger.from_str(value)
+            except:
+                return False
+
+            return True
+
+        try:
+            columns: dict[str, str] = value["columns"]
+            values: list[list[Any]] = value["values"]
+
+            return (
+                bool(columns)
+                and len(values) == len(columns)
+                and len({len(column) for column in values}) == 1
+                and all(
+                    COLUMN_TYPES[type_name].validate(cell)
+                    for type_name, column in zip(columns.values(), values)
+                    for cell in column
+                )
+            )
+        except:
+            return False
+
+    @staticmethod
+    def from_str(value_str: str) -> dict[str, Any]:
+        """Makes an empty ledger from its columns, as comma separated names
+        with an optional type (scroll by default), like "item,amount:abacus".
+        """
+        columns: dict[str, str] = {}
+
+        for column in value_str.split(","):
+            name, _, type_name = column.partition(":")
+            name = name.strip().lower()
+            type_name = type_name.strip().lower() or "scroll"
+
+            if not name or name in columns or type_name not in COLUMN_TYPES:
+                raise ValueError(column)
+
+            columns[name] = type_name
+
+        return {"columns": columns, "values": [[] for _ in columns]}
+
+    @staticmethod
+    def to_str(value: dict[str, Any]) -> str:
+        rows: str = "; ".join(
+            ", ".join(
+                COLUMN_TYPES[type_name].to_str(cell)
+                for type_name, cell in zip(value["columns"].values(), row)
+            )
+            for row in zip(*value["values"])
+        )
+
+        return f"{', '.join(value['columns']).title()}: {rows or 'none'}"
+
+    @staticmethod
+    def _get_cell(type_name: str, arg: str) -> Any:
+        if not COLUMN_TYPES[type_name].validate(arg):
+            raise TypeError
+
+        return COLUMN_TYPES[type_name].from_str(arg)
+
+    @staticmethod
+    def _get_row(value: dict[str, Any], arg: str) -> int:
+        # Rows are numbered from 1, as shown.
+        try:
+            row: int = int(arg) - 1
+        except:
+            raise TypeError
+
+        if not 0 <= row < len(value["values"][0]):
+            raise TypeError
+
+        return row
+
+    @staticmethod
+    def method_append(value: dict[str, Any], args: Args) -> dict[str, Any]:
+        if len(args) != len(value["columns"]):
+            raise TypeError
+
+        cells: list[Any] = [
+            Ledger._get_cell(type_name, arg)
+            for type_name, arg in zip(value["columns"].values(), args)
+        ]
+
+        for column, cell in zip(value["values"], cells):
+            column.append(cell)
+
+        return value
+
+    @staticmethod
+    def method_remove(value: dict[str, Any], args: Args) -> dict[str, Any]:
+        row: int = Ledger._get_row(value, args[0] if args else "")
+
+        for column in value["values"]:
+            column.pop(row)
+
+        return value
+
+    @staticmethod
+    def method_update(value: dict[str, Any], args: Args) -> dict[str, Any]:
+        if len(args) != 3:
+            raise TypeError
+
+        row: int = Ledger._get_row(value, args[0])
+        names: list[str] = list(value["columns"])
+        name: str = args[1].strip().lower()
+
+        if name not in value["columns"]:
+            raise TypeError
+
+        value["values"][names.index(name)][row] = Ledger._get_cell(
+            value["columns"][name], args[2]
+        )
+
+        return value
@@ -0,0 +1,109 @@
+from itertools import chain
+from typing import Optional
+
+from discord.ext import commands
+from discord import app_commands as apc
+from discord import Intents, Interaction
+
+from botofspades import dicestats
+from botofspades.log import extension_loaded, extension_unloaded
+from botofspades.outmsg import out, send
+from botofspades.pagination import pack_code_block, pack_lines, send_pages
+from botofspades.slash import add_slash_command, remove_slash_command
+
+
+EXTENSION_NAME: str = "Dice"
+INTENTS: Intents = Intents.none()
+
+PERCENTILES: tuple[int, ...] = (5, 25, 50, 75, 95)
+
+# Distributions with more outcomes than this are only summarized.
+MAX_CHART_OUTCOMES: int = 40
+CHART_WIDTH: int = 30
+
+
+def get_chart_lines(distribution: dicestats.Distribution) -> list[str]:
+    most_common: int = max(distribution.counts)
+
+    return [
+        f"{value:>4} {count / distribution.total:>7.2%} "
+        f"{'#' * round(count / most_common * CHART_WIDTH)}\n"
+        for value, count in distribution.items()
+    ]
+
+
+class Dice(apc.Group):
+    @apc.command(description="Shows the exact odds of a roll.")
+    @apc.describe(
+        expression="A roll, like 3d6, d20+2 or 2d20kh1 (keeping the highest).",
+        target="Shows the chance of rolling at least this.",
+        roll_under="Shows the chance of rolling at most the target instead.",
+    )
+    async def stats(
+        self,
+        itr: Interaction,
+        expression: str,
+        target: Optional[int] = None,
+        roll_under: bool = False,
+    ) -> None:
+        try:
+            distribution: dicestats.Distribution = dicestats.parse(
+                expression.lower()
+            )
+        except ValueError as error:
+            await send(itr, "INVALID_DICE_EXPRESSION", part=error.args[0])
+            return
+
+        lines: list[str] = [
+            out(
+                "DICE_STATS",
+                expression=expression,
+                mean=f"{float(distribution.mean()):.2f}",
+                deviation=f"{float(distribution.variance()) ** 0.5:.2f}",
+                minimum=distribution.minimum,
+                maximum=distribution.maximum,
+            ),
+            out(
+                "DICE_PERCENTILES",
+                percentiles=", ".join(
+                    f"{percent}%: {distribution.percentile(percent)}"
+                    for percent in PERCENTILES
+                ),
+            ),
+        ]
+
+        if target is not None:
+            chance: float = float(
+                distribution.chance_at_most(target)
+                if roll_under
+                else distribution.chance_at_least(target)
+            )
+
+            lines.append(
+                out(
+                    "DICE_CHANCE_AT_MOST" if roll_under else "DICE_CHANCE",
+                    target=target,
+                    chance=f"{chance:.2%}",
+                )
+            )
+
+        chart: list[str] = (
+            get_chart_lines(distribution)
+            if len(distribution.counts) <= MAX_CHART_OUTCOMES
+            else []
+        )
+
+        await send_pages(
+            itr,
+            chain(pack_lines(lines), pack_code_block(chart) if chart else ()),
+        )
+
+
+async def setup(bot: commands.Bot) -> None:
+    add_slash_command(bot, Dice())
+    extension_loaded(EXTENSION_NAME)
+
+
+async def teardown(bot: commands.Bot) -> None:
+    remove_slash_command(bot, "dice")
+    extension_unloaded(EXTENSION_NAME)
@@ -0,0 +1,367 @@
+import random
+from types import ModuleType
+from typing import Optional
+
+from discord.ext import commands
+from discord import app_commands as apc
+from discord import Intents, Interaction
+
+from utils import get_str_varargs
+from botofspades import registry
+from botofspades.encounter import Effect, Encounter, RoundResult
+from botofspades.log import extension_loaded, extension_unloaded
+from botofspades.outmsg import botsend_lines, out, send
+from botofspades.slash import add_slash_command, remove_slash_command
+from botofspades.unicode import FIELD_ARROW
+
+
+EXTENSION_NAME: str = "Encounter"
+INTENTS: Intents = Intents.none()
+CHARSHEETS_EXTENSION: str = "botofspades.extensions.charsheets"
+
+MAX_INTERVAL: int = 100
+MAX_EFFECT_ROUNDS: int = 10_000
+
+# Encounters by channel, kept across reloads.
+encounters: dict[int, Encounter] = registry.get_state(
+    "encounter.encounters", dict
+)
+
+
+def get_effect_line(effect: Effect) -> str:
+    return out(
+        "EFFECT_ENTRY",
+        id=effect.id,
+        name=effect.name,
+        sheet=effect.sheet.title(),
+        method=(
+            f"{effect.method} {effect.field.title()}"
+            + (f" {', '.join(effect.args)}" if effect.args else "")
+            + (
+                f" every {effect.interval} rounds"
+                if effect.interval > 1
+                else " every round"
+            )
+            if effect.method
+            else "no changes"
+        ),
+        expires=(
+            f"until round {effect.expires}"
+            if effect.expires is not None
+            else "until the encounter ends"
+        ),
+    )
+
+
+def get_order_lines(encounter: Encounter) -> list[str]:
+    if not encounter.order:
+        return [out("ENCOUNTER_EMPTY")]
+
+    return [
+        out("INITIATIVE_ORDER"),
+        *(
+            out(
+                "INITIATIVE_ENTRY",
+                position=position,
+                name=participant.sheet.title(),
+                initiative=participant.initiative,
+            )
+            for position, participant in enumerate(encounter.order, 1)
+        ),
+    ]
+
+
+async def apply_round(
+    charsheets: ModuleType, result: RoundResult
+) -> list[str]:
+    """Performs the effects due in a round, with one update per sheet."""
+    lines: list[str] = [out("ROUND_STARTED", round=result.round)]
+
+    for sheet, effects in result.due.items():
+        try:
+            changes: list[Optional[tuple[str, str]]] = (
+                await charsheets.do_field_methods(
+                    sheet,
+                    [
+                        (effect.field, effect.method, effect.args)
+                        for effect in effects
+                    ],
+                )
+            )
+        except FileNotFoundError:
+            changes = [None] * len(effects)
+
+        for effect, change in zip(effects, changes):
+            field: str = charsheets.get_sheet_field_sig_str(
+                sheet, effect.field
+            )
+
+            if change:
+                lines.append(
+                    out(
+                        "EFFECT_APPLIED",
+                        name=effect.name,
+                        field=field,
+                        old=change[0],
+                        new=change[1],
+                        arrow=FIELD_ARROW,
+                    )
+                )
+            else:
+                lines.append(
+                    out("EFFECT_FAILED", name=effect.name, field=field)
+                )
+
+    lines.extend(
+        out("EFFECT_EXPIRED", name=effect.name, sheet=effect.sheet.title())
+        for effect in result.expired
+    )
+
+    return lines
+
+
+def get_charsheets(itr: Interaction) -> Optional[ModuleType]:
+    return itr.client.extensions.get(CHARSHEETS_EXTENSION)
+
+
+class EncounterGroup(apc.Group, name="encounter"):
+    @apc.command(description="Starts an encounter in this channel.")
+    async def start(self, itr: Interaction) -> None:
+        if (itr.channel_id or 0) in encounters:
+            await send(itr, "ENCOUNTER_ALREADY_RUNNING")
+            return
+
+        encounters[itr.channel_id or 0] = Encounter()
+        await send(itr, "ENCOUNTER_STARTED")
+
+    @apc.command(description="Ends this channel's encounter.")
+    async def end(self, itr: Interaction) -> None:
+        encounter: Optional[Encounter] = encounters.pop(
+            itr.channel_id or 0, None
+        )
+
+        if not encounter:
+            await send(itr, "NO_ENCOUNTER")
+            return
+
+        await send(itr, "ENCOUNTER_ENDED", rounds=encounter.round)
+
+    @apc.command(description="Adds a sheet to the initiative order.")
+    @apc.describe(
+        sheet_name="The combatant's sheet.",
+        initiative="Higher goes first (a d20 roll by default).",
+    )
+    async def join(
+        self,
+        itr: Interaction,
+        sheet_name: str,
+        initiative: Optional[int] = None,
+    ) -> None:
+        sheet_name = sheet_name.lower()
+
+        encounter: Optional[Encounter] = encounters.get(itr.channel_id or 0)
+        charsheets: Optional[ModuleType] = get_charsheets(itr)
+
+        if not encounter:
+            await send(itr, "NO_ENCOUNTER")
+            return
+
+        if not charsheets:
+            await send(itr, "CHARSHEETS_NOT_LOADED")
+            return
+
+        if not charsheets.get_sheet_path(sheet_name).exists():
+            await send(itr, "SHEET_NOT_FOUND", name=sheet_name.title())
+            return
+
+        if initiative is None:
+            initiative = random.randint(1, 20)
+
+        encounter.join(sheet_name, initiative)
+        await send(
+            itr,
+            "COMBATANT_JOINED",
+            name=sheet_name.title(),
+            initiative=initiative,
+        )
+
+    @apc.command(description="Removes a sheet from the initiative order.")
+    async def leave(self, itr: Interaction, sheet_name: str) -> None:
+        sheet_name = sheet_name.lower()
+
+        encounter: Optional[Encounter] = encounters.get(itr.channel_id or 0)
+
+        if not encounter:
+            await send(itr, "NO_ENCOUNTER")
+        elif encounter.leave(sheet_name):
+            await send(itr, "COMBATANT_LEFT", name=sheet_name.title())
+        else:
+            await send(itr, "COMBATANT_NOT_FOUND", name=sheet_name.title())
+
+    @apc.command(description="Adds an effect performed on a sheet each round.")
+    @apc.describe(
+        name="What to call the effect, like poison.",
+        sheet_name="The sheet it affects.",
+        field_name="The field it changes (none for effects that only last).",
+        method_name="The method performed on the field, like subtract.",
+        args="The method's comma separated args.",
+        interval="Performs it every this many rounds.",
+        rounds="How many rounds it lasts (0 for the whole encounter).",
+    )
+    async def effect(
+        self,
+        itr: Interaction,
+        name: str,
+        sheet_name: str,
+        field_name: str = "",
+        method_name: str = "",
+        args: str = "",
+        interval: apc.Range[int, 1, MAX_INTERVAL] = 1,
+        rounds: apc.Range[int, 0, MAX_EFFECT_ROUNDS] = 0,
+    ) -> None:
+        sheet_name = sheet_name.lower()
+        field_name = field_name.lower()
+        method_name = method_name.lower()
+
+        encounter: Optional[Encounter] = encounters.get(itr.channel_id or 0)
+        charsheets: Optional[ModuleType] = get_charsheets(itr)
+
+        if not encounter:
+            await send(itr, "NO_ENCOUNTER")
+            return
+
+        if not charsheets:
+            await send(itr, "CHARSHEETS_NOT_LOADED")
+            return
+
+        if bool(field_name) != bool(method_name):
+            await send(itr, "EFFECT_NEEDS_METHOD")
+            return
+
+        if not method_name and not rounds:
+            await send(itr, "EFFECT_NEEDS_ROUNDS")
+            return
+
+        arg_list: tuple[str, ...] = (
+            tuple(get_str_varargs(args)) if args else ()
+        )
+
+        if method_name:
+            try:
+                value, method = charsheets.get_field_method(
+                    sheet_name, field_name, method_name
+                )
+            except FileNotFoundError:
+                await send(itr, "SHEET_NOT_FOUND", name=sheet_name.title())
+                return
+            except KeyError:
+                await send(itr, "FIELD_NOT_FOUND", name=field_name.title())
+                return
+            except AttributeError:
+                await send(itr, "METHOD_NOT_FOUND", name=method_name.title())
+                return
+
+            # Tried on the current value, so bad args are caught now rather
+            # than every round.
+            try:
+                method(value, arg_list)
+            except (TypeError, ValueError, ArithmeticError):
+                await send(
+                    itr,
+                    "INVALID_EFFECT_METHOD",
+                    method=method_name.title(),
+                    field=field_name.title(),
+                )
+                return
+        elif not charsheets.get_sheet_path(sheet_name).exists():
+            await send(itr, "SHEET_NOT_FOUND", name=sheet_name.title())
+            return
+
+        effect: Effect = encounter.add_effect(
+            name,
+            sheet_name,
+            field_name,
+            method_name,
+            arg_list,
+            interval,
+            rounds,
+        )
+
+        await send(
+            itr,
+            "EFFECT_ADDED",
+            name=effect.name,
+            id=effect.id,
+            sheet=sheet_name.title(),
+        )
+
+    @apc.command(description="Removes an effect before it expires.")
+    async def remove_effect(self, itr: Interaction, effect_id: int) -> None:
+        encounter: Optional[Encounter] = encounters.get(itr.channel_id or 0)
+
+        if not encounter:
+            await send(itr, "NO_ENCOUNTER")
+            return
+
+        effect: Optional[Effect] = encounter.remove_effect(effect_id)
+
+        if not effect:
+            await send(itr, "EFFECT_NOT_FOUND", id=effect_id)
+            return
+
+        await send(itr, "EFFECT_REMOVED", name=effect.name, id=effect.id)
+
+    @apc.command(description="Moves to the next round, performing effects.")
+    async def next(self, itr: Interaction) -> None:
+        encounter: Optional[Encounter] = encounters.get(itr.channel_id or 0)
+        charsheets: Optional[ModuleType] = get_charsheets(itr)
+
+        if not encounter:
+            await send(itr, "NO_ENCOUNTER")
+            return
+
+        if not charsheets:
+            await send(itr, "CHARSHEETS_NOT_LOADED")
+            return
+
+        await botsend_lines(
+            itr,
+            [
+                *await apply_round(charsheets, encounter.next_round()),
+                *get_order_lines(encounter),
+            ],
+        )
+
+    @apc.command(description="Shows the round, initiative order and effects.")
+    async def status(self, itr: Interaction) -> None:
+        encounter: Optional[Encounter] = encounters.get(itr.channel_id or 0)
+
+        if not encounter:
+            await send(itr, "NO_ENCOUNTER")
+            return
+
+        await botsend_lines(
+            itr,
+            [
+                out("ENCOUNTER_ROUND", round=encounter.round),
+                *get_order_lines(encounter),
+                *(
+                    [
+                        out("ACTIVE_EFFECTS"),
+                        *map(get_effect_line, encounter.effects.values()),
+                    ]
+                    if encounter.effects
+                    else []
+                ),
+            ],
+        )
+
+
+async def setup(bot: commands.Bot) -> None:
+    add_slash_command(bot, EncounterGroup())
+    extension_loaded(EXTENSION_NAME)
+
+
+async def teardown(bot: commands.Bot) -> None:
+    remove_slash_command(bot, "encounter")
+    extension_unloaded(EXTENSION_NAME)
@@ -1,48 +1,360 @@
+import random
+import sys
+from dataclasses import dataclass
+from itertools import chain
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional
+
 from discord.ext import commands
-from voladice import D6, D20
+from discord import app_commands as apc
+from discord import Intents, Interaction
 
 from botofspades.unicode import FIELD_ARROW
 from botofspades.log import extension_loaded, extension_unloaded
+from botofspades.outmsg import botsend, botsend_lines, out, send
+from botofspades.pagination import pack_code_block, pack_lines, send_pages
+from botofspades.slash import add_slash_command, remove_slash_command
+
+if TYPE_CHECKING:
+    from botofspades import combat
 
 
 EXTENSION_NAME: str = "Into the Odd"
+INTENTS: Intents = Intents.none()
+CHARSHEETS_EXTENSION: str = "botofspades.extensions.charsheets"
+
+ATTRIBUTES: tuple[str, ...] = ("strength", "dexterity", "willpower")
+DICE_PER_ATTRIBUTE: int = 3
+D6_FACES: range = range(1, 7)
+
+# Attribute sets are rerolled until at least one attribute reaches this.
+MIN_BEST_ATTRIBUTE: int = 10
+MAX_CHARACTERS: int = 50
+MAX_FIGHTS: int = 100_000
 
 
-class IntoTheOdd(commands.Cog):
-    @commands.group(invoke_without_command=True, aliases=["ito"])
-    async def intotheodd(self, ctx) -> None:
-        ...
+@dataclass
+class AttributeSet:
+    strength: int
+    dexterity: int
+    willpower: int
+    rerolls: int
 
-    @intotheodd.command(aliases=["r"])
-    async def roll(self, ctx) -> None:
-        await ctx.send(f"{ctx.author.mention} {D20.roll().get_total()}")
+    @property
+    def values(self) -> dict[str, int]:
+        return {
+            attribute: getattr(self, attribute) for attribute in ATTRIBUTES
+        }
 
-    @intotheodd.command(aliases=["rollatts", "ratts", "ra"])
-    async def rollattributes(self, ctx) -> None:
-        strength, dexterity, willpower = 0, 0, 0
-        roll_amount: int = 0
 
-        while max(strength, dexterity, willpower) < 10:
-            strength, dexterity, willpower = [
-                D6.rollmany(3).get_total() for _ in range(3)
+def roll_attribute_sets(amount: int) -> list[AttributeSet]:
+    """Rolls 3d6 for each attribute of each set, rerolling the sets without
+    an attribute of 10 or more as the rules do.
+
+    All the dice of a round are rolled in a single call, and the rejected sets
+    are rerolled together in the next round.
+    """
+    sets: list[Optional[AttributeSet]] = [None] * amount
+    rerolls: list[int] = [0] * amount
+    pending: list[int] = list(range(amount))
+
+    while pending:
+        dice: list[int] = random.choices(
+            D6_FACES, k=len(pending) * len(ATTRIBUTES) * DICE_PER_ATTRIBUTE
+        )
+        totals: list[int] = [
+            sum(dice[start : start + DICE_PER_ATTRIBUTE])
+            for start in range(0, len(dice), DICE_PER_ATTRIBUTE)
+        ]
+        rejected: list[int] = []
+
+        for position, index in enumerate(pending):
+            values: list[int] = totals[
+                position * len(ATTRIBUTES) : (position + 1) * len(ATTRIBUTES)
             ]
 
-            roll_amount += 1
+            if max(values) < MIN_BEST_ATTRIBUTE:
+                rerolls[index] += 1
+                rejected.append(index)
+            else:
+                sets[index] = AttributeSet(*values, rerolls[index])
+
+        pending = rejected
+
+    return sets  # type: ignore
+
+
+def get_attribute_set_line(
+    number: int, attribute_set: AttributeSet, sheet: str = ""
+) -> str:
+    return (
+        f"{number:>3} {attribute_set.strength:>4} {attribute_set.dexterity:>4}"
+        f" {attribute_set.willpower:>4} {attribute_set.rerolls:>8}  {sheet}"
+    ).rstrip() + "\n"
+
+
+async def create_sheets(
+    charsheets: ModuleType,
+    template: str,
+    prefix: str,
+    sets: list[AttributeSet],
+) -> tuple[list[str], list[str]]:
+    """Creates a sheet for each set, returning the sheet names (empty for
+    the ones that couldn't be created) and any error messages.
+
+    Batches are created whole or not at all: if the template is missing or
+    rejects a value, the sheets already created are removed.
+    """
+    sheets: list[str] = []
+    errors: list[str] = []
+
+    for number, attribute_set in enumerate(sets, 1):
+        sheet: str = f"{prefix}{number}"
+
+        try:
+            await charsheets.create_sheet(
+                sheet, template, attribute_set.values
+            )
+            sheets.append(sheet)
+        except FileExistsError:
+            sheets.append("")
+            errors.append(out("SHEET_ALREADY_EXISTS", name=sheet.title()))
+        except (FileNotFoundError, ValueError) as error:
+            remove_sheets(charsheets, sheets)
+
+            return [], [
+                out("TEMPLATE_NOT_FOUND", name=template.title())
+                if isinstance(error, FileNotFoundError)
+                else out("INVALID_ATTRIBUTE_FIELD", name=error.args[0])
+            ]
+
+    return sheets, errors
+
+
+def remove_sheets(charsheets: ModuleType, sheets: list[str]) -> None:
+    for sheet in filter(None, sheets):
+        try:
+            charsheets.remove_sheet(sheet)
+        except FileNotFoundError:
+            # Already removed by someone else.
+            pass
+
+
+def get_combatants(
+    charsheets: ModuleType, names: str
+) -> tuple[tuple["combat.Combatant", ...], str]:
+    """Reads the combatants of comma separated sheets, returning an error
+    message instead if any of them can't be read.
+    """
+    from botofspades import combat
+
+    combatants: list[combat.Combatant] = []
+
+    for name in filter(None, map(str.strip, names.lower().split(","))):
+        try:
+            combatants.append(
+                combat.get_combatant(name, charsheets.get_sheet_fields(name))
+            )
+        except FileNotFoundError:
+            return (), out("SHEET_NOT_FOUND", name=name.title())
+        except KeyError as error:
+            return (), out(
+                "MISSING_COMBATANT_FIELD",
+                name=name.title(),
+                field=error.args[0].title(),
+            )
+        except ValueError as error:
+            return (), out(
+                "INVALID_COMBATANT_FIELD",
+                name=name.title(),
+                field=error.args[0].title(),
+            )
+
+    if not combatants:
+        return (), out("NO_COMBATANTS")
+
+    return tuple(combatants), ""
+
 
-        await ctx.send(
-            f"{ctx.author.mention}\n"
-            f"Strength {FIELD_ARROW} {strength}\n"
-            f"Dexterity {FIELD_ARROW} {dexterity}\n"
-            f"Willpower {FIELD_ARROW} {willpower}\n"
-            + (f"\nRerolls: {roll_amount - 1}" if roll_amount > 1 else "")
+def get_simulation_lines(result: "combat.SimulationResult") -> list[str]:
+    from botofspades import combat
+
+    lines: list[str] = [
+        out(
+            "SIMULATION_RESULTS",
+            fights=result.fights,
+            party=f"{result.party_wins / result.fights:.1%}",
+            mob=f"{result.mob_wins / result.fights:.1%}",
+            draws=f"{result.draws / result.fights:.1%}",
+        )
+    ]
+
+    for side, rounds in (
+        ("party", result.party_rounds),
+        ("mob", result.mob_rounds),
+    ):
+        if rounds:
+            lines.append(
+                out(
+                    "SIMULATION_ROUNDS",
+                    side=side,
+                    mean=f"{combat.get_mean_rounds(rounds):.1f}",
+                    median=combat.get_rounds_percentile(rounds, 50),
+                    p90=combat.get_rounds_percentile(rounds, 90),
+                )
+            )
+
+    return lines
+
+
+class IntoTheOdd(apc.Group, name="intotheodd"):
+    @apc.command(description="Performs a standard roll.")
+    async def roll(self, itr: Interaction) -> None:
+        # Imported on first use to keep it out of the startup path.
+        from voladice import D20
+
+        await botsend(itr, f"{itr.user.mention} {D20.roll().get_total()}")
+
+    @apc.command(description="Rolls the attributes of new characters.")
+    @apc.describe(
+        amount="How many characters to roll.",
+        template="Creates a sheet from this template for each character.",
+        prefix="Names the sheets (followed by their number).",
+    )
+    async def rollattributes(
+        self,
+        itr: Interaction,
+        amount: apc.Range[int, 1, MAX_CHARACTERS] = 1,
+        template: str = "",
+        prefix: str = "",
+    ) -> None:
+        sets: list[AttributeSet] = roll_attribute_sets(amount)
+
+        if amount == 1 and not template:
+            attribute_set: AttributeSet = sets[0]
+
+            await botsend(
+                itr,
+                f"{itr.user.mention}\n"
+                f"Strength {FIELD_ARROW} {attribute_set.strength}\n"
+                f"Dexterity {FIELD_ARROW} {attribute_set.dexterity}\n"
+                f"Willpower {FIELD_ARROW} {attribute_set.willpower}\n"
+                + (
+                    f"\nRerolls: {attribute_set.rerolls}"
+                    if attribute_set.rerolls
+                    else ""
+                ),
+            )
+            return
+
+        sheets: list[str] = [""] * amount
+        errors: list[str] = []
+
+        if template:
+            charsheets: Optional[ModuleType] = itr.client.extensions.get(
+                CHARSHEETS_EXTENSION
+            )
+
+            if not charsheets:
+                await send(itr, "CHARSHEETS_NOT_LOADED")
+                return
+
+            template = template.lower()
+            sheets, errors = await create_sheets(
+                charsheets, template, (prefix or template).lower(), sets
+            )
+
+            if not sheets:
+                await botsend(itr, "".join(errors))
+                return
+
+        lines: list[str] = [
+            f"{itr.user.mention}\n",
+            *errors,
+            *(
+                [
+                    out(
+                        "CHARACTER_SHEETS_CREATED",
+                        amount=sum(map(bool, sheets)),
+                    )
+                ]
+                if template
+                else []
+            ),
+        ]
+        table: list[str] = [
+            "  #  STR  DEX  WIL  Rerolls  Sheet\n"
+            if template
+            else "  #  STR  DEX  WIL  Rerolls\n",
+            *(
+                get_attribute_set_line(number, attribute_set, sheet)
+                for number, (attribute_set, sheet) in enumerate(
+                    zip(sets, sheets), 1
+                )
+            ),
+        ]
+
+        await send_pages(
+            itr,
+            chain(pack_lines(lines), pack_code_block(table)),
+        )
+
+    @apc.command(description="Simulates fights between two groups of sheets.")
+    @apc.describe(
+        party="The party's sheets, separated by commas.",
+        mob="The mob's sheets, separated by commas.",
+        fights="How many fights to simulate.",
+    )
+    async def simulate(
+        self,
+        itr: Interaction,
+        party: str,
+        mob: str,
+        fights: apc.Range[int, 1, MAX_FIGHTS] = 1000,
+    ) -> None:
+        charsheets: Optional[ModuleType] = itr.client.extensions.get(
+            CHARSHEETS_EXTENSION
+        )
+
+        if not charsheets:
+            await send(itr, "CHARSHEETS_NOT_LOADED")
+            return
+
+        party_combatants, error = get_combatants(charsheets, party)
+
+        if not error:
+            mob_combatants, error = get_combatants(charsheets, mob)
+
+        if error:
+            await botsend(itr, error)
+            return
+
+        # Imported on first use (along with dicestats and the process pool)
+        # to keep it out of the startup path.
+        from botofspades import combat
+
+        result: combat.SimulationResult = await combat.simulate(
+            party_combatants, mob_combatants, fights
+        )
+
+        await botsend_lines(
+            itr, [f"{itr.user.mention}\n", *get_simulation_lines(result)]
         )
 
 
 async def setup(bot: commands.Bot) -> None:
-    await bot.add_cog(IntoTheOdd())
+    add_slash_command(bot, IntoTheOdd())
     extension_loaded(EXTENSION_NAME)
 
 
 async def teardown(bot: commands.Bot) -> None:
-    await bot.remove_cog("IntoTheOdd")
+    remove_slash_command(bot, "intotheodd")
+    # Extensions are unloaded when the bot closes, too. Without a simulation
+    # run, combat was never imported and there's no pool to shut down.
+    loaded_combat: Optional[ModuleType] = sys.modules.get(
+        "botofspades.combat"
+    )
+
+    if loaded_combat:
+        loaded_combat.shutdown_executor()
     extension_unloaded(EXTENSION_NAME)
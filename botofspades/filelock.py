@@ -0,0 +1,113 @@
+import asyncio
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks (Windows): only a single bot process is supported.
+    fcntl = None
+
+
+# Seconds between attempts at an exclusive lock another process holds.
+LOCK_RETRY_DELAY: float = 0.005
+
+
+# Exclusive locks are taken in two steps: an asyncio.Lock orders the
+# coroutines of this process, then an advisory lock (flock) orders processes.
+# Neither is ever waited on in a way that blocks the event loop, and updates
+# hold them only while reading, changing and writing the file (never across
+# an await), so nothing waits on another process's round trips to Discord.
+
+
+@dataclass
+class PathLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Coroutines holding or waiting on the lock, so it's dropped once unused.
+    users: int = 0
+    # The descriptor holding the advisory lock, while the lock is held.
+    fd: Optional[int] = None
+
+
+locks: dict[Path, PathLock] = {}
+
+
+def is_held(path: Path) -> bool:
+    """Whether a coroutine of this process holds path's exclusive lock."""
+    return path in locks and locks[path].fd is not None
+
+
+async def _flock_exclusive(fd: int) -> None:
+    if not fcntl:
+        return
+
+    # Polled rather than waited on (in a thread) so cancelling the wait can't
+    # leave a lock taken behind it.
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return
+        except BlockingIOError:
+            await asyncio.sleep(LOCK_RETRY_DELAY)
+
+
+def _drop(path: Path, path_lock: PathLock) -> None:
+    path_lock.users -= 1
+
+    if not path_lock.users:
+        del locks[path]
+
+
+async def acquire_exclusive(path: Path) -> None:
+    """Locks path against this process's other coroutines and against other
+    processes, waiting for them to finish.
+    """
+    path_lock: PathLock = locks.setdefault(path, PathLock())
+    path_lock.users += 1
+
+    try:
+        await path_lock.lock.acquire()
+    except:
+        _drop(path, path_lock)
+        raise
+
+    try:
+        fd: int = os.open(path, os.O_RDONLY)
+
+        try:
+            await _flock_exclusive(fd)
+        except:
+            os.close(fd)
+            raise
+    except:
+        path_lock.lock.release()
+        _drop(path, path_lock)
+        raise
+
+    path_lock.fd = fd
+
+
+def release_exclusive(path: Path) -> None:
+    path_lock: PathLock = locks[path]
+
+    # Closing the descriptor releases the advisory lock.
+    if path_lock.fd is not None:
+        os.close(path_lock.fd)
+        path_lock.fd = None
+
+    path_lock.lock.release()
+    _drop(path, path_lock)
+
+
+def lock_shared(file: IO, path: Path) -> None:
+    """Locks an open file for reading until it's closed.
+
+    Reads are synchronous, but writers only hold their lock while writing,
+    so this waits no longer than a write takes.
+    """
+    # A lock this process holds would block its own shared lock (they're per
+    # descriptor). Its holder never awaits, so the file is whole meanwhile.
+    if fcntl and not is_held(path):
+        fcntl.flock(file.fileno(), fcntl.LOCK_SH)
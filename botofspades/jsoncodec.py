@@ -0,0 +1,71 @@
+import json
+from math import isfinite
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    # Falls back to the standard library, which is several times slower.
+    orjson = None
+
+
+# orjson reads integers past 64 bits as floats, so documents that may have
+# them (a run of 19 digits or more) are read by the standard library instead.
+# Runs are found by turning every digit into a 0 and everything else into a
+# space, which is several times faster than a regular expression.
+DIGIT_TABLE: bytes = bytes(
+    ord("0") if byte in b"0123456789" else ord(" ") for byte in range(256)
+)
+LONG_NUMBER: bytes = b"0" * 19
+
+
+def has_long_number(data: bytes) -> bool:
+    return LONG_NUMBER in data.translate(DIGIT_TABLE)
+
+
+def has_non_finite(value: Any) -> bool:
+    if isinstance(value, float):
+        return not isfinite(value)
+
+    if isinstance(value, dict):
+        return any(map(has_non_finite, value.values()))
+
+    if isinstance(value, (list, tuple)):
+        return any(map(has_non_finite, value))
+
+    return False
+
+
+def loads(data: bytes) -> Any:
+    if orjson and not has_long_number(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Possibly NaN or an infinity, which only the standard library
+            # writes (and reads).
+            pass
+
+    return json.loads(data)
+
+
+def dumps(value: Any, pretty: bool = False) -> bytes:
+    """Encodes value compactly, or indented for humans if pretty is set."""
+    if orjson:
+        try:
+            data: bytes = orjson.dumps(
+                value, option=orjson.OPT_INDENT_2 if pretty else 0
+            )
+
+            # orjson writes NaN and the infinities as null, losing them, so
+            # values with any (only possible if there's a null) are written
+            # by the standard library instead.
+            if b"null" not in data or not has_non_finite(value):
+                return data
+        except TypeError:
+            # Integers past 64 bits, which orjson can't write.
+            pass
+
+    if pretty:
+        return json.dumps(value, indent=2).encode()
+
+    return json.dumps(value, separators=(",", ":")).encode()
@@ -1,31 +1,43 @@
-from io import TextIOWrapper
+import os
 from pathlib import Path
-from json import dump, load
-from typing import Optional
-import os.path as path
+from time import time_ns
+from typing import BinaryIO, Optional
+
+from botofspades import constants, filelock, jsoncodec, metrics
 
 
 class JSONFileWrapperReadOnly:
     def __init__(self, path: Path) -> None:
-        self._file: Optional[TextIOWrapper] = None
+        self._file: Optional[BinaryIO] = None
         self._path: Path = path
 
     def _open_json(self) -> None:
-        self._file = self._path.open("r")
+        self._file = self._path.open("rb")
+        filelock.lock_shared(self._file, self._path)
+        metrics.count_storage("files_opened")
+
+    def _load_json(self) -> dict:
+        data: bytes = self._file.read() if self._file else b""
+        metrics.count_storage("bytes_read", len(data))
+
+        return jsoncodec.loads(data) if data else {}
 
     def _close_json(self) -> None:
         if self._file:
             self._file.close()
+            self._file = None
 
     def __enter__(self):
         if not self._path.exists():
             raise FileNotFoundError(self._path.name)
 
+        # Reads only hold the lock while loading, not for the whole block.
         self._open_json()
 
-        return (
-            load(self._file) if self._file and path.getsize(self._path) else {}
-        )
+        try:
+            return self._load_json()
+        finally:
+            self._close_json()
 
     def __exit__(self, exc_type, exc_value, trace) -> bool:
         self._close_json()
@@ -34,21 +46,74 @@ class JSONFileWrapperReadOnly:
 
 
 class JSONFileWrapperUpdate(JSONFileWrapperReadOnly):
+    """Writes the file back when the block is left. Used with async with, as
+    the lock may have to be waited on.
+
+    The lock is held throughout the block, so it mustn't await anything
+    (such as sending messages): do that once it's left.
+    """
+
     def __init__(self, path: Path) -> None:
         super().__init__(path)
 
         self._dict: dict
+        self._mtime_ns: int = 0
 
-    def _open_json(self) -> None:
-        self._file = self._path.open("r+")
+    async def _lock_and_open(self) -> None:
+        await filelock.acquire_exclusive(self._path)
+
+        try:
+            self._file = self._path.open("r+b")
+        except:
+            filelock.release_exclusive(self._path)
+            raise
+
+        self._mtime_ns = os.fstat(self._file.fileno()).st_mtime_ns
+        metrics.count_storage("files_opened")
 
     def _close_json(self) -> None:
-        if self._file:
+        if not self._file:
+            return
+
+        try:
+            data: bytes = jsoncodec.dumps(self._dict, constants.PRETTY_JSON)
             self._file.seek(0)
             self._file.truncate(0)
-            dump(self._dict, self._file, indent=2)
+            self._file.write(data)
+            metrics.count_storage("bytes_written", len(data))
             self._file.close()
 
+            # Modification times are versions for caches (in any process),
+            # so each write must move it forward even within a clock tick.
+            mtime_ns: int = max(time_ns(), self._mtime_ns + 1)
+            os.utime(self._path, ns=(mtime_ns, mtime_ns))
+        finally:
+            self._file = None
+            filelock.release_exclusive(self._path)
+
     def __enter__(self):
-        self._dict = super().__enter__()
+        raise TypeError("JSONFileWrapperUpdate is used with async with")
+
+    async def __aenter__(self):
+        if not self._path.exists():
+            raise FileNotFoundError(self._path.name)
+
+        await self._lock_and_open()
+
+        try:
+            self._dict = self._load_json()
+        except:
+            # Nothing was read, so there's nothing to write back.
+            if self._file:
+                self._file.close()
+                self._file = None
+
+            filelock.release_exclusive(self._path)
+            raise
+
         return self._dict
+
+    async def __aexit__(self, exc_type, exc_value, trace) -> bool:
+        self._close_json()
+
+        return False
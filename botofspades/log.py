@@ -1,20 +1,97 @@
+import atexit
+import json
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from queue import SimpleQueue
+from typing import Optional
+
+from botofspades import metrics
+
+
+LOG_FILE_MAX_BYTES: int = 10_000_000
+LOG_FILE_BACKUPS: int = 5
+
+# Attributes added to every record, from the command being run (if any).
+CONTEXT_ATTRIBUTES: tuple[str, ...] = ("guild", "command", "latency")
 
 
 logger: logging.Logger = logging.getLogger("botofspades")
 
 
-def setup_logging() -> None:
-    formatter: logging.Formatter = logging.Formatter(
-        "[%(asctime)s] %(levelname)s: %(message)s"
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        command: Optional[metrics.CommandRecord] = metrics.current.get()
+
+        if not hasattr(record, "command"):
+            record.command = command.name if command else None
+
+        if not hasattr(record, "guild"):
+            record.guild = command.guild if command else None
+
+        if not hasattr(record, "latency"):
+            record.latency = command.elapsed if command else None
+
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            {
+                "time": self.formatTime(record),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+            }
+            | {
+                attribute: getattr(record, attribute, None)
+                for attribute in CONTEXT_ATTRIBUTES
+            }
+        )
+
+
+def setup_logging(
+    json_lines: bool = False, log_file: Optional[Path] = None
+) -> None:
+    """Logs through a queue, so handlers run on their own thread."""
+    formatter: logging.Formatter = (
+        JSONFormatter()
+        if json_lines
+        else logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s")
     )
 
-    handler: logging.StreamHandler = logging.StreamHandler()
-    handler.setLevel(logging.INFO)
-    handler.setFormatter(formatter)
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+
+    if log_file:
+        handlers.append(
+            RotatingFileHandler(
+                log_file,
+                maxBytes=LOG_FILE_MAX_BYTES,
+                backupCount=LOG_FILE_BACKUPS,
+                encoding="utf-8",
+            )
+        )
 
-    logger.setLevel(logging.INFO)
-    logger.addHandler(handler)
+    for handler in handlers:
+        handler.setLevel(logging.INFO)
+        handler.setFormatter(formatter)
+
+    log_queue: SimpleQueue = SimpleQueue()
+
+    queue_handler: QueueHandler = QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    listener: QueueListener = QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # discord.py's records go through the same queue (see bot.run's call).
+    for queued_logger in (logger, logging.getLogger("discord")):
+        queued_logger.setLevel(logging.INFO)
+        queued_logger.addHandler(queue_handler)
 
 
 def extension_loaded(name: str) -> None:
@@ -23,3 +100,69 @@ def extension_loaded(name: str) -> None:
 
 def extension_unloaded(name: str) -> None:
     logger.info(f"Extension unloaded: {name}")
+
+
+def command_deferred(
+    name: str, guild: Optional[int], elapsed: float
+) -> None:
+    logger.warning(
+        f"Command deferred after {elapsed * 1000:.0f} ms: {name}",
+        extra={"command": name, "guild": guild, "latency": elapsed},
+    )
+
+
+def command_completed(
+    name: str,
+    guild: Optional[int],
+    latency: float,
+    deferred: bool,
+    failed: bool,
+) -> None:
+    logger.info(
+        f"Command {'failed' if failed else 'completed'} in "
+        f"{latency * 1000:.0f} ms{' (deferred)' if deferred else ''}: {name}",
+        extra={"command": name, "guild": guild, "latency": latency},
+    )
+
+
+def tree_synced(key: str, tree_hash: str, forced: bool) -> None:
+    logger.info(
+        f"Command tree synced for {key} ({tree_hash[:12]})"
+        + (" (forced)" if forced else "")
+    )
+
+
+def tree_sync_skipped(key: str, tree_hash: str) -> None:
+    logger.info(f"Command tree unchanged for {key} ({tree_hash[:12]})")
+
+
+def memory_reported(
+    total: int, subsystem_growth: dict[str, int], top_growth: list[str]
+) -> None:
+    logger.info(
+        f"Traced memory: {total / 1_000_000:.1f} MB, growth since last "
+        "report: "
+        + ", ".join(
+            f"{name} {size / 1000:+.0f} kB"
+            for name, size in subsystem_growth.items()
+        )
+        + "".join(f"\n{line}" for line in top_growth)
+    )
+
+
+def loop_blocked(
+    culprit: str, commands: list[str], blocked_for: float, stack: str
+) -> None:
+    logger.warning(
+        f"Event loop blocked for over {blocked_for * 1000:.0f} ms by "
+        f"{culprit} (in progress: {', '.join(commands) or 'no commands'})"
+        f":\n{stack}",
+        extra={"command": culprit, "latency": blocked_for},
+    )
+
+
+def task_failed(name: str, error: BaseException) -> None:
+    logger.error(
+        f"Background task failed: {name}",
+        exc_info=(type(error), error, error.__traceback__),
+    )
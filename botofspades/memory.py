@@ -0,0 +1,133 @@
+import asyncio
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import discord
+
+from botofspades import constants
+
+
+# Subsystems allocations are attributed to, by the files allocating them.
+SUBSYSTEM_PATHS: dict[str, Path] = {
+    "charsheets": Path(__file__).parent / "extensions/charsheets",
+    "outmsg": Path(__file__).parent / "outmsg.py",
+    "botofspades": Path(__file__).parent,
+    "discord": Path(discord.__file__).parent,
+}
+
+# Longer (more specific) paths are matched first.
+subsystem_prefixes: list[tuple[str, str]] = sorted(
+    ((name, str(path)) for name, path in SUBSYSTEM_PATHS.items()),
+    key=lambda item: len(item[1]),
+    reverse=True,
+)
+
+# Allocations made by the tracing itself, or by importing modules, are noise.
+IGNORED_FILES: tuple[str, ...] = (
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+
+@dataclass
+class Growth:
+    location: str
+    size_diff: int
+    size: int
+
+
+@dataclass
+class MemoryReport:
+    total: int
+    subsystems: dict[str, int]
+    # Empty for the first report, which has nothing to compare against.
+    subsystem_growth: dict[str, int] = field(default_factory=dict)
+    top_growth: list[Growth] = field(default_factory=list)
+
+
+# Each caller (the periodic report, the memory command) compares against its
+# own previous snapshot, so neither resets the other's window.
+baselines: dict[str, tuple[tracemalloc.Snapshot, MemoryReport]] = {}
+latest_report: Optional[MemoryReport] = None
+
+
+def start() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(constants.MEMORY_TRACE_FRAMES)
+
+
+def get_subsystem(traceback: tracemalloc.Traceback) -> str:
+    """The subsystem of the innermost frame belonging to any of them."""
+    for frame in reversed(traceback):
+        for name, path in subsystem_prefixes:
+            if frame.filename.startswith(path):
+                return name
+
+    return "other"
+
+
+def _take_report(baseline: str) -> MemoryReport:
+    global latest_report
+
+    snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, file) for file in IGNORED_FILES]
+    )
+
+    subsystems: dict[str, int] = dict.fromkeys(
+        (*SUBSYSTEM_PATHS, "other"), 0
+    )
+
+    for trace in snapshot.traces:
+        subsystems[get_subsystem(trace.traceback)] += trace.size
+
+    report: MemoryReport = MemoryReport(sum(subsystems.values()), subsystems)
+
+    if baseline in baselines:
+        previous_snapshot, previous_report = baselines[baseline]
+        report.subsystem_growth = {
+            name: size - previous_report.subsystems[name]
+            for name, size in subsystems.items()
+        }
+        # Filtered before slicing, so shrinking lines don't take the slots.
+        report.top_growth = [
+            Growth(
+                f"{Path(stat.traceback[-1].filename).name}:"
+                f"{stat.traceback[-1].lineno}",
+                stat.size_diff,
+                stat.size,
+            )
+            for stat in snapshot.compare_to(previous_snapshot, "lineno")
+            if stat.size_diff > 0
+        ][: constants.MEMORY_TOP_GROWTH]
+
+    baselines[baseline] = (snapshot, report)
+    latest_report = report
+
+    return report
+
+
+async def take_report(baseline: str) -> MemoryReport:
+    """Snapshots memory, comparing it to the previous snapshot taken for the
+    same baseline (if any).
+
+    Starts tracing if it isn't yet, in which case only allocations made from
+    then on are seen.
+    """
+    start()
+
+    # Walking every traced allocation takes a while, so it's kept off the loop.
+    return await asyncio.to_thread(_take_report, baseline)
+
+
+def get_gauges() -> dict[str, float]:
+    if not latest_report:
+        return {}
+
+    return {
+        f"memory_{name}_bytes": size
+        for name, size in latest_report.subsystems.items()
+    }
@@ -0,0 +1,228 @@
+import asyncio
+import os
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Hashable, Optional
+
+
+# Upper bounds (in seconds) of the latency histogram buckets.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+STORAGE_COUNTERS: tuple[str, ...] = (
+    "files_opened",
+    "bytes_read",
+    "bytes_written",
+    "sheets_scanned",
+)
+
+
+@dataclass
+class Histogram:
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile as the upper bound of its bucket."""
+        rank: float = q * self.count
+        seen: int = 0
+
+        for bound, amount in zip(LATENCY_BUCKETS, self.buckets):
+            seen += amount
+
+            if seen >= rank:
+                return bound
+
+        return float("inf")
+
+
+@dataclass
+class StorageCounters:
+    files_opened: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    sheets_scanned: int = 0
+
+    def add(self, other: "StorageCounters") -> None:
+        for counter in STORAGE_COUNTERS:
+            setattr(
+                self, counter, getattr(self, counter) + getattr(other, counter)
+            )
+
+
+@dataclass
+class CommandMetrics:
+    latency: Histogram = field(default_factory=Histogram)
+    errors: int = 0
+    storage: StorageCounters = field(default_factory=StorageCounters)
+
+
+@dataclass
+class CommandRecord:
+    name: str
+    kind: str
+    guild: Optional[int]
+    started: float
+    storage: StorageCounters = field(default_factory=StorageCounters)
+    # The task running it, to tell which command is holding up the loop.
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+
+command_metrics: dict[tuple[str, str], CommandMetrics] = {}
+storage_totals: StorageCounters = StorageCounters()
+
+active: dict[Hashable, CommandRecord] = {}
+current: ContextVar[Optional[CommandRecord]] = ContextVar(
+    "current_command", default=None
+)
+
+
+def start_command(
+    key: Hashable, name: str, kind: str, guild: Optional[int]
+) -> None:
+    """Starts measuring a command, from within the task running it."""
+    record: CommandRecord = CommandRecord(
+        name, kind, guild, perf_counter(), task=asyncio.current_task()
+    )
+
+    active[key] = record
+    current.set(record)
+
+
+def finish_command(key: Hashable, failed: bool = False) -> None:
+    record: Optional[CommandRecord] = active.pop(key, None)
+
+    if not record:
+        return
+
+    metrics: CommandMetrics = command_metrics.setdefault(
+        (record.kind, record.name), CommandMetrics()
+    )
+
+    metrics.latency.observe(record.elapsed)
+    metrics.errors += failed
+    metrics.storage.add(record.storage)
+
+
+def count_storage(counter: str, amount: int = 1) -> None:
+    setattr(storage_totals, counter, getattr(storage_totals, counter) + amount)
+
+    record: Optional[CommandRecord] = current.get()
+
+    if record:
+        setattr(
+            record.storage, counter, getattr(record.storage, counter) + amount
+        )
+
+
+def get_stats_lines() -> list[str]:
+    lines: list[str] = []
+
+    for (kind, name), metrics in sorted(command_metrics.items()):
+        latency: Histogram = metrics.latency
+        lines.append(
+            f"{name} ({kind}): {latency.count} calls, {metrics.errors} "
+            f"errors, mean {latency.total / latency.count * 1000:.0f} ms, "
+            f"p50 <{latency.quantile(0.5) * 1000:.0f} ms, "
+            f"p95 <{latency.quantile(0.95) * 1000:.0f} ms, "
+            f"p99 <{latency.quantile(0.99) * 1000:.0f} ms, "
+            f"{metrics.storage.files_opened} files, "
+            f"{metrics.storage.bytes_read} B read, "
+            f"{metrics.storage.bytes_written} B written, "
+            f"{metrics.storage.sheets_scanned} sheets scanned\n"
+        )
+
+    return lines
+
+
+def escape_label_value(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def format_labels(**labels: str) -> str:
+    return ",".join(
+        f'{label}="{escape_label_value(value)}"'
+        for label, value in labels.items()
+    )
+
+
+def get_prometheus_text(gauges: dict[str, float]) -> str:
+    """Renders every metric in the Prometheus text exposition format."""
+    lines: list[str] = [
+        "# HELP botofspades_command_latency_seconds Command latency.",
+        "# TYPE botofspades_command_latency_seconds histogram",
+    ]
+
+    for (kind, name), metrics in sorted(command_metrics.items()):
+        labels: str = format_labels(command=name, kind=kind)
+        cumulative: int = 0
+
+        for bound, amount in zip(
+            (*LATENCY_BUCKETS, float("inf")), metrics.latency.buckets
+        ):
+            cumulative += amount
+            le: str = "+Inf" if bound == float("inf") else str(bound)
+            lines.append(
+                "botofspades_command_latency_seconds_bucket"
+                f'{{{labels},le="{le}"}} {cumulative}'
+            )
+
+        lines.append(
+            f"botofspades_command_latency_seconds_sum{{{labels}}} "
+            f"{metrics.latency.total}"
+        )
+        lines.append(
+            f"botofspades_command_latency_seconds_count{{{labels}}} "
+            f"{metrics.latency.count}"
+        )
+
+    lines.append("# TYPE botofspades_command_errors_total counter")
+    for (kind, name), metrics in sorted(command_metrics.items()):
+        lines.append(
+            "botofspades_command_errors_total"
+            f"{{{format_labels(command=name, kind=kind)}}} {metrics.errors}"
+        )
+
+    for counter in STORAGE_COUNTERS:
+        lines.append(f"# TYPE botofspades_{counter}_total counter")
+        lines.append(
+            f"botofspades_{counter}_total {getattr(storage_totals, counter)}"
+        )
+
+        for (kind, name), metrics in sorted(command_metrics.items()):
+            lines.append(
+                f"botofspades_{counter}_total"
+                f"{{{format_labels(command=name, kind=kind)}}} "
+                f"{getattr(metrics.storage, counter)}"
+            )
+
+    for name, value in gauges.items():
+        lines.append(f"# TYPE botofspades_{name} gauge")
+        lines.append(f"botofspades_{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_file(path: Path, gauges: dict[str, float]) -> None:
+    # Written to a temporary file first so the exporter never reads half of it.
+    temporary_path: Path = path.with_name(f".{path.name}.tmp")
+    temporary_path.write_text(get_prometheus_text(gauges))
+    os.replace(temporary_path, path)
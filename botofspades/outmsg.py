@@ -1,9 +1,13 @@
 import re
+from hashlib import sha256
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Iterable
 
 from discord import Interaction
 
+from botofspades.pagination import get_page_limit, pack_lines, send_pages
+
 
 DEF_INDENT_LEVEL: int = 4
 ESCAPE_SEQUENCES: dict[str, str] = {"\\n": "\n"}
@@ -11,6 +15,7 @@ ESCAPE_SEQUENCES: dict[str, str] = {"\\n": "\n"}
 
 outdefs_path: Path = Path.cwd() / "botofspades/outdefs.outdefs"
 defbank: dict[str, str] = {}
+defbank_hash: str = ""
 
 defend_re = re.compile(r"^\n")
 defname_re = re.compile(r"^\w{1,}\n")
@@ -29,8 +34,14 @@ async def send(itr: Interaction, defname: str, **replacements) -> None:
     await botsend(itr, out(defname, **replacements))
 
 
-async def botsend(itr: Interaction, msg: str) -> None:
-    await itr.response.send_message(msg)
+async def botsend(itr: Interaction, msg: str, embed: bool = False) -> None:
+    await botsend_lines(itr, msg.splitlines(keepends=True), embed)
+
+
+async def botsend_lines(
+    itr: Interaction, lines: Iterable[str], embed: bool = False
+) -> None:
+    await send_pages(itr, pack_lines(lines, get_page_limit(embed)), embed)
 
 
 def out(defname: str, **replacements) -> str:
@@ -43,10 +54,17 @@ def format_defdesc(desc: str) -> str:
     return " ".join(desc.strip().split()) + "\n"
 
 
-def update_defbank() -> None:
-    global defbank
+def update_defbank(force: bool = True) -> bool:
+    """Parses the outdefs file, skipping it if unchanged unless forced."""
+    global defbank, defbank_hash
+
+    outdefs_hash: str = sha256(outdefs_path.read_bytes()).hexdigest()
+
+    if not force and outdefs_hash == defbank_hash:
+        return False
 
     defbank = {}
+    defbank_hash = outdefs_hash
 
     defname: str = ""
     defdesc: str = ""
@@ -70,3 +88,5 @@ def update_defbank() -> None:
 
         if defname and defdesc:
             defbank[defname] = format_defdesc(defdesc)
+
+    return True
@@ -0,0 +1,164 @@
+from itertools import chain, islice
+from typing import Iterable, Iterator, Optional
+
+from discord import ButtonStyle, Embed, Interaction, ui
+
+from botofspades.constants import EMBED_DESCRIPTION_LIMIT, MESSAGE_LIMIT
+from botofspades.dispatch import edit_response, followup, respond
+
+
+# Pages beyond this amount are not sent as separate messages, they're browsed
+# through a PageView instead (one API call per page turned).
+MAX_MESSAGES_PER_INTERACTION: int = 3
+PAGE_VIEW_TIMEOUT: float = 300.0
+
+CODE_BLOCK: str = "```\n{}```"
+
+
+def out_lazily(defname: str) -> str:
+    # Imported on use, as outmsg imports this module.
+    from botofspades.outmsg import out
+
+    return out(defname)
+
+
+def get_page_limit(embed: bool) -> int:
+    return EMBED_DESCRIPTION_LIMIT if embed else MESSAGE_LIMIT
+
+
+def split_line(line: str, limit: int) -> Iterator[str]:
+    while len(line) > limit:
+        yield line[:limit]
+        line = line[limit:]
+
+    yield line
+
+
+def pack_lines(
+    lines: Iterable[str], limit: int = MESSAGE_LIMIT
+) -> Iterator[str]:
+    """Packs lines (newlines included) into as few pages as possible."""
+    page: str = ""
+
+    for line in lines:
+        for chunk in split_line(line, limit):
+            if len(page) + len(chunk) > limit:
+                yield page
+                page = ""
+
+            page += chunk
+
+    if page:
+        yield page
+
+
+def pack_code_block(
+    lines: Iterable[str], limit: int = MESSAGE_LIMIT
+) -> Iterator[str]:
+    """Packs lines into pages, each wrapped in its own code block."""
+    for page in pack_lines(lines, limit - len(CODE_BLOCK.format(""))):
+        yield CODE_BLOCK.format(page)
+
+
+def get_page_kwargs(page: str, embed: bool) -> dict:
+    return {"embed": Embed(description=page)} if embed else {"content": page}
+
+
+class PageView(ui.View):
+    """Browses pages, only rendering them as they're first requested."""
+
+    def __init__(
+        self, pages: Iterable[str], owner_id: int, embed: bool = False
+    ) -> None:
+        super().__init__(timeout=PAGE_VIEW_TIMEOUT)
+
+        # Only whoever ran the command can turn its pages.
+        self._owner_id: int = owner_id
+        self._pages: Iterator[str] = iter(pages)
+        self._rendered: list[str] = []
+        self._exhausted: bool = False
+        self._embed: bool = embed
+        self._index: int = 0
+
+        self._update_buttons()
+
+    def _render(self, index: int) -> bool:
+        while len(self._rendered) <= index and not self._exhausted:
+            page: Optional[str] = next(self._pages, None)
+
+            if page is None:
+                self._exhausted = True
+            else:
+                self._rendered.append(page)
+
+        return index < len(self._rendered)
+
+    def _update_buttons(self) -> None:
+        self._render(self._index)
+
+        self.previous.disabled = self._index == 0
+        self.next.disabled = not self._render(self._index + 1)
+        self.counter.label = f"{self._index + 1}/" + (
+            str(len(self._rendered)) if self._exhausted else "?"
+        )
+
+    async def interaction_check(self, itr: Interaction) -> bool:
+        if itr.user.id == self._owner_id:
+            return True
+
+        await itr.response.send_message(
+            out_lazily("PAGES_NOT_YOURS"), ephemeral=True
+        )
+        return False
+
+    @property
+    def current(self) -> str:
+        return self._rendered[self._index]
+
+    async def _turn(self, itr: Interaction, step: int) -> None:
+        self._index += step
+        self._update_buttons()
+
+        await edit_response(
+            itr, **get_page_kwargs(self.current, self._embed), view=self
+        )
+
+    @ui.button(label="◀", style=ButtonStyle.secondary)
+    async def previous(self, itr: Interaction, _: ui.Button) -> None:
+        await self._turn(itr, -1)
+
+    @ui.button(label="1/?", style=ButtonStyle.secondary, disabled=True)
+    async def counter(self, itr: Interaction, _: ui.Button) -> None:
+        await itr.response.defer()
+
+    @ui.button(label="▶", style=ButtonStyle.secondary)
+    async def next(self, itr: Interaction, _: ui.Button) -> None:
+        await self._turn(itr, 1)
+
+
+async def send_pages(
+    itr: Interaction, pages: Iterable[str], embed: bool = False
+) -> None:
+    page_iter: Iterator[str] = iter(pages)
+
+    # Only look one page past the cap to decide between plain messages and a
+    # PageView, the rest is left for the view to render on demand.
+    leading: list[str] = list(
+        islice(page_iter, MAX_MESSAGES_PER_INTERACTION + 1)
+    )
+
+    # Discord rejects empty messages.
+    if not leading:
+        leading = [out_lazily("NOTHING_TO_SHOW")]
+
+    if len(leading) > MAX_MESSAGES_PER_INTERACTION:
+        view: PageView = PageView(
+            chain(leading, page_iter), itr.user.id, embed
+        )
+        await respond(itr, **get_page_kwargs(view.current, embed), view=view)
+        return
+
+    await respond(itr, **get_page_kwargs(leading[0], embed))
+
+    for page in leading[1:]:
+        await followup(itr, **get_page_kwargs(page, embed))
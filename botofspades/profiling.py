@@ -0,0 +1,109 @@
+import asyncio
+import cProfile
+import os
+import pstats
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter, strftime
+from typing import Optional
+
+from botofspades import constants
+
+
+@dataclass
+class ProfileEntry:
+    function: str
+    calls: int
+    own: float
+    cumulative: float
+
+
+@dataclass
+class ProfileSession:
+    profiler: cProfile.Profile
+    started: float
+    max_commands: int
+    commands: int = 0
+    ended: float = 0.0
+    done: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+    @property
+    def elapsed(self) -> float:
+        return (self.ended or perf_counter()) - self.started
+
+
+# The profiler only exists (and only slows anything down) while a session runs.
+session: Optional[ProfileSession] = None
+
+
+def is_running() -> bool:
+    return session is not None
+
+
+async def profile(max_commands: int, seconds: float) -> ProfileSession:
+    """Profiles everything the bot does until enough commands finish (if
+    max_commands isn't zero) or the given time passes.
+    """
+    global session
+
+    session = ProfileSession(cProfile.Profile(), perf_counter(), max_commands)
+    session.profiler.enable()
+
+    try:
+        await asyncio.wait_for(asyncio.shield(session.done), seconds)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        session.profiler.disable()
+        session.ended = perf_counter()
+        finished, session = session, None
+
+    return finished
+
+
+def command_finished() -> None:
+    if not session or not session.max_commands:
+        return
+
+    session.commands += 1
+
+    if session.commands >= session.max_commands and not session.done.done():
+        session.done.set_result(None)
+
+
+def write_profile(finished: ProfileSession) -> Path:
+    constants.PROFILE_DIR.mkdir(exist_ok=True)
+
+    # Named after the process too, as shard processes share a directory.
+    path: Path = (
+        constants.PROFILE_DIR
+        / f"{strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof"
+    )
+    finished.profiler.dump_stats(path)
+
+    return path
+
+
+def get_function_name(file: str, line: int, function: str) -> str:
+    # Built-ins have no file.
+    if file == "~":
+        return function
+
+    return f"{Path(file).name}:{line}({function})"
+
+
+def get_top_entries(
+    finished: ProfileSession, amount: int
+) -> list[ProfileEntry]:
+    stats: dict = pstats.Stats(finished.profiler).stats  # type: ignore
+
+    entries: list[ProfileEntry] = [
+        ProfileEntry(get_function_name(*function), calls, own, cumulative)
+        for function, (_, calls, own, cumulative, _) in stats.items()
+    ]
+
+    entries.sort(key=lambda entry: entry.cumulative, reverse=True)
+
+    return entries[:amount]
@@ -0,0 +1,47 @@
+from typing import Any, Callable, TypeVar
+
+
+# Extension modules are re-executed when reloaded, so anything they need to
+# keep across reloads lives here instead, keyed by "<extension>.<name>".
+
+T = TypeVar("T")
+
+state: dict[str, Any] = {}
+flushers: dict[str, Callable[[], None]] = {}
+
+
+def get_state(key: str, factory: Callable[[], T]) -> T:
+    """Returns the object stored at key, creating it on first use.
+
+    If factory is a class and the stored object comes from an older version
+    of it (its module was reloaded since), the object is rebound to the new
+    class so its data is kept but its methods are current.
+    """
+    if key not in state:
+        state[key] = factory()
+        return state[key]
+
+    value: Any = state[key]
+
+    if (
+        isinstance(factory, type)
+        and type(value) is not factory
+        and type(value).__qualname__ == factory.__qualname__
+        and hasattr(value, "__dict__")
+    ):
+        rebound: Any = factory.__new__(factory)
+        rebound.__dict__ = value.__dict__
+        state[key] = rebound
+
+    return state[key]
+
+
+def register_flush(key: str, flush: Callable[[], None]) -> None:
+    """Registers a callback writing out state that hasn't been saved yet."""
+    flushers[key] = flush
+
+
+def flush(prefix: str = "") -> None:
+    for key, flusher in list(flushers.items()):
+        if key.startswith(prefix):
+            flusher()
@@ -0,0 +1,75 @@
+import subprocess
+import sys
+
+from botofspades.log import logger
+
+
+# Every shard process shares the charsheets store through OS file locks (see
+# botofspades.filelock), and caches notice other processes' writes through
+# the files' modification times, so processes need no other coordination.
+
+
+def parse_shard_ids(text: str) -> list[int]:
+    """Parses shard IDs written as "0-3", "4,6" or a mix of both."""
+    shard_ids: list[int] = []
+
+    for part in text.split(","):
+        first, _, last = part.strip().partition("-")
+        shard_ids.extend(range(int(first), int(last or first) + 1))
+
+    return shard_ids
+
+
+def format_shard_ids(shard_ids: list[int]) -> str:
+    return ",".join(str(shard_id) for shard_id in shard_ids)
+
+
+def split_shards(shard_count: int, processes: int) -> list[list[int]]:
+    """Splits shards into contiguous, evenly sized ranges per process."""
+    processes = min(processes, shard_count)
+
+    return [
+        list(
+            range(
+                shard_count * process // processes,
+                shard_count * (process + 1) // processes,
+            )
+        )
+        for process in range(processes)
+    ]
+
+
+def is_primary_process(shard_ids: list[int] | None) -> bool:
+    """Whether this process handles global tasks (such as tree syncs)."""
+    return shard_ids is None or 0 in shard_ids
+
+
+def launch(shard_count: int, processes: int, *args: str) -> int:
+    """Runs the bot as one child process per shard range until all exit."""
+    children: list[subprocess.Popen] = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "botofspades",
+                "--shard-count",
+                str(shard_count),
+                "--shards",
+                format_shard_ids(shard_ids),
+                *args,
+            ]
+        )
+        for shard_ids in split_shards(shard_count, processes)
+    ]
+
+    logger.info(
+        f"Launched {len(children)} processes for {shard_count} shards"
+    )
+
+    try:
+        return max(child.wait() for child in children)
+    except KeyboardInterrupt:
+        for child in children:
+            child.terminate()
+
+        return max(child.wait() for child in children)
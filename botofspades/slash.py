@@ -1,7 +1,19 @@
+from hashlib import sha256
+from json import dumps
+from pathlib import Path
+
 from discord.ext import commands
 from discord import app_commands as apc
 
 from botofspades import constants
+from botofspades.jsonwrappers import (
+    JSONFileWrapperReadOnly,
+    JSONFileWrapperUpdate,
+)
+from botofspades.log import tree_sync_skipped, tree_synced
+
+
+tree_hashes_path: Path = Path.cwd() / ".TREE_HASHES"
 
 
 def add_slash_command(
@@ -12,3 +24,41 @@ def add_slash_command(
 
 def remove_slash_command(bot: commands.Bot, command_name: str) -> None:
     bot.tree.remove_command(command_name, guild=constants.TARGET_GUILD)
+
+
+def get_tree_hash(bot: commands.Bot) -> str:
+    payload: list[dict] = [
+        command.to_dict(bot.tree)
+        for command in bot.tree.get_commands(guild=constants.TARGET_GUILD)
+    ]
+
+    return sha256(dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def get_tree_hash_key(bot: commands.Bot) -> str:
+    return f"{bot.application_id}:" + (
+        str(constants.TARGET_GUILD.id) if constants.TARGET_GUILD else "global"
+    )
+
+
+async def sync_tree(bot: commands.Bot, force: bool = False) -> bool:
+    """Syncs the command tree unless it's unchanged since the last sync."""
+    tree_hash: str = get_tree_hash(bot)
+    key: str = get_tree_hash_key(bot)
+
+    tree_hashes_path.touch()
+
+    with JSONFileWrapperReadOnly(tree_hashes_path) as tree_hashes:
+        if not force and tree_hashes.get(key) == tree_hash:
+            tree_sync_skipped(key, tree_hash)
+            return False
+
+    # No lock is held while waiting on Discord, so other processes aren't
+    # held up on the file meanwhile.
+    await bot.tree.sync(guild=constants.TARGET_GUILD)
+
+    async with JSONFileWrapperUpdate(tree_hashes_path) as tree_hashes:
+        tree_hashes[key] = tree_hash
+
+    tree_synced(key, tree_hash, force)
+    return True
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator
+
+from botofspades.log import logger
+
+
+phases: dict[str, float] = {}
+reported: bool = False
+
+
+def record(phase: str, elapsed: float) -> None:
+    phases[phase] = phases.get(phase, 0.0) + elapsed
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    started: float = perf_counter()
+
+    try:
+        yield
+    finally:
+        record(phase, perf_counter() - started)
+
+
+def report() -> None:
+    global reported
+
+    if reported:
+        return
+
+    reported = True
+
+    logger.info(
+        "Startup took "
+        + ", ".join(
+            f"{phase} {elapsed * 1000:.0f} ms"
+            for phase, elapsed in phases.items()
+        )
+        + f" (total {sum(phases.values()) * 1000:.0f} ms)"
+    )
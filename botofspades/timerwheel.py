@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class Timer(Generic[T]):
+    expires: int
+    item: T
+    cancelled: bool = False
+
+    def cancel(self) -> None:
+        # Cancelled timers are dropped when their slot comes up.
+        self.cancelled = True
+
+
+class TimerWheel(Generic[T]):
+    """Schedules items a number of ticks ahead, in a hierarchical timer wheel.
+
+    Each level has slots spanning slots**level ticks, so a timer sits in the
+    lowest level its expiry fits in and moves down a level each time the
+    slot it's in comes up. Scheduling is O(1) and each tick only touches the
+    timers due then or moving down, however many are pending.
+    """
+
+    def __init__(self, slots: int = 64, levels: int = 4) -> None:
+        self.slots: int = slots
+        self.levels: int = levels
+        self.now: int = 0
+        self.wheels: list[list[list[Timer[T]]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+
+    @property
+    def max_delay(self) -> int:
+        return self.slots**self.levels - 1
+
+    def _insert(self, timer: Timer[T]) -> None:
+        delay: int = timer.expires - self.now
+
+        for level in range(self.levels):
+            if delay < self.slots ** (level + 1):
+                self.wheels[level][
+                    timer.expires // self.slots**level % self.slots
+                ].append(timer)
+                return
+
+    def schedule(self, delay: int, item: T) -> Timer[T]:
+        """Schedules item to come up delay ticks from now.
+
+        Raises ValueError if delay is below 1 or above max_delay.
+        """
+        if not 1 <= delay <= self.max_delay:
+            raise ValueError(delay)
+
+        timer: Timer[T] = Timer(self.now + delay, item)
+        self._insert(timer)
+
+        return timer
+
+    def advance(self) -> list[T]:
+        """Moves a tick forward, returning the items due on it."""
+        self.now += 1
+
+        # Higher levels first, as their timers may move into the slot of a
+        # lower level that comes up on this same tick.
+        for level in range(self.levels - 1, 0, -1):
+            span: int = self.slots**level
+
+            if self.now % span:
+                continue
+
+            slot: int = self.now // span % self.slots
+            timers: list[Timer[T]] = self.wheels[level][slot]
+            self.wheels[level][slot] = []
+
+            for timer in timers:
+                if not timer.cancelled:
+                    self._insert(timer)
+
+        slot = self.now % self.slots
+        due: list[Timer[T]] = self.wheels[0][slot]
+        self.wheels[0][slot] = []
+
+        return [timer.item for timer in due if not timer.cancelled]
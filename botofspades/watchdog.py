@@ -0,0 +1,150 @@
+import asyncio
+import sys
+import threading
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic, sleep
+from types import FrameType
+from typing import Optional
+
+from botofspades import background, constants, metrics
+from botofspades.log import loop_blocked
+
+
+@dataclass
+class Stall:
+    # What the loop was running: the command (or else the task) and the
+    # bot's innermost frame in it.
+    culprit: str
+    # Every command in progress, most of them just waiting on something.
+    commands: list[str]
+    blocked_for: float
+    stack: str
+
+
+@dataclass
+class LoopStats:
+    lag: float = 0.0
+    max_lag: float = 0.0
+    stalls: int = 0
+
+
+stats: LoopStats = LoopStats()
+recent_stalls: deque[Stall] = deque(maxlen=10)
+
+last_tick: float = monotonic()
+loop: Optional[asyncio.AbstractEventLoop] = None
+loop_thread_id: Optional[int] = None
+
+
+async def measure_lag() -> None:
+    """Ticks every interval, measuring how late the loop woke it up."""
+    global last_tick
+
+    while True:
+        expected: float = monotonic() + constants.WATCHDOG_INTERVAL
+        await asyncio.sleep(constants.WATCHDOG_INTERVAL)
+
+        last_tick = monotonic()
+        stats.lag = max(0.0, last_tick - expected)
+        stats.max_lag = max(stats.max_lag, stats.lag)
+
+
+def get_location(frame: FrameType) -> str:
+    """The innermost of the bot's own frames in a stack (or the innermost
+    frame, if none are), as the blocking call is usually made from there.
+    """
+    summaries: traceback.StackSummary = traceback.extract_stack(frame)
+    summary: traceback.FrameSummary = next(
+        (
+            summary
+            for summary in reversed(summaries)
+            if "botofspades" in Path(summary.filename).parts
+        ),
+        summaries[-1],
+    )
+
+    return f"{summary.name} ({Path(summary.filename).name}:{summary.lineno})"
+
+
+def get_running_name() -> str:
+    """Names the command whose task the loop is running, or else the task."""
+    task: Optional[asyncio.Task] = (
+        asyncio.current_task(loop) if loop else None
+    )
+
+    if not task:
+        return "no task"
+
+    for record in list(metrics.active.values()):
+        if record.task is task:
+            return record.name
+
+    return task.get_coro().__qualname__
+
+
+def sample(blocked_for: float) -> Stall:
+    """Samples what the loop is running, from another thread."""
+    frame: Optional[FrameType] = sys._current_frames().get(
+        loop_thread_id or 0
+    )
+
+    # Both are taken while the loop's blocked, so they agree.
+    return Stall(
+        (
+            f"{get_running_name()} in {get_location(frame)}"
+            if frame
+            else get_running_name()
+        ),
+        [record.name for record in list(metrics.active.values())],
+        blocked_for,
+        "".join(traceback.format_stack(frame)) if frame else "",
+    )
+
+
+def watch() -> None:
+    """Runs on its own thread, sampling the loop whenever it stops ticking."""
+    reported_tick: float = 0.0
+
+    while True:
+        sleep(constants.WATCHDOG_INTERVAL)
+
+        blocked_for: float = monotonic() - last_tick
+
+        # Only the first sample of each stall is reported.
+        if (
+            blocked_for < constants.WATCHDOG_THRESHOLD
+            or reported_tick == last_tick
+        ):
+            continue
+
+        reported_tick = last_tick
+
+        stall: Stall = sample(blocked_for)
+
+        stats.stalls += 1
+        recent_stalls.append(stall)
+        loop_blocked(
+            stall.culprit, stall.commands, stall.blocked_for, stall.stack
+        )
+
+
+def start() -> None:
+    global last_tick, loop, loop_thread_id
+
+    last_tick = monotonic()
+    loop = asyncio.get_running_loop()
+    loop_thread_id = threading.get_ident()
+
+    background.spawn(measure_lag())
+    threading.Thread(target=watch, name="loop-watchdog", daemon=True).start()
+
+
+def get_gauges() -> dict[str, float]:
+    return {
+        "loop_lag_seconds": stats.lag,
+        "loop_max_lag_seconds": stats.max_lag,
+        "loop_stalls": stats.stalls,
+    }
@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+from botofspades.outmsg import update_defbank
+
+
+# Messages are read from the outdefs file (relative to the repository root,
+# where the tests are run from).
+@pytest.fixture(scope="session", autouse=True)
+def defbank() -> None:
+    update_defbank()
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    """The charsheets extension, with its templates and sheets kept in
+    tmp_path.
+    """
+    from botofspades.extensions import charsheets
+
+    for name in ("templates", "sheets"):
+        (tmp_path / name).mkdir()
+
+    monkeypatch.setattr(charsheets, "templates_dir", tmp_path / "templates")
+    monkeypatch.setattr(charsheets, "charsheets_dir", tmp_path / "sheets")
+
+    return charsheets
+
+
+@pytest.fixture
+def write_template(store: ModuleType) -> Callable[[str, dict], None]:
+    """Writes a template with the given fields to the store."""
+
+    def write(name: str, fields: dict) -> None:
+        store.get_template_path(name).write_text(
+            json.dumps({"fields": fields})
+        )
+
+    return write
@@ -0,0 +1,121 @@
+import asyncio
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Mapping, Optional
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from yarl import URL
+
+from botofspades import api, changes
+
+
+class FakeBot:
+    def __init__(self, charsheets: Optional[ModuleType]) -> None:
+        self.extensions: dict[str, ModuleType] = (
+            {api.CHARSHEETS_EXTENSION: charsheets} if charsheets else {}
+        )
+
+
+async def fetch(
+    bot: FakeBot, path: str, headers: Optional[dict] = None
+) -> tuple[int, Mapping[str, str], Any]:
+    app: web.Application = api.create_app(bot)  # type: ignore
+
+    async with TestClient(TestServer(app)) as client:
+        # Sent as written, so escapes like %2F reach the server.
+        response = await client.get(
+            URL(path, encoded=True), headers=headers or {}
+        )
+        body: bytes = await response.read()
+
+        return (
+            response.status,
+            response.headers,
+            (
+                json.loads(body)
+                if response.content_type == "application/json"
+                else body
+            ),
+        )
+
+
+@pytest.fixture
+def bot(store: ModuleType) -> FakeBot:
+    store.get_template_path("hero").write_text(
+        json.dumps({"fields": {"level": {"type": "abacus", "default": 1}}})
+    )
+    store.get_sheet_path("ada").write_text(
+        json.dumps({"template": "hero", "fields": {"level": 3}})
+    )
+
+    return FakeBot(store)
+
+
+def test_lists_and_documents(bot: FakeBot) -> None:
+    assert asyncio.run(fetch(bot, "/sheets"))[2] == {"sheets": ["ada"]}
+    assert asyncio.run(fetch(bot, "/templates"))[2] == {"templates": ["hero"]}
+
+    status, headers, sheet = asyncio.run(fetch(bot, "/sheets/Ada"))
+
+    assert status == 200
+    assert sheet == {"name": "ada", "template": "hero", "fields": {"level": 3}}
+    assert headers["Access-Control-Allow-Origin"] == "*"
+
+
+def test_unchanged_documents_arent_sent_again(bot: FakeBot) -> None:
+    etag: str = asyncio.run(fetch(bot, "/sheets/ada"))[1]["ETag"]
+
+    status, headers, _ = asyncio.run(
+        fetch(bot, "/sheets/ada", {"If-None-Match": f"W/{etag}"})
+    )
+
+    assert status == 304
+    assert headers["ETag"] == etag
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/sheets/missing",
+        "/sheets/..%2Fsecret",
+        "/sheets/..%2Ftemplates%2Fhero",
+        "/templates/..%2Fsecret",
+        "/sheets/%2E%2E%2Fsecret",
+        "/sheets/ada%00",
+    ],
+)
+def test_documents_outside_the_store_are_not_found(
+    bot: FakeBot, store: ModuleType, path: str
+) -> None:
+    secret: Path = store.charsheets_dir.parent / "secret.json"
+    secret.write_text(json.dumps({"token": "hunter2"}))
+
+    status, _, body = asyncio.run(fetch(bot, path))
+
+    assert status == 404
+    assert b"hunter2" not in body
+
+
+def test_without_charsheets(store: ModuleType) -> None:
+    assert asyncio.run(fetch(FakeBot(None), "/sheets"))[0] == 503
+
+
+def test_polling_returns_changes_since(
+    bot: FakeBot, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    feed: changes.ChangeFeed = changes.ChangeFeed()
+    monkeypatch.setattr(changes, "feed", feed)
+    feed.publish("sheet", "ada")
+    feed.publish("template", "hero")
+
+    status, _, body = asyncio.run(fetch(bot, "/changes?since=1&timeout=0"))
+
+    assert status == 200
+    assert body == {
+        "seq": 2,
+        "changes": [{"seq": 2, "kind": "template", "name": "hero"}],
+    }
+    assert asyncio.run(fetch(bot, "/changes?since=x"))[0] == 400
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+from typing import Optional
+
+import pytest
+
+from botofspades import background, metrics
+
+
+def test_spawned_tasks_are_kept_until_done() -> None:
+    async def run() -> None:
+        finished: asyncio.Event = asyncio.Event()
+        task: asyncio.Task = background.spawn(finished.wait())
+
+        assert task in background.tasks
+
+        finished.set()
+        await task
+        await asyncio.sleep(0)
+
+        assert task not in background.tasks
+
+    asyncio.run(run())
+
+
+def test_spawned_task_failures_are_logged(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    async def fail() -> None:
+        raise KeyError("missing")
+
+    async def run() -> None:
+        task: asyncio.Task = background.spawn(fail())
+        await asyncio.wait([task])
+        await asyncio.sleep(0)
+
+    with caplog.at_level(logging.ERROR, logger="botofspades"):
+        asyncio.run(run())
+
+    assert "Background task failed" in caplog.text
+    assert "fail" in caplog.text
+    assert "KeyError" in caplog.text
+
+
+def test_spawned_tasks_arent_part_of_the_command_spawning_them() -> None:
+    async def get_command() -> str:
+        record: Optional[metrics.CommandRecord] = metrics.current.get()
+        return record.name if record else ""
+
+    async def run() -> str:
+        metrics.start_command("spawning", "sheet do", "app", None)
+        command: str = await background.spawn(get_command())
+        metrics.finish_command("spawning")
+
+        return command
+
+    assert asyncio.run(run()) == ""
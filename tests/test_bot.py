@@ -0,0 +1,27 @@
+import pytest
+from discord import Intents
+
+from botofspades import constants
+from botofspades.bot import get_bot_intents
+from botofspades.extensions import intotheodd
+
+
+def test_intents_drop_messages(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(constants, "LEAN_MODE", False)
+
+    intents: Intents = get_bot_intents()
+
+    assert intents.guilds
+    assert not intents.guild_messages and not intents.dm_messages
+    assert not intents.message_content
+
+
+def test_lean_intents_are_the_extensions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(constants, "LEAN_MODE", True)
+
+    intents: Intents = get_bot_intents()
+
+    assert intents == Intents(guilds=True) | intotheodd.INTENTS
+    assert intents == Intents(guilds=True)
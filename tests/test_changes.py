@@ -0,0 +1,54 @@
+import asyncio
+
+from botofspades.changes import Change, ChangeFeed
+
+
+def test_since_returns_the_changes_after_a_sequence() -> None:
+    feed: ChangeFeed = ChangeFeed()
+    published: list[Change] = [
+        feed.publish("sheet", name) for name in ("ada", "bo", "cy")
+    ]
+
+    assert feed.since(0) == published
+    assert feed.since(1) == published[1:]
+    assert feed.since(3) == []
+
+
+def test_since_is_none_when_changes_were_missed() -> None:
+    feed: ChangeFeed = ChangeFeed(history=2)
+
+    # Nothing's been published yet, or it's from before a restart.
+    assert feed.since(5) is None
+
+    for name in ("ada", "bo", "cy", "dee"):
+        feed.publish("sheet", name)
+
+    assert feed.since(1) is None
+    assert [change.name for change in feed.since(2) or []] == ["cy", "dee"]
+    assert feed.since(5) is None
+
+
+def test_subscribers_get_every_change() -> None:
+    feed: ChangeFeed = ChangeFeed()
+    seen: list[Change] = []
+    feed.subscribe(seen.append)
+
+    change: Change = feed.publish("template", "hero")
+    feed.unsubscribe(seen.append)
+    feed.publish("template", "hero")
+
+    assert seen == [change]
+
+
+def test_wait_wakes_on_a_change() -> None:
+    async def run() -> None:
+        feed: ChangeFeed = ChangeFeed()
+        waiting: asyncio.Task = asyncio.create_task(feed.wait(0, 5.0))
+        await asyncio.sleep(0)
+
+        change: Change = feed.publish("sheet", "ada")
+
+        assert await waiting == [change]
+        assert await feed.wait(1, 0.01) == []
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+import asyncio
+import json
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+
+def read_fields(store: ModuleType, sheet: str) -> dict:
+    return json.loads(store.get_sheet_path(sheet).read_text())["fields"]
+
+
+def test_created_sheets_store_values_as_typed(
+    store: ModuleType, write_template: Callable
+) -> None:
+    write_template(
+        "hero",
+        {
+            "level": {"type": "abacus", "default": 1},
+            "speed": {"type": "rational", "default": 1.0},
+            "name": {"type": "scroll", "default": ""},
+        },
+    )
+
+    asyncio.run(
+        store.create_sheet(
+            "ada", "hero", {"level": "3", "speed": 2, "name": 7, "other": 1}
+        )
+    )
+
+    assert read_fields(store, "ada") == {"level": 3, "speed": 2.0, "name": "7"}
+    assert isinstance(read_fields(store, "ada")["speed"], float)
+
+
+def test_created_sheets_reject_invalid_values(
+    store: ModuleType, write_template: Callable
+) -> None:
+    write_template("hero", {"level": {"type": "abacus", "default": 1}})
+
+    with pytest.raises(ValueError, match="level"):
+        asyncio.run(store.create_sheet("ada", "hero", {"level": "high"}))
+
+    assert not store.get_sheet_path("ada").exists()
+
+
+def test_sheet_lists_skip_sheets_removed_meanwhile(
+    store: ModuleType, write_template: Callable
+) -> None:
+    write_template("hero", {"level": {"type": "abacus", "default": 1}})
+    write_template("foe", {"level": {"type": "abacus", "default": 1}})
+
+    for sheet, template in (("ada", "hero"), ("bob", "hero"), ("cy", "foe")):
+        asyncio.run(store.create_sheet(sheet, template))
+
+    lines = store.get_sheet_list_lines("hero")
+    first_line: str = next(lines)
+    # Removed after the first page's been shown, and before the next one.
+    store.remove_sheet("bob" if "Ada" in first_line else "ada")
+
+    assert list(lines) == []
@@ -0,0 +1,31 @@
+import asyncio
+import multiprocessing
+
+import pytest
+
+from botofspades import combat, constants
+from botofspades.combat import Combatant
+
+
+def test_shutting_down_stops_the_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(constants, "COMBAT_WORKERS", 2)
+    party: tuple[Combatant, ...] = (Combatant("ada", 8, 12, 1, "d8"),)
+    mob: tuple[Combatant, ...] = (Combatant("rat", 3, 6, 0, "d4"),)
+
+    result: combat.SimulationResult = asyncio.run(
+        combat.simulate(party, mob, 100, seed=1)
+    )
+    workers: list = multiprocessing.active_children()
+
+    assert result.party_wins + result.mob_wins + result.draws == 100
+    assert workers
+
+    combat.shutdown_executor()
+
+    for process in workers:
+        process.join(30)
+        assert not process.is_alive()
+
+    assert combat.executor is None
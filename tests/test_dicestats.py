@@ -0,0 +1,93 @@
+import time
+from collections import Counter
+from fractions import Fraction
+from itertools import product
+
+import pytest
+
+from botofspades import dicestats
+from botofspades.dicestats import Distribution
+
+
+def brute_force(amount: int, sides: int, keep: int = 0) -> Distribution:
+    counts: Counter = Counter(
+        sum(sorted(rolls)[-keep:] if keep else rolls)
+        for rolls in product(range(1, sides + 1), repeat=amount)
+    )
+
+    return Distribution(
+        min(counts),
+        tuple(counts[value] for value in range(min(counts), max(counts) + 1)),
+    )
+
+
+@pytest.mark.parametrize("amount, sides", [(1, 6), (2, 6), (3, 6), (5, 4)])
+def test_dice_match_every_roll(amount: int, sides: int) -> None:
+    assert dicestats.dice(amount, sides) == brute_force(amount, sides)
+
+
+@pytest.mark.parametrize(
+    "amount, sides, keep", [(2, 20, 1), (4, 6, 3), (3, 8, 2)]
+)
+def test_kept_dice_match_every_roll(
+    amount: int, sides: int, keep: int
+) -> None:
+    assert dicestats.kept_dice(amount, sides, keep, True) == brute_force(
+        amount, sides, keep
+    )
+
+
+def test_expressions() -> None:
+    distribution: Distribution = dicestats.parse("2d6 + 3 - d4")
+
+    assert (distribution.minimum, distribution.maximum) == (1, 14)
+    assert distribution.mean() == Fraction(15, 2)
+    assert dicestats.parse("d20").chance_at_least(11) == Fraction(1, 2)
+    assert dicestats.parse("3d6").percentile(50) == 10
+    # Kept lowest is kept highest mirrored.
+    mirrored: Distribution = -dicestats.parse("2d20kl1") + dicestats.constant(
+        21
+    )
+    assert mirrored == dicestats.parse("2d20kh1")
+
+
+@pytest.mark.parametrize(
+    "expression, part",
+    [
+        ("", ""),
+        ("3d6 + x", "+ x"),
+        ("101d6", "101d6"),
+        ("4d6kh5", "4d6kh5"),
+        ("100d1000kh1", "100d1000kh1"),
+        ("2d150kh1 + 2d150kh1", "+ 2d150kh1"),
+        ("d1000 + d1000", "d1000 + d1000"),
+    ],
+)
+def test_invalid_expressions(expression: str, part: str) -> None:
+    with pytest.raises(ValueError) as error:
+        dicestats.parse(expression)
+
+    assert error.value.args[0].strip(" +") == part.strip(" +")
+
+
+def test_largest_rolls_stay_quick() -> None:
+    # The costliest kept dice the bounds allow, and the most plain dice.
+    dicestats.kept_dice.cache_clear()
+    dicestats.dice.cache_clear()
+    start: float = time.perf_counter()
+
+    dicestats.parse.__wrapped__("2d154kh1")
+    dicestats.parse.__wrapped__("100d10")
+
+    # Generous, as test machines vary: these take around 40 ms together.
+    assert time.perf_counter() - start < 0.5
+
+
+def test_too_wide_expressions_are_rejected_before_convolving() -> None:
+    start: float = time.perf_counter()
+
+    with pytest.raises(ValueError):
+        dicestats.parse.__wrapped__("d1000 + d1000")
+
+    # Convolving them would take tens of milliseconds.
+    assert time.perf_counter() - start < 0.03
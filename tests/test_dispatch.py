@@ -0,0 +1,194 @@
+import asyncio
+from time import monotonic
+from typing import Any
+
+from botofspades import background
+from botofspades.dispatch import (
+    PRIORITY_FOLLOWUP,
+    PRIORITY_RESPONSE,
+    Dispatcher,
+    TokenBucket,
+)
+
+
+class FakeHTTP:
+    """Records what's sent, and when, in place of Discord's API."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[float, dict[str, Any]]] = []
+
+    async def send(self, **kwargs) -> str:
+        self.sent.append((monotonic(), kwargs))
+        return kwargs.get("content", "")
+
+    async def fail(self, **kwargs) -> None:
+        raise RuntimeError("rejected")
+
+
+def test_token_bucket_refills_at_its_rate() -> None:
+    bucket: TokenBucket = TokenBucket(2, 1.0, now=0.0)
+
+    bucket.take(0.0)
+    bucket.take(0.0)
+    assert bucket.delay(0.0) == 0.5
+
+    # Half a period later, one token has come back.
+    assert bucket.delay(0.5) == 0.0
+
+
+def test_token_bucket_never_exceeds_its_capacity() -> None:
+    bucket: TokenBucket = TokenBucket(2, 1.0, now=0.0)
+
+    assert bucket.delay(100.0) == 0.0
+    bucket.take(100.0)
+    bucket.take(100.0)
+    assert bucket.delay(100.0) > 0.0
+
+
+def test_dispatcher_paces_bursts() -> None:
+    http: FakeHTTP = FakeHTTP()
+
+    async def send_all() -> float:
+        dispatcher: Dispatcher = Dispatcher(burst=2, period=0.2)
+        started: float = monotonic()
+
+        await asyncio.gather(
+            *(
+                dispatcher.submit(
+                    PRIORITY_FOLLOWUP, 1, http.send, content=str(number)
+                )
+                for number in range(4)
+            )
+        )
+
+        return started
+
+    started: float = asyncio.run(send_all())
+    times: list[float] = [time - started for time, _ in http.sent]
+
+    # Two go out at once, the rest one per token (every 0.1 s).
+    assert times[1] < 0.05
+    assert times[2] >= 0.09
+    assert times[3] >= 0.19
+
+
+def test_dispatcher_paces_channels_separately() -> None:
+    http: FakeHTTP = FakeHTTP()
+
+    async def send_all() -> float:
+        dispatcher: Dispatcher = Dispatcher(burst=1, period=1.0)
+        started: float = monotonic()
+
+        await asyncio.gather(
+            *(
+                dispatcher.submit(PRIORITY_FOLLOWUP, channel, http.send)
+                for channel in range(3)
+            )
+        )
+
+        return started
+
+    started: float = asyncio.run(send_all())
+
+    assert all(time - started < 0.05 for time, _ in http.sent)
+
+
+def test_dispatcher_sends_responses_first() -> None:
+    http: FakeHTTP = FakeHTTP()
+
+    async def send_all() -> None:
+        dispatcher: Dispatcher = Dispatcher()
+
+        await asyncio.gather(
+            dispatcher.submit(PRIORITY_FOLLOWUP, 1, http.send, content="f1"),
+            dispatcher.submit(PRIORITY_FOLLOWUP, 1, http.send, content="f2"),
+            dispatcher.submit(PRIORITY_RESPONSE, 1, http.send, content="r"),
+        )
+
+    asyncio.run(send_all())
+
+    assert [kwargs["content"] for _, kwargs in http.sent] == ["r", "f1", "f2"]
+
+
+def test_dispatcher_coalesces_messages_to_a_destination() -> None:
+    http: FakeHTTP = FakeHTTP()
+
+    async def send_all() -> list[Any]:
+        dispatcher: Dispatcher = Dispatcher()
+
+        results: list[Any] = await asyncio.gather(
+            *(
+                dispatcher.submit(
+                    PRIORITY_FOLLOWUP,
+                    1,
+                    http.send,
+                    destination="here",
+                    content=content,
+                )
+                for content in ("a", "b", "c")
+            )
+        )
+
+        assert dispatcher.metrics.coalesced == 2
+        return results
+
+    results: list[Any] = asyncio.run(send_all())
+
+    assert [kwargs for _, kwargs in http.sent] == [{"content": "a\nb\nc"}]
+    assert results == ["a\nb\nc"] * 3
+
+
+def test_dispatcher_keeps_other_destinations_apart() -> None:
+    http: FakeHTTP = FakeHTTP()
+
+    async def send_all() -> None:
+        dispatcher: Dispatcher = Dispatcher()
+
+        await asyncio.gather(
+            dispatcher.submit(
+                PRIORITY_FOLLOWUP, 1, http.send, destination="a", content="1"
+            ),
+            dispatcher.submit(
+                PRIORITY_FOLLOWUP, 1, http.send, destination="b", content="2"
+            ),
+        )
+
+    asyncio.run(send_all())
+
+    assert len(http.sent) == 2
+
+
+def test_dispatcher_raises_send_failures_to_the_sender() -> None:
+    http: FakeHTTP = FakeHTTP()
+
+    async def send() -> tuple[Dispatcher, BaseException]:
+        dispatcher: Dispatcher = Dispatcher()
+
+        try:
+            await dispatcher.submit(PRIORITY_FOLLOWUP, 1, http.fail)
+        except RuntimeError as error:
+            return dispatcher, error
+
+        raise AssertionError("the failure wasn't raised")
+
+    dispatcher, error = asyncio.run(send())
+
+    assert str(error) == "rejected"
+    assert dispatcher.metrics.failed == 1
+
+
+def test_deliveries_are_kept_until_done() -> None:
+    http: FakeHTTP = FakeHTTP()
+
+    async def send() -> None:
+        dispatcher: Dispatcher = Dispatcher()
+        await dispatcher.submit(PRIORITY_FOLLOWUP, 1, http.send)
+
+        # Only the (idle) worker is left.
+        await asyncio.sleep(0)
+        assert background.tasks == {dispatcher._worker}
+
+        assert dispatcher._worker
+        dispatcher._worker.cancel()
+
+    asyncio.run(send())
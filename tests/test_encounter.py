@@ -0,0 +1,79 @@
+import pytest
+
+from botofspades.encounter import Effect, Encounter, RoundResult
+
+
+def run_rounds(encounter: Encounter, rounds: int) -> list[RoundResult]:
+    return [encounter.next_round() for _ in range(rounds)]
+
+
+def test_initiative_order_keeps_ties_in_joining_order() -> None:
+    encounter: Encounter = Encounter()
+    encounter.join("ada", 12)
+    encounter.join("bo", 15)
+    encounter.join("cy", 12)
+    # Rejoining moves a sheet rather than adding it twice.
+    encounter.join("bo", 3)
+
+    assert [p.sheet for p in encounter.order] == ["ada", "cy", "bo"]
+    assert encounter.leave("cy")
+    assert not encounter.leave("cy")
+
+
+def test_effects_come_up_every_interval_until_they_expire() -> None:
+    encounter: Encounter = Encounter()
+    poison: Effect = encounter.add_effect(
+        "poison", "ada", "hp", "subtract", ("1",), 2, 5
+    )
+
+    results: list[RoundResult] = run_rounds(encounter, 7)
+
+    assert [result.round for result in results if result.due] == [2, 4]
+    assert [r.round for r in results if poison in r.expired] == [5]
+    assert poison.id not in encounter.effects
+
+
+def test_due_effects_are_grouped_by_sheet() -> None:
+    encounter: Encounter = Encounter()
+    encounter.add_effect("regen", "ada", "hp", "add", ("1",), 1, 0)
+    encounter.add_effect("bleed", "ada", "hp", "subtract", ("2",), 1, 0)
+    encounter.add_effect("haste", "bo", "speed", "add", ("1",), 1, 0)
+
+    result: RoundResult = encounter.next_round()
+
+    assert {
+        sheet: [effect.name for effect in effects]
+        for sheet, effects in result.due.items()
+    } == {"ada": ["regen", "bleed"], "bo": ["haste"]}
+    # Without a duration, they last until the encounter ends.
+    assert len(run_rounds(encounter, 100)[-1].due["ada"]) == 2
+
+
+def test_effects_without_a_method_only_expire() -> None:
+    encounter: Encounter = Encounter()
+    stun: Effect = encounter.add_effect("stun", "bo", "", "", (), 1, 3)
+
+    results: list[RoundResult] = run_rounds(encounter, 3)
+
+    assert not any(result.due for result in results)
+    assert results[-1].expired == [stun]
+
+
+def test_removed_effects_never_come_up() -> None:
+    encounter: Encounter = Encounter()
+    effect: Effect = encounter.add_effect(
+        "burn", "ada", "hp", "subtract", ("1",), 3, 0
+    )
+
+    assert encounter.remove_effect(effect.id) is effect
+    assert encounter.remove_effect(effect.id) is None
+    assert not any(result.due for result in run_rounds(encounter, 10))
+
+
+def test_effects_out_of_reach_are_rejected() -> None:
+    encounter: Encounter = Encounter()
+
+    with pytest.raises(ValueError):
+        encounter.add_effect(
+            "curse", "ada", "", "", (), 1, encounter.wheel.max_delay + 1
+        )
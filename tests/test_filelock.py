@@ -0,0 +1,135 @@
+import asyncio
+import fcntl
+import json
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from botofspades import filelock
+from botofspades.jsonwrappers import JSONFileWrapperUpdate
+
+
+PROCESSES: int = 4
+COROUTINES: int = 5
+INCREMENTS: int = 20
+
+
+async def increment(path: Path, times: int) -> None:
+    for _ in range(times):
+        async with JSONFileWrapperUpdate(path) as counter:
+            counter["count"] += 1
+
+        # Lets the process's other coroutines at the file between updates.
+        await asyncio.sleep(0)
+
+
+async def run_shard(path: Path) -> None:
+    await asyncio.gather(
+        *(increment(path, INCREMENTS) for _ in range(COROUTINES))
+    )
+
+
+def shard(path: Path) -> None:
+    # Stands in for a shard process, with several commands at once.
+    asyncio.run(run_shard(path))
+
+
+def hold_lock(path: Path, held, seconds: float) -> None:
+    with path.open("rb") as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        held.set()
+        time.sleep(seconds)
+
+
+@pytest.fixture
+def counter_path(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "counter.json"
+    path.write_text(json.dumps({"count": 0}))
+
+    return path
+
+
+def get_count(path: Path) -> int:
+    return json.loads(path.read_text())["count"]
+
+
+def test_coroutines_dont_lose_updates(counter_path: Path) -> None:
+    asyncio.run(run_shard(counter_path))
+
+    assert get_count(counter_path) == COROUTINES * INCREMENTS
+    assert not filelock.locks
+
+
+def test_processes_dont_lose_updates(counter_path: Path) -> None:
+    context = multiprocessing.get_context("spawn")
+    shards: list = [
+        context.Process(target=shard, args=(counter_path,))
+        for _ in range(PROCESSES)
+    ]
+
+    for process in shards:
+        process.start()
+
+    for process in shards:
+        process.join(30)
+        assert process.exitcode == 0
+
+    assert get_count(counter_path) == PROCESSES * COROUTINES * INCREMENTS
+
+
+def test_waiting_on_another_process_doesnt_block(counter_path: Path) -> None:
+    context = multiprocessing.get_context("spawn")
+    held = context.Event()
+    holder = context.Process(target=hold_lock, args=(counter_path, held, 0.3))
+    holder.start()
+    assert held.wait(30)
+
+    async def run() -> int:
+        ticks: int = 0
+        update: asyncio.Task = asyncio.create_task(
+            increment(counter_path, 1)
+        )
+
+        while not update.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+        await update
+        return ticks
+
+    try:
+        # The loop kept running while the other process held the lock.
+        assert asyncio.run(run()) >= 10
+    finally:
+        holder.join(30)
+
+    assert get_count(counter_path) == 1
+
+
+def test_cancelled_waits_release_nothing(counter_path: Path) -> None:
+    async def run() -> None:
+        await filelock.acquire_exclusive(counter_path)
+
+        waiting: asyncio.Task = asyncio.create_task(
+            filelock.acquire_exclusive(counter_path)
+        )
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert filelock.is_held(counter_path)
+        filelock.release_exclusive(counter_path)
+
+    asyncio.run(run())
+
+    assert not filelock.locks
+
+
+def test_updates_need_async_with(counter_path: Path) -> None:
+    with pytest.raises(TypeError):
+        with JSONFileWrapperUpdate(counter_path):
+            pass
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import subprocess
+import sys
+from types import ModuleType
+from typing import Callable
+
+from botofspades.extensions import intotheodd
+from botofspades.extensions.intotheodd import AttributeSet
+
+
+ATTRIBUTE_FIELDS: dict = {
+    attribute: {"type": "abacus", "default": 0}
+    for attribute in intotheodd.ATTRIBUTES
+}
+
+
+def test_batches_skip_existing_sheets(
+    store: ModuleType, write_template: Callable
+) -> None:
+    write_template("odd", ATTRIBUTE_FIELDS)
+    asyncio.run(store.create_sheet("pc2", "odd"))
+
+    sheets, errors = asyncio.run(
+        intotheodd.create_sheets(
+            store, "odd", "pc", [AttributeSet(10, 8, 7, 0)] * 3
+        )
+    )
+
+    assert sheets == ["pc1", "", "pc3"]
+    assert len(errors) == 1
+    assert json.loads(store.get_sheet_path("pc3").read_text())["fields"] == {
+        "strength": 10,
+        "dexterity": 8,
+        "willpower": 7,
+    }
+
+
+def test_failed_batches_leave_no_sheets(
+    store: ModuleType, write_template: Callable
+) -> None:
+    write_template("odd", ATTRIBUTE_FIELDS)
+    asyncio.run(store.create_sheet("pc2", "odd"))
+
+    sheets, errors = asyncio.run(
+        intotheodd.create_sheets(
+            store,
+            "odd",
+            "pc",
+            [
+                AttributeSet(10, 8, 7, 0),
+                AttributeSet(10, 8, 7, 0),
+                AttributeSet(12, 9, 11, 1),
+                AttributeSet("lots", 8, 7, 0),  # type: ignore
+            ],
+        )
+    )
+
+    assert sheets == []
+    assert "**strength**" in errors[0]
+    # The sheet that already existed is kept.
+    assert sorted(path.stem for path in store.charsheets_dir.iterdir()) == [
+        "pc2"
+    ]
+
+
+def test_batches_need_the_template(store: ModuleType) -> None:
+    sheets, errors = asyncio.run(
+        intotheodd.create_sheets(
+            store, "odd", "pc", [AttributeSet(10, 8, 7, 0)]
+        )
+    )
+
+    assert sheets == []
+    assert len(errors) == 1
+    assert not list(store.charsheets_dir.iterdir())
+
+
+def test_loading_leaves_simulations_out() -> None:
+    # In a fresh interpreter, as other tests import them.
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "import botofspades.extensions.intotheodd\n"
+            "assert 'botofspades.combat' not in sys.modules\n"
+            "assert 'voladice' not in sys.modules\n",
+        ],
+        check=True,
+    )
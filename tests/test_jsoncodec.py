@@ -0,0 +1,70 @@
+import json
+from math import inf, isnan, nan
+from typing import Any
+
+import pytest
+
+from botofspades import jsoncodec
+
+
+DOCUMENT: dict[str, Any] = {
+    "template": "hero",
+    "fields": {
+        "name": "Ada",
+        "level": 3,
+        "speed": 1.5,
+        "notes": None,
+        "hp": [4, 6],
+        "inventory": {"item": ["rope", "lamp"], "weight": [1.0, 0.5]},
+    },
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    # Each test runs with orjson (if installed) and without it.
+    if request.param == "json":
+        monkeypatch.setattr(jsoncodec, "orjson", None)
+    elif not jsoncodec.orjson:
+        pytest.skip("orjson isn't installed")
+
+    return jsoncodec
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_round_trip(codec, pretty: bool) -> None:
+    assert codec.loads(codec.dumps(DOCUMENT, pretty)) == DOCUMENT
+
+
+def test_output_matches_the_standard_library(codec) -> None:
+    assert json.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+    assert json.loads(codec.dumps(DOCUMENT, pretty=True)) == DOCUMENT
+    assert b"\n  " in codec.dumps(DOCUMENT, pretty=True)
+
+
+def test_long_integers_round_trip(codec) -> None:
+    value: dict[str, Any] = {"big": 2**64 + 1, "small": -(2**70)}
+
+    assert codec.loads(codec.dumps(value)) == value
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_non_finite_floats_round_trip(codec, pretty: bool) -> None:
+    value: dict[str, Any] = {
+        "fields": {
+            "speed": inf,
+            "debt": -inf,
+            "luck": nan,
+            "notes": None,
+            "ledger": {"amount": [1.0, inf]},
+        }
+    }
+
+    fields: dict[str, Any] = codec.loads(codec.dumps(value, pretty))[
+        "fields"
+    ]
+
+    assert (fields["speed"], fields["debt"]) == (inf, -inf)
+    assert isnan(fields["luck"])
+    assert fields["notes"] is None
+    assert fields["ledger"] == {"amount": [1.0, inf]}
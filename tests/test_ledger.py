@@ -0,0 +1,108 @@
+from typing import Any
+
+import pytest
+
+from botofspades.extensions.charsheets.types import Ledger
+
+
+def get_inventory(*rows: tuple[str, str]) -> dict[str, Any]:
+    ledger: dict[str, Any] = Ledger.from_str("item, amount:abacus")
+
+    for row in rows:
+        Ledger.method_append(ledger, list(row))
+
+    return ledger
+
+
+def test_from_str_makes_empty_typed_columns() -> None:
+    assert Ledger.from_str("Item,amount:Abacus , weight:rational") == {
+        "columns": {
+            "item": "scroll",
+            "amount": "abacus",
+            "weight": "rational",
+        },
+        "values": [[], [], []],
+    }
+
+
+@pytest.mark.parametrize(
+    "columns", ["", "item,", "item,item", "item:gauge", "item:ledger"]
+)
+def test_from_str_rejects_invalid_columns(columns: str) -> None:
+    with pytest.raises(ValueError):
+        Ledger.from_str(columns)
+
+    assert not Ledger.validate(columns)
+
+
+def test_validate() -> None:
+    assert Ledger.validate("item,amount:abacus")
+    assert Ledger.validate(get_inventory(("rope", "1")))
+    # Columns of different lengths, or cells of the wrong type.
+    assert not Ledger.validate(
+        {"columns": {"a": "abacus", "b": "scroll"}, "values": [[1], []]}
+    )
+    assert not Ledger.validate(
+        {"columns": {"a": "abacus"}, "values": [["many"]]}
+    )
+    assert not Ledger.validate({"columns": {}, "values": []})
+    assert not Ledger.validate(None)
+
+
+def test_rows_are_stored_by_column() -> None:
+    ledger: dict[str, Any] = get_inventory(("rope", "1"), ("lamp", "2"))
+
+    assert ledger["values"] == [["rope", "lamp"], [1, 2]]
+    assert Ledger.to_str(ledger) == "Item, Amount: rope, 1; lamp, 2"
+    assert Ledger.to_str(get_inventory()) == "Item, Amount: none"
+
+
+@pytest.mark.parametrize("args", [["rope"], ["rope", "1", "2"], ["rope", "x"]])
+def test_append_rejects_invalid_rows(args: list[str]) -> None:
+    ledger: dict[str, Any] = get_inventory(("lamp", "2"))
+
+    with pytest.raises(TypeError):
+        Ledger.method_append(ledger, args)
+
+    # Nothing was added to any column.
+    assert ledger["values"] == [["lamp"], [2]]
+
+
+def test_update_sets_one_cell() -> None:
+    ledger: dict[str, Any] = get_inventory(("rope", "1"), ("lamp", "2"))
+
+    Ledger.method_update(ledger, ["2", "Amount", "5"])
+
+    assert ledger["values"] == [["rope", "lamp"], [1, 5]]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["3", "amount", "1"],
+        ["0", "amount", "1"],
+        ["1", "colour", "red"],
+        ["1", "amount", "lots"],
+        ["one", "amount", "1"],
+        ["1", "amount"],
+    ],
+)
+def test_update_rejects_invalid_cells(args: list[str]) -> None:
+    with pytest.raises(TypeError):
+        Ledger.method_update(get_inventory(("rope", "1"), ("lamp", "2")), args)
+
+
+def test_remove_keeps_the_rows_in_order() -> None:
+    ledger: dict[str, Any] = get_inventory(
+        ("rope", "1"), ("lamp", "2"), ("oil", "3")
+    )
+
+    Ledger.method_remove(ledger, ["1"])
+    assert ledger["values"] == [["lamp", "oil"], [2, 3]]
+
+    Ledger.method_remove(ledger, ["2"])
+    Ledger.method_remove(ledger, ["1"])
+    assert ledger["values"] == [[], []]
+
+    with pytest.raises(TypeError):
+        Ledger.method_remove(ledger, ["1"])
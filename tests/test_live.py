@@ -0,0 +1,222 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+import pytest
+
+from botofspades import changes, dispatch
+from botofspades.extensions.charsheets.live import LiveView, LiveViews
+from botofspades.outmsg import out
+
+
+class FakeMessage:
+    def __init__(self, edits: list, channel_id: int, message_id: int) -> None:
+        self.edits: list = edits
+        self.channel: Any = FakeChannel(edits, channel_id)
+        self.id: int = message_id
+
+    async def edit(self, **kwargs) -> None:
+        self.edits.append((self.id, kwargs["embed"]))
+
+
+class FakeChannel:
+    def __init__(self, edits: list, channel_id: int) -> None:
+        self.edits: list = edits
+        self.id: int = channel_id
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return FakeMessage(self.edits, self.id, message_id)
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.edits: list[tuple[int, Any]] = []
+
+    def get_partial_messageable(self, channel_id: int) -> FakeChannel:
+        return FakeChannel(self.edits, channel_id)
+
+
+class FakeSheets:
+    """Renders sheets from a dict, in place of the sheet files."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+        # Raised by the next render, if set.
+        self.error: Optional[Exception] = None
+
+    def render(self, sheet: str) -> tuple[str, ...]:
+        if self.error:
+            error, self.error = self.error, None
+            raise error
+
+        if sheet not in self.values:
+            raise FileNotFoundError(sheet)
+
+        return (f"{sheet}: {self.values[sheet]}\n",)
+
+    def set(self, sheet: str, value: int) -> None:
+        self.values[sheet] = value
+        changes.feed.publish("sheet", sheet)
+
+
+@pytest.fixture
+def sheets(monkeypatch: pytest.MonkeyPatch) -> FakeSheets:
+    # Each test runs its own event loop, which the dispatcher is bound to.
+    monkeypatch.setattr(dispatch, "dispatcher", dispatch.Dispatcher())
+
+    return FakeSheets()
+
+
+def start(
+    sheets: FakeSheets, limit: int = 10, poll: bool = False
+) -> tuple[LiveViews, FakeBot]:
+    bot: FakeBot = FakeBot()
+    views: LiveViews = LiveViews(
+        limit=limit, interval=0.05, poll_interval=0.05
+    )
+    views.start(bot, sheets.render, poll)  # type: ignore[arg-type]
+
+    return views, bot
+
+
+def pin(
+    views: LiveViews, sheets: FakeSheets, sheet: str, message_id: int
+) -> None:
+    views.add(LiveView(1, message_id, sheet, sheets.render(sheet)))
+
+
+def get_edits(bot: FakeBot) -> list[tuple[int, str]]:
+    return [(message_id, embed.description) for message_id, embed in bot.edits]
+
+
+def test_flush_makes_pending_edits_now(sheets: FakeSheets) -> None:
+    async def run() -> FakeBot:
+        views, bot = start(sheets)
+        sheets.values["bob"] = 1
+        pin(views, sheets, "bob", 10)
+
+        sheets.set("bob", 2)
+        views.flush()
+        views.stop()
+        await asyncio.sleep(0.01)
+
+        return bot
+
+    bot: FakeBot = asyncio.run(run())
+
+    assert get_edits(bot) == [(10, "bob: 2\n")]
+
+
+def test_bursts_of_changes_make_one_edit(sheets: FakeSheets) -> None:
+    async def run() -> FakeBot:
+        views, bot = start(sheets)
+        sheets.values["bob"] = 1
+        pin(views, sheets, "bob", 10)
+
+        for value in range(2, 6):
+            sheets.set("bob", value)
+
+        await asyncio.sleep(0.1)
+        views.stop()
+
+        return bot
+
+    assert get_edits(asyncio.run(run())) == [(10, "bob: 5\n")]
+
+
+def test_unchanged_renders_arent_edited(sheets: FakeSheets) -> None:
+    async def run() -> FakeBot:
+        views, bot = start(sheets)
+        sheets.values["bob"] = 1
+        pin(views, sheets, "bob", 10)
+
+        sheets.set("bob", 1)
+        await asyncio.sleep(0.1)
+        views.stop()
+
+        return bot
+
+    assert not asyncio.run(run()).edits
+
+
+def test_evicted_views_say_they_stopped(sheets: FakeSheets) -> None:
+    async def run() -> tuple[LiveViews, FakeBot]:
+        views, bot = start(sheets, limit=2)
+        sheets.values.update(ann=1, bob=1, cy=1)
+
+        for message_id, sheet in enumerate(("ann", "bob", "cy"), 10):
+            pin(views, sheets, sheet, message_id)
+
+        await asyncio.sleep(0.01)
+        views.stop()
+
+        return views, bot
+
+    views, bot = asyncio.run(run())
+
+    assert len(views) == 2
+    assert [(edit[0], edit[1].footer.text) for edit in bot.edits] == [
+        (10, out("LIVE_VIEW_STOPPED"))
+    ]
+
+
+def test_removed_sheets_stop_their_views(sheets: FakeSheets) -> None:
+    async def run() -> tuple[LiveViews, FakeBot]:
+        views, bot = start(sheets)
+        sheets.values["bob"] = 1
+        pin(views, sheets, "bob", 10)
+
+        del sheets.values["bob"]
+        changes.feed.publish("sheet", "bob")
+        await asyncio.sleep(0.1)
+        views.stop()
+
+        return views, bot
+
+    views, bot = asyncio.run(run())
+
+    assert not len(views)
+    assert bot.edits[0][1].footer.text == out("LIVE_VIEW_STOPPED")
+
+
+def test_failed_refreshes_are_logged_and_retried(
+    sheets: FakeSheets, caplog: pytest.LogCaptureFixture
+) -> None:
+    async def run() -> FakeBot:
+        views, bot = start(sheets)
+        sheets.values["bob"] = 1
+        pin(views, sheets, "bob", 10)
+
+        sheets.error = KeyError("hp")
+        sheets.set("bob", 2)
+        await asyncio.sleep(0.1)
+        assert not bot.edits
+
+        sheets.set("bob", 3)
+        await asyncio.sleep(0.1)
+        views.stop()
+
+        return bot
+
+    with caplog.at_level(logging.ERROR, logger="botofspades"):
+        bot: FakeBot = asyncio.run(run())
+
+    assert "Background task failed" in caplog.text
+    assert "KeyError" in caplog.text
+    assert get_edits(bot) == [(10, "bob: 3\n")]
+
+
+def test_polling_sees_changes_not_published_here(sheets: FakeSheets) -> None:
+    async def run() -> FakeBot:
+        views, bot = start(sheets, poll=True)
+        sheets.values["bob"] = 1
+        pin(views, sheets, "bob", 10)
+
+        # As another process would, without publishing the change.
+        sheets.values["bob"] = 2
+        await asyncio.sleep(0.2)
+        views.stop()
+
+        return bot
+
+    assert get_edits(asyncio.run(run())) == [(10, "bob: 2\n")]
@@ -0,0 +1,45 @@
+import asyncio
+import tracemalloc
+
+import pytest
+
+from botofspades import constants, memory
+
+
+@pytest.fixture
+def tracing(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(memory, "baselines", {})
+    monkeypatch.setattr(constants, "MEMORY_TOP_GROWTH", 3)
+    memory.start()
+    yield
+    tracemalloc.stop()
+
+
+def test_baselines_are_kept_per_caller(tracing: None) -> None:
+    kept: list[bytes] = []
+
+    asyncio.run(memory.take_report("periodic"))
+    kept.append(bytes(1_000_000))
+    command: memory.MemoryReport = asyncio.run(memory.take_report("command"))
+    periodic: memory.MemoryReport = asyncio.run(
+        memory.take_report("periodic")
+    )
+
+    # The command's first use is its baseline, and didn't move the periodic
+    # report's, which still sees the allocation.
+    assert not command.subsystem_growth
+    assert sum(periodic.subsystem_growth.values()) >= 1_000_000
+
+
+def test_top_growth_only_holds_growing_lines(tracing: None) -> None:
+    dropped: list[bytes] = [bytes(100_000) for _ in range(5)]
+
+    asyncio.run(memory.take_report("periodic"))
+    dropped.clear()
+    kept: list[bytes] = [bytes(100_000) for _ in range(5)]
+    kept.extend(bytes(100_000 + size) for size in range(5))
+    kept.append(bytes(300_000))
+    report: memory.MemoryReport = asyncio.run(memory.take_report("periodic"))
+
+    assert len(report.top_growth) == constants.MEMORY_TOP_GROWTH
+    assert all(growth.size_diff > 0 for growth in report.top_growth)
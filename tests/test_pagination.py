@@ -0,0 +1,71 @@
+import asyncio
+
+from benchmarks.fakes import FakeInteraction
+from botofspades.outmsg import out
+from botofspades.pagination import (
+    PageView,
+    pack_code_block,
+    pack_lines,
+    send_pages,
+    split_line,
+)
+
+
+def test_split_line_chunks_long_lines() -> None:
+    assert list(split_line("abcdefg", 3)) == ["abc", "def", "g"]
+    assert list(split_line("ab", 3)) == ["ab"]
+
+
+def test_pack_lines_fills_pages_without_splitting_lines() -> None:
+    lines: list[str] = ["aaa\n", "bb\n", "c\n", "dddd\n"]
+
+    assert list(pack_lines(lines, 6)) == ["aaa\n", "bb\nc\n", "dddd\n"]
+
+
+def test_pack_lines_splits_lines_over_the_limit() -> None:
+    pages: list[str] = list(pack_lines(["x" * 10], 4))
+
+    assert pages == ["xxxx", "xxxx", "xx"]
+    assert all(len(page) <= 4 for page in pages)
+
+
+def test_pack_lines_without_lines_has_no_pages() -> None:
+    assert list(pack_lines([])) == []
+
+
+def test_pack_code_block_fits_the_limit() -> None:
+    limit: int = 20
+    pages: list[str] = list(pack_code_block(["line\n"] * 10, limit))
+
+    assert len(pages) > 1
+    assert all(len(page) <= limit for page in pages)
+    assert all(page.startswith("```\n") for page in pages)
+    assert all(page.endswith("```") for page in pages)
+    assert "".join(pages).count("line") == 10
+
+
+def test_send_pages_without_pages_sends_a_message() -> None:
+    itr: FakeInteraction = FakeInteraction()
+
+    asyncio.run(send_pages(itr, []))
+
+    assert itr.messages == [out("NOTHING_TO_SHOW")]
+
+
+def test_page_view_only_answers_its_owner() -> None:
+    async def check() -> tuple[bool, bool, list]:
+        view: PageView = PageView(["a", "b"], owner_id=1)
+        owner: FakeInteraction = FakeInteraction(user_id=1)
+        other: FakeInteraction = FakeInteraction(user_id=2)
+
+        return (
+            await view.interaction_check(owner),
+            await view.interaction_check(other),
+            other.messages,
+        )
+
+    owner_allowed, other_allowed, other_messages = asyncio.run(check())
+
+    assert owner_allowed
+    assert not other_allowed
+    assert other_messages == [out("PAGES_NOT_YOURS")]
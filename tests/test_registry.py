@@ -0,0 +1,41 @@
+from botofspades import registry
+
+
+def test_state_is_created_once() -> None:
+    first: list = registry.get_state("tests.once", list)
+    first.append(1)
+
+    assert registry.get_state("tests.once", list) == [1]
+
+
+def test_state_is_rebound_to_reloaded_classes() -> None:
+    class Counter:
+        def __init__(self) -> None:
+            self.count: int = 0
+
+    counter: Counter = registry.get_state("tests.counter", Counter)
+    counter.count = 3
+
+    # The same class, as defined again when its module is reloaded.
+    class Counter:  # type: ignore[no-redef]
+        def __init__(self) -> None:
+            self.count: int = 0
+
+        def increase(self) -> int:
+            self.count += 1
+            return self.count
+
+    reloaded: Counter = registry.get_state("tests.counter", Counter)
+
+    assert type(reloaded) is Counter
+    assert reloaded.increase() == 4
+
+
+def test_flush_only_runs_the_flushers_under_the_prefix() -> None:
+    flushed: list[str] = []
+
+    registry.register_flush("first.cache", lambda: flushed.append("first"))
+    registry.register_flush("second.cache", lambda: flushed.append("second"))
+    registry.flush("first.")
+
+    assert flushed == ["first"]
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+from botofspades import constants, filelock, slash
+
+
+class FakeCommand:
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+
+    def to_dict(self, tree: Any) -> dict[str, Any]:
+        return {"name": self.name}
+
+
+class FakeTree:
+    def __init__(self, path: Path, names: list[str]) -> None:
+        self.path: Path = path
+        self.commands: list[FakeCommand] = list(map(FakeCommand, names))
+        self.syncs: int = 0
+        self.locked_during_sync: bool = False
+
+    def get_commands(self, guild: Optional[Any] = None) -> list[FakeCommand]:
+        return self.commands
+
+    async def sync(self, guild: Optional[Any] = None) -> None:
+        self.syncs += 1
+        self.locked_during_sync = filelock.is_held(self.path)
+
+
+class FakeBot:
+    def __init__(self, path: Path, names: list[str]) -> None:
+        self.application_id: int = 1
+        self.tree: FakeTree = FakeTree(path, names)
+
+
+@pytest.fixture
+def tree_hashes_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    path: Path = tmp_path / ".TREE_HASHES"
+    monkeypatch.setattr(slash, "tree_hashes_path", path)
+    # Only set when the bot runs (from .SERVER_ID).
+    monkeypatch.setattr(constants, "TARGET_GUILD", None, raising=False)
+
+    return path
+
+
+def test_unchanged_trees_are_synced_once(tree_hashes_path: Path) -> None:
+    bot: FakeBot = FakeBot(tree_hashes_path, ["dice"])
+
+    assert asyncio.run(slash.sync_tree(bot))
+    assert not asyncio.run(slash.sync_tree(bot))
+    assert bot.tree.syncs == 1
+    assert json.loads(tree_hashes_path.read_text()) == {
+        "1:global": slash.get_tree_hash(bot)
+    }
+
+
+def test_changed_trees_are_synced_again(tree_hashes_path: Path) -> None:
+    asyncio.run(slash.sync_tree(FakeBot(tree_hashes_path, ["dice"])))
+    bot: FakeBot = FakeBot(tree_hashes_path, ["dice", "encounter"])
+
+    assert asyncio.run(slash.sync_tree(bot))
+    assert bot.tree.syncs == 1
+
+
+def test_forced_syncs_always_sync(tree_hashes_path: Path) -> None:
+    bot: FakeBot = FakeBot(tree_hashes_path, ["dice"])
+    asyncio.run(slash.sync_tree(bot))
+
+    assert asyncio.run(slash.sync_tree(bot, force=True))
+    assert bot.tree.syncs == 2
+
+
+def test_the_hashes_are_not_locked_during_syncs(
+    tree_hashes_path: Path,
+) -> None:
+    bot: FakeBot = FakeBot(tree_hashes_path, ["dice"])
+    asyncio.run(slash.sync_tree(bot))
+
+    assert bot.tree.syncs == 1
+    assert not bot.tree.locked_during_sync
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from botofspades.timerwheel import Timer, TimerWheel
+
+
+def test_items_come_up_on_their_tick() -> None:
+    wheel: TimerWheel[str] = TimerWheel(slots=4, levels=2)
+    wheel.schedule(1, "soon")
+    wheel.schedule(5, "later")
+    wheel.schedule(wheel.max_delay, "last")
+
+    due: dict[int, list[str]] = {
+        tick: items for tick in range(1, 20) if (items := wheel.advance())
+    }
+
+    assert due == {1: ["soon"], 5: ["later"], 15: ["last"]}
+
+
+def test_cancelled_items_never_come_up() -> None:
+    wheel: TimerWheel[str] = TimerWheel(slots=4, levels=2)
+    kept: Timer[str] = wheel.schedule(9, "kept")
+    wheel.schedule(9, "cancelled").cancel()
+
+    assert [item for _ in range(9) for item in wheel.advance()] == ["kept"]
+    assert not kept.cancelled
+
+
+@pytest.mark.parametrize("delay", [0, -1, 16])
+def test_delays_out_of_reach(delay: int) -> None:
+    wheel: TimerWheel[int] = TimerWheel(slots=4, levels=2)
+
+    with pytest.raises(ValueError):
+        wheel.schedule(delay, 1)
+
+
+def test_matches_a_plain_schedule() -> None:
+    # Random timers scheduled at random ticks, some cancelled, against a
+    # list of when each is due.
+    generator: random.Random = random.Random(47)
+    wheel: TimerWheel[int] = TimerWheel(slots=4, levels=3)
+    expected: dict[int, set[int]] = {}
+    timers: list[Timer[int]] = []
+
+    for tick in range(1, 500):
+        for _ in range(generator.randrange(4)):
+            item: int = len(timers)
+            timer: Timer[int] = wheel.schedule(
+                generator.randint(1, wheel.max_delay), item
+            )
+            timers.append(timer)
+            expected.setdefault(timer.expires, set()).add(item)
+
+        if timers and generator.random() < 0.3:
+            cancelled: Timer[int] = generator.choice(timers)
+            cancelled.cancel()
+            expected.get(cancelled.expires, set()).discard(cancelled.item)
+
+        assert set(wheel.advance()) == expected.pop(wheel.now, set())
+        assert wheel.now == tick
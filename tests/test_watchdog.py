@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import pytest
+
+from botofspades import metrics, watchdog
+
+
+def test_stalls_name_the_blocking_command(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stalls: list[watchdog.Stall] = []
+
+    def sample() -> None:
+        stalls.append(watchdog.sample(1.0))
+
+    async def waiting_command() -> None:
+        metrics.start_command("waiting", "sheet get", "app", None)
+        await asyncio.sleep(0.05)
+        metrics.finish_command("waiting")
+
+    async def blocking_command() -> None:
+        metrics.start_command("blocking", "sheet do", "app", None)
+
+        # Blocks the loop until the sample's been taken.
+        thread: threading.Thread = threading.Thread(target=sample)
+        thread.start()
+        thread.join()
+
+        metrics.finish_command("blocking")
+
+    async def run() -> None:
+        monkeypatch.setattr(watchdog, "loop", asyncio.get_running_loop())
+        monkeypatch.setattr(watchdog, "loop_thread_id", threading.get_ident())
+
+        waiting: asyncio.Task = asyncio.create_task(waiting_command())
+        await asyncio.sleep(0)
+        await asyncio.create_task(blocking_command())
+        await waiting
+
+    asyncio.run(run())
+
+    stall: watchdog.Stall = stalls[0]
+
+    assert stall.culprit.startswith("sheet do in ")
+    # None of the bot's own frames are blocking, so the innermost is named.
+    assert "(threading.py:" in stall.culprit
+    assert sorted(stall.commands) == ["sheet do", "sheet get"]
+    assert "blocking_command" in stall.stack
+
+
+def test_stalls_outside_commands_name_the_task(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stalls: list[watchdog.Stall] = []
+
+    async def refresh() -> None:
+        thread: threading.Thread = threading.Thread(
+            target=lambda: stalls.append(watchdog.sample(1.0))
+        )
+        thread.start()
+        thread.join()
+
+    async def run() -> None:
+        monkeypatch.setattr(watchdog, "loop", asyncio.get_running_loop())
+        monkeypatch.setattr(watchdog, "loop_thread_id", threading.get_ident())
+
+        await asyncio.create_task(refresh())
+
+    asyncio.run(run())
+
+    assert stalls[0].culprit.startswith(
+        "test_stalls_outside_commands_name_the_task.<locals>.refresh in "
+    )